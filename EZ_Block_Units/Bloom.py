@@ -1,8 +1,125 @@
-from bitarray import bitarray
+from bitarray import bitarray, frozenbitarray
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+import threading
+import weakref
+import hashlib
+import math
+import struct
 import mmh3
 import zlib
 import base64
 
+from EZ_Tool_Box.Metrics import timed
+
+
+def optimal_bloom_parameters(expected_items, false_positive_rate=0.001, min_size=64):
+    """
+    Size a Bloom filter for the number of items it will actually hold.
+
+    Uses the standard formulas m = -n * ln(p) / ln(2)^2 and k = m / n * ln(2),
+    rounding m up to whole bytes so compression and hashing work on aligned data.
+
+    Parameters:
+        expected_items (int): Number of distinct items that will be inserted.
+        false_positive_rate (float): Target false-positive probability, 0 < p < 1.
+        min_size (int): Lower bound on the bit-array length.
+
+    Returns:
+        tuple: (size, hash_count)
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("false_positive_rate must be between 0 and 1")
+    n = max(int(expected_items), 1)
+    size = int(math.ceil(-n * math.log(false_positive_rate) / (math.log(2) ** 2)))
+    size = max(size, min_size)
+    size = (size + 7) // 8 * 8
+    hash_count = max(1, int(round(size / n * math.log(2))))
+    return size, hash_count
+
+
+class BloomMemoryBudget:
+    """
+    LRU accounting for the query views of compressed Bloom filters.
+
+    Compressed filters answer membership probes through a read-only query view
+    (see BloomFilter._get_query_view). The views are tracked here; once the
+    total exceeds max_bytes the views of the least recently used filters are
+    dropped and rebuilt on their next probe. Eviction runs on whichever thread
+    touches the budget, so it never changes a filter's representation: a
+    decompressed filter may be in the middle of add() on its owner's thread,
+    and is not tracked.
+
+    Limitation: the budget does not re-compress cold decompressed filters.
+    Their memory is bounded only by their owners calling compress() once
+    they stop adding to them.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()  # id(bloom) -> (weakref, nbytes)
+        self.lock = threading.RLock()
+
+    def touch(self, bloom, nbytes):
+        """Record that bloom currently holds nbytes of expanded data and mark it as recently used."""
+        with self.lock:
+            key = id(bloom)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is bloom and entry[1] == nbytes:
+                self._entries.move_to_end(key)
+                return
+            if entry is not None:
+                del self._entries[key]
+                self.used_bytes -= entry[1]
+            ref = weakref.ref(bloom, lambda r, key=key: self._forget(key, r))
+            self._entries[key] = (ref, nbytes)
+            self.used_bytes += nbytes
+            self._evict(keep=key)
+
+    def release(self, bloom):
+        """Stop accounting for bloom (it no longer holds expanded data)."""
+        with self.lock:
+            entry = self._entries.get(id(bloom))
+            if entry is not None and entry[0]() is bloom:
+                del self._entries[id(bloom)]
+                self.used_bytes -= entry[1]
+
+    def set_max_bytes(self, max_bytes):
+        """Change the budget and evict immediately if the new limit is exceeded."""
+        with self.lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def tracked_count(self):
+        return len(self._entries)
+
+    def _forget(self, key, ref):
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._entries[key]
+                self.used_bytes -= entry[1]
+
+    def _evict(self, keep=None):
+        while self.used_bytes > self.max_bytes and self._entries:
+            key, (ref, nbytes) = next(iter(self._entries.items()))
+            if key == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(key)
+                continue
+            del self._entries[key]
+            self.used_bytes -= nbytes
+            bloom = ref()
+            if bloom is not None:
+                bloom._drop_query_view()
+
+
+# Default budget shared by all filters; replace BloomFilter.memory_budget to isolate a workload.
+bloom_memory_budget = BloomMemoryBudget()
+
+
 class BloomFilter(set):  # Inherits from the set class
     """
     A Bloom Filter implementation.
@@ -13,7 +130,13 @@ class BloomFilter(set):  # Inherits from the set class
     
     The number of hash functions should satisfy:
     (hash_count = binary_vector_length * ln(2) / number_of_elements_inserted)
+
+    Membership probes on a compressed filter do not decompress it: a read-only
+    query view (sorted set-bit positions for sparse filters, a frozen bit array
+    for dense ones) is built once and its memory is accounted in memory_budget.
     """
+    memory_budget = bloom_memory_budget
+
     def __init__(self, size=1024 * 1024, hash_count=5, compressed=False):
         """
         Initializes the Bloom Filter with a given size and hash count.
@@ -36,6 +159,35 @@ class BloomFilter(set):  # Inherits from the set class
             self.bit_array = bitarray(size)
             self.bit_array.setall(0)  # Initialize all bits to 0
             self.compressed_bit_array = None
+        self._query_view = None
+        self._digest = None
+        self._revision = 0  # bumped on every content change; lets holders detect mutation cheaply
+
+    @classmethod
+    def from_bytes(cls, bit_bytes, size, hash_count):
+        """Build an uncompressed filter from raw bit-array bytes (as produced by bit_array.tobytes())."""
+        bloom = cls(0, hash_count)
+        bloom.size = size
+        bloom.bit_array = bitarray()
+        bloom.bit_array.frombytes(bit_bytes)
+        if len(bloom.bit_array) < size:
+            padding = bitarray(size - len(bloom.bit_array))
+            padding.setall(0)
+            bloom.bit_array.extend(padding)
+        del bloom.bit_array[size:]
+        return bloom
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_query_view'] = None  # derived data, rebuilt on demand
+        return state
+
+    def __setstate__(self, state):
+        # filters pickled before the query view and digest caches existed lack these attributes
+        state.setdefault('_query_view', None)
+        state.setdefault('_digest', None)
+        state.setdefault('_revision', 0)
+        self.__dict__.update(state)
 
     def __len__(self):
         """ Returns the size of the binary vector. """
@@ -78,6 +230,8 @@ class BloomFilter(set):  # Inherits from the set class
         # Free up memory
         self.bit_array = None
         self.compressed = True
+        self._query_view = None
+        self.memory_budget.release(self)
 
     def decompress(self):
         """
@@ -109,6 +263,54 @@ class BloomFilter(set):  # Inherits from the set class
             self.bit_array.setall(0)
             self.compressed_bit_array = None
             self.compressed = False
+            self._digest = None
+            self._revision += 1
+        self._query_view = None
+        self.memory_budget.release(self)
+
+    def _drop_query_view(self):
+        """
+        Drop the cached query view (called by the memory budget, possibly from another thread).
+
+        Probes hold their own reference to the view, so one in progress finishes
+        on the old view and the next one rebuilds it.
+        """
+        self._query_view = None
+
+    def _decode_compressed_bits(self):
+        """Inflate compressed_bit_array into a temporary bitarray without changing the filter state."""
+        bits = bitarray()
+        try:
+            compressed_data = base64.b64decode(self.compressed_bit_array.encode('utf-8'))
+            bits.frombytes(zlib.decompress(compressed_data))
+        except (zlib.error, base64.binascii.Error, AttributeError):
+            # Same fallback as decompress(): an unreadable payload behaves like an empty filter
+            pass
+        return bits
+
+    def _get_query_view(self):
+        """
+        Return the read-only query view of a compressed filter, building it on first use.
+
+        Sparse filters (the common case for block blooms) are held as a sorted
+        array of set-bit positions probed with bisect; dense filters fall back
+        to a frozenbitarray. The compressed payload itself is left untouched.
+        """
+        view = self._query_view
+        if view is None:
+            bits = self._decode_compressed_bits()
+            set_bits = bits.count() if len(bits) else 0
+            if set_bits * 4 < len(bits) // 8:
+                view = array('I', bits.search(bitarray('1'))) if set_bits else array('I')
+            else:
+                view = frozenbitarray(bits)
+            self._query_view = view
+        if isinstance(view, array):
+            nbytes = len(view) * view.itemsize
+        else:
+            nbytes = len(view) // 8
+        self.memory_budget.touch(self, nbytes)
+        return view
 
     def get_compression_ratio(self):
         """
@@ -128,6 +330,23 @@ class BloomFilter(set):  # Inherits from the set class
         
         return original_size / compressed_size
 
+    def count_set_bits(self):
+        """
+        Count the set bits with bitarray's native popcount.
+
+        Compressed filters are counted from their query view when one exists,
+        otherwise from a temporary inflated copy; the filter stays compressed.
+        """
+        if not self.compressed:
+            return self.bit_array.count()
+        view = self._query_view
+        if isinstance(view, array):
+            return len(view)
+        if view is not None:
+            return view.count()
+        bits = self._decode_compressed_bits()
+        return bits.count() if len(bits) else 0
+
     def get_statistics(self):
         """
         Get statistics about the bit array including density and compression info.
@@ -136,20 +355,10 @@ class BloomFilter(set):  # Inherits from the set class
             dict: Dictionary containing bit array statistics
         """
         total_bits = self.size
-        
-        # Ensure uncompressed for density calculation
-        was_compressed = self.compressed
-        if was_compressed:
-            self._ensure_uncompressed()
-            
-        set_bits = sum(1 for bit in self.bit_array if bit == 1)
+        set_bits = self.count_set_bits()
         density = set_bits / total_bits if total_bits > 0 else 0
         compression_ratio = self.get_compression_ratio()
         
-        # Restore original state
-        if was_compressed:
-            self._ensure_compressed()
-        
         return {
             'total_bits': total_bits,
             'set_bits': set_bits,
@@ -159,6 +368,7 @@ class BloomFilter(set):  # Inherits from the set class
             'compressed_storage': self.compressed
         }
 
+    @timed("bloom.insert")
     def add(self, item):
         """
         Adds an item to the Bloom Filter.
@@ -172,8 +382,30 @@ class BloomFilter(set):  # Inherits from the set class
             index = mmh3.hash(item, ii) % self.size  # Calculate the bit position to set
             self.bit_array[index] = 1  # Set the bit at the calculated position
 
+        self._digest = None
+        self._revision += 1
         return self
 
+    def digest(self):
+        """
+        Canonical SHA-256 digest of the filter (parameters plus raw bit bytes).
+
+        Independent of the storage mode, so a compressed and an uncompressed copy
+        of the same filter agree. Cached until the filter is modified.
+        """
+        if self._digest is None:
+            if self.compressed:
+                bit_bytes = self._decode_compressed_bits().tobytes()
+            else:
+                bit_bytes = self.bit_array.tobytes()
+            expected_len = (self.size + 7) // 8
+            if len(bit_bytes) < expected_len:
+                bit_bytes += bytes(expected_len - len(bit_bytes))
+            hasher = hashlib.sha256(struct.pack('>QI', self.size, self.hash_count))
+            hasher.update(bit_bytes)
+            self._digest = hasher.digest()
+        return self._digest
+
     def __contains__(self, item):
         """
         Checks if an item is in the Bloom Filter.
@@ -184,8 +416,9 @@ class BloomFilter(set):  # Inherits from the set class
         Returns:
             bool: True if the item might be in the filter, False if it's definitely not.
         """
-        self._ensure_uncompressed()
-        
+        if self.compressed:
+            return self._contains_compressed(item)
+
         for ii in range(self.hash_count):
             index = mmh3.hash(item, ii) % self.size
             if self.bit_array[index] == 0:
@@ -193,6 +426,44 @@ class BloomFilter(set):  # Inherits from the set class
 
         return True  # Item might be in the filter (subject to false positives)
 
+    @staticmethod
+    def hash_positions(item, size, hash_count):
+        """Bit positions an item maps to in a filter with the given parameters."""
+        return [mmh3.hash(item, ii) % size for ii in range(hash_count)]
+
+    def set_bit_positions(self):
+        """
+        Return the sorted positions of all set bits.
+
+        Compressed filters are read through their query view, so this does not
+        decompress them.
+        """
+        if not self.compressed:
+            return list(self.bit_array.search(bitarray('1')))
+        view = self._get_query_view()
+        if isinstance(view, array):
+            return list(view)
+        return list(view.search(bitarray('1')))
+
+    def _contains_compressed(self, item):
+        """Membership probe answered from the query view; the filter stays compressed."""
+        view = self._get_query_view()
+        if isinstance(view, array):
+            view_len = len(view)
+            for ii in range(self.hash_count):
+                index = mmh3.hash(item, ii) % self.size
+                pos = bisect_left(view, index)
+                if pos == view_len or view[pos] != index:
+                    return False
+            return True
+
+        view_len = len(view)
+        for ii in range(self.hash_count):
+            index = mmh3.hash(item, ii) % self.size
+            if index >= view_len or not view[index]:
+                return False
+        return True
+
 import json
 
 class BloomFilterEncoder(json.JSONEncoder):
@@ -6,10 +6,16 @@ import os
 sys.path.insert(0, os.path.dirname(__file__) + '/..')
 
 from EZ_Tool_Box.Hash import sha256_hash
+from EZ_Tool_Box.Metrics import metrics, timed
+from EZ_Tool_Box.Slots import SlottedPickleMixin
+
+_leaves_histogram = metrics.histogram("merkle.leaves")
 
 # TODO: 默克尔树构造前的数据类型检查。
 
-class MerkleTreeNode:
+class MerkleTreeNode(SlottedPickleMixin):
+    __slots__ = ('left', 'right', 'value', 'content', 'path', 'leaf_index', 'father')
+
     def __init__(self, left, right, value, content=None, path=[], leaf_index=None):
         self.left = left
         self.right = right
@@ -29,7 +35,9 @@ class MerkleTree:
         self.prf_list = None
         self.build_tree(values, is_genesis_block)
 
+    @timed("merkle.build")
     def build_tree(self, leaves, is_genesis_block):
+        _leaves_histogram.observe(len(leaves))
         leaves = [MerkleTreeNode(None, None, sha256_hash(e), e, leaf_index=index) for index, e in
                   enumerate(leaves, start=0)]
 
@@ -1,4 +1,15 @@
-class ProofUnit:  # 一个值在一个区块内的证明
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Tool_Box.Slots import SlottedPickleMixin
+
+
+class ProofUnit(SlottedPickleMixin):  # 一个值在一个区块内的证明
+    __slots__ = ('owner', 'ownerAccTxnsList', 'ownerMTreePrfList')
+
     def __init__(self, owner, ownerAccTxnsList, ownerMTreePrfList):
         self.owner = owner
         self.ownerAccTxnsList = ownerAccTxnsList  # 在此区块内的ownTxns
@@ -12,9 +23,30 @@ class ProofUnit:  # 一个值在一个区块内的证明
         print('ownerMTreePrfList: ' + '\n' + ownerMTreePrfList_str)
 
 
+class ProofAnchor:  # 证明被剪枝后留下的锚点：对应检查点的owner和区块高度
+    def __init__(self, owner, blockIndex, prunedUnits):
+        self.owner = owner
+        self.blockIndex = blockIndex  # prfList[0]所在区块，即检查点高度
+        self.prunedUnits = prunedUnits  # 被删除的ProofUnit总数
+
+    def __eq__(self, other):
+        return (isinstance(other, ProofAnchor) and self.owner == other.owner and
+                self.blockIndex == other.blockIndex and self.prunedUnits == other.prunedUnits)
+
+
 class Proof:
-    def __init__(self, prfList):
+    def __init__(self, prfList, anchor=None):
         self.prfList = prfList
+        self.anchor = anchor  # None表示证明从创世块开始完整
+
+    def prune_prefix(self, keepFrom, blockIndex):
+        # 删除prfList[:keepFrom]，prfList[0]变为检查点所在区块的证明单元
+        if keepFrom <= 0:
+            return 0
+        pruned = keepFrom + (self.anchor.prunedUnits if self.anchor is not None else 0)
+        del self.prfList[:keepFrom]
+        self.anchor = ProofAnchor(self.prfList[0].owner, blockIndex, pruned)
+        return keepFrom
 
     def add_prf_unit(self, prfUint):
         self.prfList.append(prfUint)
@@ -26,6 +58,9 @@ class Proof:
         return self.prfList[-1].owner
 
     def print_proof(self):
+        if self.anchor is not None:
+            print('anchor: owner ' + str(self.anchor.owner) + ' at block ' + str(self.anchor.blockIndex) +
+                  ' (' + str(self.anchor.prunedUnits) + ' units pruned)')
         for index, item in enumerate(self.prfList):
             print('#'+str(index)+' prf_unit: ')
             item.print_proof_unit()
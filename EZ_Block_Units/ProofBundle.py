@@ -0,0 +1,334 @@
+import sys
+import os
+import io
+import re
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Block_Units.Proof import Proof, ProofUnit, ProofAnchor
+from EZ_Block_Units.MerkleProof import MerkleTreeProof
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Transaction.SingleTransaction import Transaction
+from EZ_Value.Value import Value, ValueState
+
+BUNDLE_MAGIC = b"EZP2"
+
+# Record tags. Definitions (hash, string, unit) are emitted the first time they are
+# referenced, so a bundle can be written and read as a stream.
+_TAG_END = 0
+_TAG_HASH = 1
+_TAG_STRING = 2
+_TAG_UNIT = 3
+_TAG_VPB = 4
+_TAG_ANCHORED_VPB = 5  # VPB record followed by the ProofAnchor of a pruned proof
+
+# Kinds of unit transactions. Bundles come from peers, so only the compact field
+# encoding exists (kind 1, a pickle fallback in EZP1, is gone). Digests and
+# txns_root are not written: the reader derives them from the transactions.
+_TXNS_MULTI = 0  # MultiTransactions in the compact field encoding below
+_TXNS_AGGREGATE = 2  # aggregate-signed MultiTransactions in the same encoding
+
+_HEX_HASH = re.compile(r"^[0-9a-f]{64}$")
+_VALUE_STATES = list(ValueState)
+
+
+def _write_varint(out: BinaryIO, n: int) -> None:
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.write(bytes((byte | 0x80,)))
+        else:
+            out.write(bytes((byte,)))
+            return
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated proof bundle")
+    return data
+
+
+def _read_varint(stream: BinaryIO) -> int:
+    result = 0
+    shift = 0
+    while True:
+        byte = _read_exact(stream, 1)[0]
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result
+        shift += 7
+
+
+def _write_bytes(out: BinaryIO, data: bytes) -> None:
+    _write_varint(out, len(data))
+    out.write(data)
+
+
+def _read_bytes(stream: BinaryIO) -> bytes:
+    return _read_exact(stream, _read_varint(stream))
+
+
+class ProofBundleWriter:
+    """
+    Streaming writer for a binary bundle of VPBs (value, Proof, block index list).
+
+    Merkle proof hashes are interned (raw 32 bytes, written once) and a
+    ProofUnit shared by several values - e.g. values moved by the same
+    transaction - is written once and referenced by id afterwards. Block
+    indices are delta-encoded varints.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._hash_ids: Dict[str, int] = {}
+        self._string_ids: Dict[str, int] = {}
+        self._unit_ids: Dict[object, int] = {}
+        self._closed = False
+        stream.write(BUNDLE_MAGIC)
+
+    def _hash_ref(self, item: str) -> int:
+        # ref = id << 1 | is_string; non-hash items go to the string table
+        if isinstance(item, str) and _HEX_HASH.match(item):
+            ref_id = self._hash_ids.get(item)
+            if ref_id is None:
+                ref_id = len(self._hash_ids)
+                self._hash_ids[item] = ref_id
+                self.stream.write(bytes((_TAG_HASH,)))
+                self.stream.write(bytes.fromhex(item))
+            return ref_id << 1
+        return (self._string_ref(str(item)) << 1) | 1
+
+    def _string_ref(self, item: str) -> int:
+        ref_id = self._string_ids.get(item)
+        if ref_id is None:
+            ref_id = len(self._string_ids)
+            self._string_ids[item] = ref_id
+            self.stream.write(bytes((_TAG_STRING,)))
+            _write_bytes(self.stream, item.encode("utf-8"))
+        return ref_id
+
+    def _optional_string_ref(self, item) -> int:
+        return 0 if item is None else self._string_ref(item) + 1
+
+    def _write_optional_bytes(self, data) -> None:
+        if data is None:
+            self.stream.write(b"\x00")
+        else:
+            self.stream.write(b"\x01")
+            _write_bytes(self.stream, data)
+
+    def _write_value(self, value: Value) -> None:
+        out = self.stream
+        begin = value.get_decimal_begin_index()
+        _write_bytes(out, begin.to_bytes((begin.bit_length() + 7) // 8 or 1, "big"))
+        _write_varint(out, value.value_num)
+        out.write(bytes((_VALUE_STATES.index(value.state),)))
+
+    @staticmethod
+    def _is_compactable(accTxns) -> bool:
+        if not isinstance(accTxns, MultiTransactions):
+            return False
+        for txn in accTxns.multi_txns:
+            if not (isinstance(txn, Transaction) and isinstance(txn.nonce, int) and txn.nonce >= 0
+                    and all(isinstance(v, Value) for v in txn.value)):
+                return False
+        return True
+
+    def _write_multi_txns(self, accTxns: MultiTransactions) -> None:
+        # definitions are emitted before the unit record, so collect the references first
+        senderRef = self._optional_string_ref(accTxns.sender)
+        timeRef = self._optional_string_ref(accTxns.time)
+        txnRefs = [(self._optional_string_ref(txn.sender), self._optional_string_ref(txn.recipient),
+                    self._optional_string_ref(txn.time)) for txn in accTxns.multi_txns]
+
+        out = self.stream
+        out.write(bytes((_TAG_UNIT,)))
+        out.write(bytes((_TXNS_AGGREGATE if accTxns.is_aggregate else _TXNS_MULTI,)))
+        _write_varint(out, senderRef)
+        _write_varint(out, timeRef)
+        self._write_optional_bytes(accTxns.signature)
+        _write_varint(out, len(accTxns.multi_txns))
+        for txn, (txnSenderRef, recipientRef, txnTimeRef) in zip(accTxns.multi_txns, txnRefs):
+            _write_varint(out, txnSenderRef)
+            _write_varint(out, recipientRef)
+            _write_varint(out, txnTimeRef)
+            _write_varint(out, txn.nonce)
+            self._write_optional_bytes(txn.signature)
+            _write_varint(out, len(txn.value))
+            for value in txn.value:
+                self._write_value(value)
+
+    @staticmethod
+    def _unit_key(unit: ProofUnit):
+        accTxns = unit.ownerAccTxnsList
+        mTreePrf = unit.ownerMTreePrfList
+        prfList = mTreePrf.mt_prf_list if isinstance(mTreePrf, MerkleTreeProof) else mTreePrf
+        if not isinstance(accTxns, MultiTransactions):
+            return id(unit)
+        # keyed like the reader sees it: by the digest of the transactions, not a stored one
+        digest = accTxns.compute_digest()
+        return unit.owner, digest, tuple(prfList)
+
+    def _unit_ref(self, unit: ProofUnit) -> int:
+        key = self._unit_key(unit)
+        ref_id = self._unit_ids.get(key)
+        if ref_id is not None:
+            return ref_id
+
+        accTxns = unit.ownerAccTxnsList
+        if not self._is_compactable(accTxns):
+            raise ValueError("Proof unit transactions must be a MultiTransactions of Transactions and Values")
+        mTreePrf = unit.ownerMTreePrfList
+        prfList = mTreePrf.mt_prf_list if isinstance(mTreePrf, MerkleTreeProof) else mTreePrf
+        ownerRef = self._string_ref(str(unit.owner))
+        prfRefs = [self._hash_ref(item) for item in prfList]
+        out = self.stream
+        self._write_multi_txns(accTxns)
+
+        ref_id = len(self._unit_ids)
+        self._unit_ids[key] = ref_id
+        _write_varint(out, ownerRef)
+        _write_varint(out, len(prfRefs))
+        for ref in prfRefs:
+            _write_varint(out, ref)
+        return ref_id
+
+    def write_vpb(self, vpb) -> None:
+        value, proof, blockIndexList = vpb[0], vpb[1], vpb[2]
+        if len(proof.prfList) != len(blockIndexList):
+            raise ValueError("Proof units and block indices do not match")
+        if any(cur < prev for prev, cur in zip(blockIndexList, blockIndexList[1:])):
+            raise ValueError("Block indices must be non-decreasing")
+        unitRefs = [self._unit_ref(unit) for unit in proof.prfList]
+        anchor = getattr(proof, 'anchor', None)
+        anchorOwnerRef = self._string_ref(str(anchor.owner)) if anchor is not None else None
+
+        out = self.stream
+        out.write(bytes((_TAG_VPB if anchor is None else _TAG_ANCHORED_VPB,)))
+        self._write_value(value)
+        _write_varint(out, len(unitRefs))
+        prevHeight = 0
+        for ref, height in zip(unitRefs, blockIndexList):
+            _write_varint(out, ref)
+            _write_varint(out, height - prevHeight)
+            prevHeight = height
+        if anchor is not None:
+            _write_varint(out, anchorOwnerRef)
+            _write_varint(out, anchor.blockIndex)
+            _write_varint(out, anchor.prunedUnits)
+
+    def close(self) -> None:
+        """Write the end marker (the underlying stream stays open)."""
+        if not self._closed:
+            self.stream.write(bytes((_TAG_END,)))
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+
+def _read_value(stream: BinaryIO) -> Value:
+    begin = int.from_bytes(_read_bytes(stream), "big")
+    valueNum = _read_varint(stream)
+    state = _VALUE_STATES[_read_exact(stream, 1)[0]]
+    return Value(hex(begin), valueNum, state)
+
+
+def _read_optional_bytes(stream: BinaryIO):
+    if _read_exact(stream, 1)[0]:
+        return _read_bytes(stream)
+    return None
+
+
+def _read_multi_txns(stream: BinaryIO, strings: List[str], hashes: List[str],
+                     aggregate: bool = False) -> MultiTransactions:
+    def optional_string():
+        ref = _read_varint(stream)
+        return None if ref == 0 else strings[ref - 1]
+
+    sender = optional_string()
+    txnsTime = optional_string()
+    signature = _read_optional_bytes(stream)
+    txns = []
+    for _ in range(_read_varint(stream)):
+        txnSender = optional_string()
+        recipient = optional_string()
+        txnTime = optional_string()
+        nonce = _read_varint(stream)
+        txnSignature = _read_optional_bytes(stream)
+        values = [_read_value(stream) for _ in range(_read_varint(stream))]
+        txns.append(Transaction(txnSender, recipient, nonce, txnSignature, values, txnTime))
+
+    accTxns = MultiTransactions(sender, txns)
+    accTxns.time = txnsTime
+    accTxns.signature = signature
+    if aggregate:
+        accTxns.txns_root = accTxns.compute_txns_root()
+    # never taken from the bundle: a digest that disagrees with the transactions cannot be sent
+    accTxns.digest = accTxns.compute_digest()
+    return accTxns
+
+
+def iter_proof_bundle(stream: BinaryIO) -> Iterator[Tuple[Value, Proof, List[int]]]:
+    """Yield VPBs from a bundle one by one; shared proof units are decoded once and shared."""
+    if _read_exact(stream, len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+        raise ValueError("Not a proof bundle")
+    hashes: List[str] = []
+    strings: List[str] = []
+    units: List[ProofUnit] = []
+
+    while True:
+        tag = _read_exact(stream, 1)[0]
+        if tag == _TAG_END:
+            return
+        if tag == _TAG_HASH:
+            hashes.append(_read_exact(stream, 32).hex())
+        elif tag == _TAG_STRING:
+            strings.append(_read_bytes(stream).decode("utf-8"))
+        elif tag == _TAG_UNIT:
+            txnsKind = _read_exact(stream, 1)[0]
+            if txnsKind != _TXNS_MULTI and txnsKind != _TXNS_AGGREGATE:
+                raise ValueError(f"Unknown transactions kind {txnsKind} in proof bundle")
+            accTxns = _read_multi_txns(stream, strings, hashes, txnsKind == _TXNS_AGGREGATE)
+            owner = strings[_read_varint(stream)]
+            prfList = []
+            for _ in range(_read_varint(stream)):
+                ref = _read_varint(stream)
+                prfList.append(strings[ref >> 1] if ref & 1 else hashes[ref >> 1])
+            units.append(ProofUnit(owner, accTxns, prfList))
+        elif tag == _TAG_VPB or tag == _TAG_ANCHORED_VPB:
+            value = _read_value(stream)
+            prfUnits = []
+            blockIndexList = []
+            height = 0
+            for _ in range(_read_varint(stream)):
+                prfUnits.append(units[_read_varint(stream)])
+                height += _read_varint(stream)
+                blockIndexList.append(height)
+            anchor = None
+            if tag == _TAG_ANCHORED_VPB:
+                anchorOwner = strings[_read_varint(stream)]
+                anchor = ProofAnchor(anchorOwner, _read_varint(stream), _read_varint(stream))
+            yield value, Proof(prfUnits, anchor), blockIndexList
+        else:
+            raise ValueError(f"Unknown record tag {tag} in proof bundle")
+
+
+def encode_vpb_bundle(vpbs) -> bytes:
+    out = io.BytesIO()
+    with ProofBundleWriter(out) as writer:
+        for vpb in vpbs:
+            writer.write_vpb(vpb)
+    return out.getvalue()
+
+
+def decode_vpb_bundle(data: bytes) -> List[Tuple[Value, Proof, List[int]]]:
+    return list(iter_proof_bundle(io.BytesIO(data)))
@@ -1,115 +1,163 @@
-import copy
+import sys
+import os
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Value.Value import Value
+
+
+def checkpoint_height(ckBIndex) -> int:
+    # checkpoints store the VPB block index; for a block index list its last entry is the height
+    if isinstance(ckBIndex, (list, tuple)):
+        return ckBIndex[-1]
+    return ckBIndex
 
 
 class CheckedVPBList:
-    def __init__(self):
-        self.VPBCheckPoints = []
+    """
+    Checkpoints of already verified VPBs (value, proof, block index).
+
+    A checkpoint records that a value range was verified up to block ckBIndex
+    with ckOwner as its latest owner. Checkpoints never overlap and are kept
+    sorted by begin index (self.VPBCheckPoints, with the decimal bounds in the
+    parallel lists self._begins / self._ends), so the checkpoint covering a
+    value is found by bisection. Inserting a checkpoint splits the ranges it
+    overlaps instead of scanning and deep-copying the whole list.
+
+    With a VPBCheckPointStore the checkpoints are loaded on construction and
+    every batch of updates is written through, so verification work survives
+    restarts.
+    """
+
+    def __init__(self, store=None):
+        self.VPBCheckPoints: List[Tuple[Value, str, int]] = []  # (ckValue, ckOwner, ckBIndex), sorted by begin
+        self._begins: List[int] = []
+        self._ends: List[int] = []
+        self.store = store
+        if store is not None:
+            # rows come back sorted and non-overlapping
+            for ckValue, ckOwner, ckBIndex in store.load_check_points():
+                self.VPBCheckPoints.append((ckValue, ckOwner, ckBIndex))
+                self._begins.append(ckValue.get_decimal_begin_index())
+                self._ends.append(ckValue.get_decimal_end_index())
+
+    def __len__(self):
+        return len(self.VPBCheckPoints)
+
+    def _overlap_slice(self, begin: int, end: int) -> Tuple[int, int]:
+        # Positions [lo, hi) of the checkpoints intersecting [begin, end]
+        lo = bisect_right(self._begins, begin) - 1
+        if lo < 0 or self._ends[lo] < begin:
+            lo += 1
+        hi = bisect_right(self._begins, end, lo)
+        return lo, hi
+
+    def find_check_point(self, value: Value) -> Optional[Tuple[str, int]]:
+        """Return (ckOwner, ckBIndex) of the checkpoint that fully includes value, or None."""
+        pos = bisect_right(self._begins, value.get_decimal_begin_index()) - 1
+        if pos >= 0 and self._ends[pos] >= value.get_decimal_end_index():
+            _, ckOwner, ckBIndex = self.VPBCheckPoints[pos]
+            return ckOwner, ckBIndex
+        return None
 
     def findCKviaVPB(self, VPB):
         # Input VPB and check if the V of this VPB is included in the checkpoint.
         # Note that it should be an "inclusion" relationship (i.e., checkpoint includes this value).
+        # Checkpoints do not overlap, so at most one checkpoint can be returned.
 
         # todo: re-write this func in dst mode, when fork appear, which need more blocks to confirm a txn.
         #  the logic of find-ck should be re-build.
+        found = self.find_check_point(VPB[0])
+        return [found] if found is not None else []
+
+    def add_check_point(self, value: Value, owner, blockIndex) -> None:
+        """
+        Record value as verified up to blockIndex with owner as its latest owner.
+
+        Parts of existing checkpoints covered by value are replaced; the parts
+        outside value keep their old owner and block index.
+        """
+        begin = value.get_decimal_begin_index()
+        end = value.get_decimal_end_index()
+        lo, hi = self._overlap_slice(begin, end)
 
-        value = VPB[0]
-        returnList = []
-        indexList = []
-        if self.VPBCheckPoints != []:
-            for index, ck in enumerate(self.VPBCheckPoints):
-                # un-package this vpb-ck
-                ckValue = ck[0]
-                ckOwner = ck[1]
-                ckBIndex = ck[2]
-                # check inclusion relationship between ck and value
-                if ckValue.isInValue(value):
-                    returnList.append((ckOwner, ckBIndex))
-                    indexList.append(index)
-            if len(returnList) > 1:
-                raise ValueError("more than 1 ck is found !!!")
-        return returnList
+        entries = [(value, owner, blockIndex)]
+        begins = [begin]
+        ends = [end]
+        if lo < hi:
+            # left rest of the first overlapped checkpoint
+            firstBegin = self._begins[lo]
+            if firstBegin < begin:
+                _, VOwner, BIndex = self.VPBCheckPoints[lo]
+                entries.insert(0, (Value(hex(firstBegin), begin - firstBegin), VOwner, BIndex))
+                begins.insert(0, firstBegin)
+                ends.insert(0, begin - 1)
+            # right rest of the last overlapped checkpoint
+            lastEnd = self._ends[hi - 1]
+            if lastEnd > end:
+                _, VOwner, BIndex = self.VPBCheckPoints[hi - 1]
+                entries.append((Value(hex(end + 1), lastEnd - end), VOwner, BIndex))
+                begins.append(end + 1)
+                ends.append(lastEnd)
+
+        self.VPBCheckPoints[lo:hi] = entries
+        self._begins[lo:hi] = begins
+        self._ends[lo:hi] = ends
 
     def fresh_local_vpb_check_point_dst(self, will_sent_vpb_pairs):
+        batch = []
         for vpb in will_sent_vpb_pairs:
             value = vpb[0]
             valuePrf = vpb[1].prfList
-            blockIndex = vpb[2]
-            LatestPrfUnit = valuePrf[-1]
-            LatestOwner = LatestPrfUnit.owner
-
-            if self.VPBCheckPoints != []:
-                newVPBCP = [value, LatestOwner, blockIndex]
-                RestVPBCPs = None
-                delIndex = None
-                for index, VPBCP in enumerate(self.VPBCheckPoints, start=0):
-                    V = VPBCP[0]
-                    VOwner = VPBCP[1]
-                    BIndex = VPBCP[2]
-                    intersectValueReslut = V.getIntersectValue(value)
-                    if intersectValueReslut != None:
-                        # The value in the newly held VPB intersects with the original checkpoint (v)
-                        # and needs to be processed before adding a checkpoint
-                        if delIndex:
-                            raise ValueError('delIndex Err: There are multiple delIndices!')
-                        IntersectValue, RestValues = intersectValueReslut
-                        delIndex = index
-                        RestVPBCPs = []
-                        if RestValues != []:
-                            for item in RestValues:
-                                tmpRestVPBCP = [item, VOwner, BIndex]
-                                RestVPBCPs.append(tmpRestVPBCP)
-                        break
-                if RestVPBCPs != None:
-                    # If RestVPBCPs=[], it means that the entire value
-                    # needs to be updated without splitting the remaining parts
-                    self.VPBCheckPoints.append(copy.deepcopy(newVPBCP))
-                    for item in RestVPBCPs:
-                        self.VPBCheckPoints.append(copy.deepcopy(item))
-                    # Delete split check points
-                    del self.VPBCheckPoints[delIndex]
-                else:  # This value is completely "foreign", i.e., "first time seen".
-                    self.VPBCheckPoints.append(copy.deepcopy(newVPBCP))
-            else:  # Add the first batch of VPB checkpoints
-                VPBCP = [value, LatestOwner, blockIndex]
-                self.VPBCheckPoints.append(copy.deepcopy(VPBCP))
+            # vpb[2] is the block index list; memory and store both keep its height
+            blockIndex = checkpoint_height(vpb[2])
+            LatestOwner = valuePrf[-1].owner
+            batch.append((value, LatestOwner, blockIndex))
+
+        # Persist first so that memory never holds checkpoints the store has lost
+        if self.store is not None:
+            success, message = self.store.upsert_check_points(batch)
+            if not success:
+                raise RuntimeError(message)
+
+        for value, LatestOwner, blockIndex in batch:
+            # The value in the newly held VPB may intersect with original checkpoints,
+            # which are split so that only the rest keeps the old owner
+            self.add_check_point(value, LatestOwner, blockIndex)
 
     def addAndFreshCheckPoint(self, VPBPairs):
-        for VPB in VPBPairs:
-            value = VPB[0]
-            valuePrf = VPB[1].prfList
-            blockIndex = VPB[2]
-            LatestPrfUnit = valuePrf[-1]
-            LatestOwner = LatestPrfUnit.owner
-
-            if self.VPBCheckPoints != []:
-                newVPBCP = [value, LatestOwner, blockIndex]
-                RestVPBCPs = None
-                delIndex = None
-                for index, VPBCP in enumerate(self.VPBCheckPoints, start=0):
-                    V = VPBCP[0]
-                    VOwner = VPBCP[1]
-                    BIndex = VPBCP[2]
-                    intersectValueReslut = V.getIntersectValue(value)
-                    if intersectValueReslut != None:  # 新一轮持有的VPB中的value 和 原有的检查点（v） 有交集，需要处理后加入检查点
-                        if delIndex:
-                            raise ValueError('delIndex Err: 有多数个delIndex！')
-                        IntersectValue, RestValues = intersectValueReslut
-                        delIndex = index
-                        RestVPBCPs = []
-                        if RestValues != []:
-                            for item in RestValues:
-                                tmpRestVPBCP = [item, VOwner, BIndex]
-                                RestVPBCPs.append(tmpRestVPBCP)
-                        break
-                if RestVPBCPs != None:  # 若RestVPBCPs = []则说明整个值都要更新，没有拆分剩下的部分
-                    self.VPBCheckPoints.append(copy.deepcopy(newVPBCP))
-                    for item in RestVPBCPs:
-                        self.VPBCheckPoints.append(copy.deepcopy(item))
-                    # 删除被拆分的check points
-                    del self.VPBCheckPoints[delIndex]
-                else:  # 说明此值完全是"外来"，"第一次见到"。
-                    self.VPBCheckPoints.append(copy.deepcopy(newVPBCP))
-
-            else:  # 添加第一批VPB检查点
-                VPBCP = [value, LatestOwner, blockIndex]
-                self.VPBCheckPoints.append(copy.deepcopy(VPBCP))
\ No newline at end of file
+        # 新一轮持有的VPB中的value 和 原有的检查点（v）有交集时，拆分原检查点后加入新检查点
+        self.fresh_local_vpb_check_point_dst(VPBPairs)
+
+    def compact_vpb(self, vpb) -> int:
+        """
+        Drop the proof prefix already covered by a checkpoint, in place.
+
+        vpb is (value, Proof, blockIndexList). When a checkpoint covering the
+        value matches the proof unit at its height, the units before it are
+        removed and the Proof gets an anchor for that height; the unit at the
+        checkpoint is kept because it holds the next transfer. Returns the
+        number of dropped units.
+        """
+        value, proof, blockIndexList = vpb[0], vpb[1], vpb[2]
+        found = self.find_check_point(value)
+        if found is None:
+            return 0
+        ckOwner, ckBIndex = found
+        ckHeight = checkpoint_height(ckBIndex)
+        for keepFrom, height in enumerate(blockIndexList):
+            if height == ckHeight:
+                if proof.prfList[keepFrom].owner != ckOwner:
+                    return 0
+                dropped = proof.prune_prefix(keepFrom, ckHeight)
+                del blockIndexList[:dropped]
+                return dropped
+            if height > ckHeight:
+                break
+        return 0
+
+    def compact_vpbs(self, vpbs) -> int:
+        return sum(self.compact_vpb(vpb) for vpb in vpbs)
@@ -0,0 +1,171 @@
+import sys
+import os
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Value.Value import Value
+from EZ_Block_Units.VPBCheckPoint import checkpoint_height
+from EZ_Tool_Box.Metrics import timed
+
+# Value indices go up to 2^259, beyond SQLite's 64-bit integers; they are stored as
+# fixed-width hex text so that text order equals numeric order.
+_INDEX_KEY_WIDTH = 66
+
+
+def _index_key(decimal_index: int) -> str:
+    return format(decimal_index, f"0{_INDEX_KEY_WIDTH}x")
+
+
+class VPBCheckPointStore:
+    """
+    SQLite persistence for VPB checkpoints, keyed by value range.
+
+    Rows never overlap: an upsert removes the rows its range intersects and
+    writes back their uncovered remainders together with the new checkpoint.
+    Each batch runs in a single transaction (WAL journal), so a crash leaves
+    either the whole batch or none of it on disk.
+    """
+
+    def __init__(self, db_path: str = "vpb_checkpoints.db"):
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.stats = {
+            'batches': 0,
+            'upserts': 0,
+            'splits': 0
+        }
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=FULL')
+        return conn
+
+    def _init_database(self):
+        """Initialize SQLite database for checkpoint persistence"""
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS vpb_checkpoints (
+                        begin_key TEXT PRIMARY KEY,
+                        end_key TEXT NOT NULL,
+                        owner TEXT NOT NULL,
+                        block_index INTEGER NOT NULL
+                    )
+                ''')
+                conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ck_end ON vpb_checkpoints(end_key)
+                ''')
+                conn.commit()
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _row_to_check_point(row) -> Tuple[Value, str, int]:
+        begin_key, end_key, owner, block_index = row
+        begin = int(begin_key, 16)
+        return Value(hex(begin), int(end_key, 16) - begin + 1), owner, block_index
+
+    @timed("vpb_checkpoints.sqlite.upsert")
+    def upsert_check_points(self, check_points: Iterable[Tuple[Value, str, int]]) -> Tuple[bool, str]:
+        """
+        Write a batch of (value, owner, blockIndex) checkpoints atomically.
+        A block index list is stored as its height.
+
+        Returns: (success, message)
+        """
+        check_points = list(check_points)
+        if not check_points:
+            return True, "No checkpoints to store"
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    splits = 0
+                    for value, owner, block_index in check_points:
+                        begin = value.get_decimal_begin_index()
+                        end = value.get_decimal_end_index()
+                        begin_key, end_key = _index_key(begin), _index_key(end)
+                        overlapped = conn.execute('''
+                            SELECT begin_key, end_key, owner, block_index FROM vpb_checkpoints
+                            WHERE begin_key <= ? AND end_key >= ?
+                        ''', (end_key, begin_key)).fetchall()
+                        conn.execute('''
+                            DELETE FROM vpb_checkpoints WHERE begin_key <= ? AND end_key >= ?
+                        ''', (end_key, begin_key))
+
+                        rows = [(begin_key, end_key, str(owner), checkpoint_height(block_index))]
+                        for old_begin_key, old_end_key, old_owner, old_block_index in overlapped:
+                            if int(old_begin_key, 16) < begin:
+                                rows.append((old_begin_key, _index_key(begin - 1), old_owner, old_block_index))
+                                splits += 1
+                            if int(old_end_key, 16) > end:
+                                rows.append((_index_key(end + 1), old_end_key, old_owner, old_block_index))
+                                splits += 1
+                        conn.executemany('''
+                            INSERT INTO vpb_checkpoints (begin_key, end_key, owner, block_index)
+                            VALUES (?, ?, ?, ?)
+                        ''', rows)
+            except sqlite3.Error as e:
+                return False, f"Checkpoint persistence error: {e}"
+            finally:
+                conn.close()
+
+            self.stats['batches'] += 1
+            self.stats['upserts'] += len(check_points)
+            self.stats['splits'] += splits
+            return True, f"Stored {len(check_points)} checkpoints"
+
+    @timed("vpb_checkpoints.sqlite.load")
+    def load_check_points(self) -> List[Tuple[Value, str, int]]:
+        """All checkpoints, sorted by begin index."""
+        with self.lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute('''
+                    SELECT begin_key, end_key, owner, block_index FROM vpb_checkpoints ORDER BY begin_key
+                ''').fetchall()
+            finally:
+                conn.close()
+        return [self._row_to_check_point(row) for row in rows]
+
+    def find_check_point(self, value: Value) -> Optional[Tuple[str, int]]:
+        """Return (owner, blockIndex) of the stored checkpoint that fully includes value, or None."""
+        begin_key = _index_key(value.get_decimal_begin_index())
+        end_key = _index_key(value.get_decimal_end_index())
+        with self.lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('''
+                    SELECT end_key, owner, block_index FROM vpb_checkpoints
+                    WHERE begin_key <= ? ORDER BY begin_key DESC LIMIT 1
+                ''', (begin_key,)).fetchone()
+            finally:
+                conn.close()
+        if row is None or row[0] < end_key:
+            return None
+        return row[1], row[2]
+
+    def count(self) -> int:
+        with self.lock:
+            conn = self._connect()
+            try:
+                return conn.execute('SELECT COUNT(*) FROM vpb_checkpoints').fetchone()[0]
+            finally:
+                conn.close()
+
+    def clear(self):
+        with self.lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute('DELETE FROM vpb_checkpoints')
+            finally:
+                conn.close()
@@ -0,0 +1,425 @@
+import sys
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Block_Units.MerkleProof import MerkleTreeProof
+from EZ_Block_Units.Proof import ProofUnit
+from EZ_Block_Units.VPBCheckPoint import checkpoint_height
+
+
+@dataclass
+class VPBVerificationResult:
+    """Outcome of verifying one VPB (value, proof, block index list)"""
+    is_valid: bool
+    error_message: str = ""
+    start_height: int = -1  # height of the checkpoint the check started from (-1: genesis)
+    verified_units: int = 0  # proof units checked against block roots and blooms
+    skipped_units: int = 0  # proof units covered by a checkpoint
+    cache_hits: int = 0  # proof units already verified earlier
+
+
+@dataclass
+class VPBBundleResult:
+    """Outcome of verifying a bundle of VPBs"""
+    is_valid: bool
+    error_message: str = ""
+    failed_index: int = -1  # position of the first invalid VPB
+    results: List[VPBVerificationResult] = field(default_factory=list)  # per VPB, up to the failure
+    unit_checks: int = 0  # distinct Merkle checks run
+    deduplicated_checks: int = 0  # unit checks shared with another VPB of the bundle
+
+    def fail(self, position: int, message: str) -> 'VPBBundleResult':
+        self.is_valid = False
+        self.failed_index = position
+        self.error_message = f"VPB {position}: {message}"
+        return self
+
+
+def _check_unit_task(task) -> Tuple[Optional[str], str]:
+    """
+    The chain-independent part of a unit check: recompute the digest of the
+    unit's transactions, check their sender and, unless the unit is cached
+    (prfList is None), its Merkle proof. Returns (digest, "") or (None, error).
+    """
+    accTxns, owner, height, prfList, root = task
+    # the Merkle leaf is derived from the transactions, so tampered transactions fail the proof
+    digest = accTxns.compute_digest()
+    if getattr(accTxns, 'digest', None) != digest:
+        return None, f"Transaction digest at block {height} does not match its transactions"
+    if getattr(accTxns, 'sender', owner) != owner:
+        return None, f"Transactions at block {height} are not sent by {owner}"
+    if prfList is not None and not MerkleTreeProof(prfList).check_prf(digest, root):
+        return None, f"Merkle proof does not match the root of block {height}"
+    return digest, ""
+
+
+def _check_unit_chunk(offset: int, tasks) -> Tuple[List[str], Optional[Tuple[int, str]]]:
+    # runs in worker processes; stops at the first failing unit
+    digests = []
+    for i, task in enumerate(tasks):
+        digest, message = _check_unit_task(task)
+        if digest is None:
+            return digests, (offset + i, message)
+        digests.append(digest)
+    return digests, None
+
+
+class VPBVerifier:
+    """
+    Incremental verifier for VPBs.
+
+    A VPB is (value, Proof, blockIndexList) where prfList[i] is the ProofUnit
+    of the owner at block blockIndexList[i]: the owner's MultiTransactions in
+    that block (ownerAccTxnsList) and its Merkle proof (ownerMTreePrfList).
+    For every unit the verifier recomputes the MultiTransactions digest from
+    its transactions and checks that it is proven against the block's
+    m_tree_root (a digest carried in the proof is never trusted), that the owner is in the block
+    Bloom filter, and that the value passes from owner to owner through the
+    transactions. Between two units, a block whose Bloom filter contains the
+    holder must itself have a proof unit, otherwise the holder may be hiding
+    a spend.
+
+    verify_bundle() checks the VPBs of one payment together: unit checks
+    shared between values run once, and with workers > 1 large batches of
+    unit checks (digest recomputation, sender and Merkle proof) are spread
+    over a process pool. Block lookups, Bloom probes and the ownership
+    history read the chain and stay in the calling process.
+
+    Verification starts from the CheckedVPBList checkpoint covering the value
+    when the proof agrees with it; a proof pruned to an anchor is only
+    accepted with such a checkpoint. Unit checks are cached per
+    (block hash, digest, owner), so a value costs proportional to its new
+    history only.
+    """
+
+    def __init__(self, blockchain, checked_vpb_list=None, cache_size: int = 100000,
+                 workers: int = 1, parallel_threshold: int = 64):
+        self.blockchain = blockchain
+        self.checked_vpb_list = checked_vpb_list
+        self.cache_size = cache_size
+        self.workers = max(1, workers)
+        self.parallel_threshold = parallel_threshold  # smaller batches are checked inline
+        self._executor = None
+        self._verified_units = OrderedDict()  # (block hash, digest, owner) -> True
+        self.lock = threading.RLock()
+        self.stats = {
+            'vpbs_verified': 0,
+            'vpbs_rejected': 0,
+            'units_verified': 0,
+            'units_skipped': 0,
+            'cache_hits': 0,
+            'units_deduplicated': 0
+        }
+
+    def clear_cache(self):
+        with self.lock:
+            self._verified_units.clear()
+
+    def _find_start(self, value, prfList, blockIndexList) -> Tuple[int, int]:
+        """Index of the first unit to verify and the checkpoint height (-1 if none applies)."""
+        if self.checked_vpb_list is None:
+            return 0, -1
+        found = self.checked_vpb_list.find_check_point(value)
+        if found is None:
+            return 0, -1
+        ckOwner, ckBIndex = found
+        ckHeight = checkpoint_height(ckBIndex)
+        for i, height in enumerate(blockIndexList):
+            if height == ckHeight:
+                # the proof must agree with what was verified before
+                if prfList[i].owner == ckOwner:
+                    return i + 1, ckHeight
+                return 0, -1
+            if height > ckHeight:
+                break
+        return 0, -1
+
+    def _precheck_unit(self, unit: ProofUnit, height: int):
+        """
+        The checks of one proof unit that need the chain (block, cache, Bloom filter).
+
+        Returns (valid, message, block_hash, task, cache_hit); task is the rest
+        of the check for _check_unit_task. A cached unit's task carries no
+        Merkle proof, so only its digest and sender are checked again.
+        """
+        block = self.blockchain.get_block_by_height(height)
+        if block is None:
+            return False, f"Block {height} not found", None, None, False
+
+        accTxns = unit.ownerAccTxnsList
+        if not hasattr(accTxns, 'compute_digest') or not accTxns.multi_txns:
+            return False, f"Proof unit at block {height} has no transaction digest", None, None, False
+
+        blockHash = block.get_hash()
+        # the carried digest only selects the cache entry; the task recomputes and compares it
+        cache_key = (blockHash, getattr(accTxns, 'digest', None), unit.owner)
+        with self.lock:
+            cache_hit = cache_key in self._verified_units
+            if cache_hit:
+                self._verified_units.move_to_end(cache_key)
+        if cache_hit:
+            return True, "", blockHash, (accTxns, unit.owner, height, None, None), True
+
+        if not block.is_in_bloom(unit.owner):
+            return False, f"Owner {unit.owner} is not in the Bloom filter of block {height}", None, None, False
+
+        mTreePrf = unit.ownerMTreePrfList
+        prfList = mTreePrf.mt_prf_list if isinstance(mTreePrf, MerkleTreeProof) else list(mTreePrf)
+        return True, "", blockHash, (accTxns, unit.owner, height, prfList, block.get_m_tree_root()), False
+
+    def _record_verified(self, cache_keys) -> None:
+        with self.lock:
+            for cache_key in cache_keys:
+                self._verified_units[cache_key] = True
+            while len(self._verified_units) > self.cache_size:
+                self._verified_units.popitem(last=False)
+
+    def _verify_unit(self, unit: ProofUnit, height: int) -> Tuple[bool, str, bool]:
+        """Check one proof unit against its block. Returns (valid, message, cache_hit)."""
+        valid, message, blockHash, task, cache_hit = self._precheck_unit(unit, height)
+        if not valid:
+            return False, message, False
+        digest, message = _check_unit_task(task)
+        if digest is None:
+            return False, message, False
+        if not cache_hit:
+            self._record_verified([(blockHash, digest, unit.owner)])
+        return True, "", cache_hit
+
+    @staticmethod
+    def _next_owner(unit: ProofUnit, value) -> Tuple[Optional[str], str]:
+        """Owner of value after the unit's transactions, or (None, error)."""
+        owner = unit.owner
+        for txn in unit.ownerAccTxnsList:
+            for txnValue in txn.get_values():
+                if not txnValue.is_intersect_value(value):
+                    continue
+                if not txnValue.is_in_value(value):
+                    return None, f"Transaction of {owner} spends only part of the value"
+                if owner != unit.owner:
+                    return None, f"Value is spent more than once by {unit.owner}"
+                owner = txn.recipient
+        return owner, ""
+
+    def _holder_blocks(self, holder: str, start_height: int, end_height: int) -> List[int]:
+        """Heights in [start_height, end_height] whose Bloom filter may contain holder."""
+        if end_height < start_height:
+            return []
+        if hasattr(self.blockchain, 'find_blocks_for_address'):
+            return self.blockchain.find_blocks_for_address(holder, start_height, end_height)
+        return [h for h in range(start_height, end_height + 1)
+                if self.blockchain.get_block_by_height(h).is_in_bloom(holder)]
+
+    def verify_vpb(self, vpb, recipient: Optional[str] = None) -> VPBVerificationResult:
+        """
+        Verify a VPB. If recipient is given, the last proof unit must transfer the value to it.
+        """
+        result = self._verify_vpb(vpb, recipient)
+        with self.lock:
+            self.stats['vpbs_verified' if result.is_valid else 'vpbs_rejected'] += 1
+            self.stats['units_verified'] += result.verified_units
+            self.stats['units_skipped'] += result.skipped_units
+            self.stats['cache_hits'] += result.cache_hits
+        return result
+
+    def _prepare(self, vpb) -> Tuple[VPBVerificationResult, int]:
+        """Structural checks and checkpoint lookup. Returns (result so far, index of the first unit to check)."""
+        value, proof, blockIndexList = vpb[0], vpb[1], vpb[2]
+        prfList = proof.prfList
+        if not prfList or len(prfList) != len(blockIndexList):
+            return VPBVerificationResult(False, "Proof units and block indices do not match"), 0
+        for prev, cur in zip(blockIndexList, blockIndexList[1:]):
+            if cur <= prev:
+                return VPBVerificationResult(False, "Block indices are not strictly increasing"), 0
+
+        start, startHeight = self._find_start(value, prfList, blockIndexList)
+        anchor = getattr(proof, 'anchor', None)
+        if anchor is not None and (start != 1 or startHeight != anchor.blockIndex):
+            return VPBVerificationResult(False, f"Proof is pruned at block {anchor.blockIndex} "
+                                                f"but no matching checkpoint is known"), 0
+        return VPBVerificationResult(True, start_height=startHeight, skipped_units=start), start
+
+    def _verify_vpb(self, vpb, recipient: Optional[str]) -> VPBVerificationResult:
+        result, start = self._prepare(vpb)
+        if not result.is_valid:
+            return result
+
+        prfList, blockIndexList = vpb[1].prfList, vpb[2]
+        for i in range(start, len(prfList)):
+            valid, message, cache_hit = self._verify_unit(prfList[i], blockIndexList[i])
+            if not valid:
+                result.is_valid, result.error_message = False, message
+                return result
+            if cache_hit:
+                result.cache_hits += 1
+            else:
+                result.verified_units += 1
+
+        return self._check_history(vpb, start, recipient, result)
+
+    def _check_history(self, vpb, start: int, recipient: Optional[str],
+                       result: VPBVerificationResult) -> VPBVerificationResult:
+        """Ownership transfers and hidden blocks, from the checkpoint unit on."""
+        value, prfList, blockIndexList = vpb[0], vpb[1].prfList, vpb[2]
+        for i in range(max(start - 1, 0), len(prfList)):
+            holder, message = self._next_owner(prfList[i], value)
+            if holder is None:
+                result.is_valid, result.error_message = False, message
+                return result
+            if i + 1 < len(prfList):
+                if prfList[i + 1].owner != holder:
+                    result.is_valid = False
+                    result.error_message = (f"Proof unit at block {blockIndexList[i + 1]} is owned by "
+                                            f"{prfList[i + 1].owner}, expected {holder}")
+                    return result
+                hidden = self._holder_blocks(holder, blockIndexList[i] + 1, blockIndexList[i + 1] - 1)
+                if hidden:
+                    result.is_valid = False
+                    result.error_message = f"Holder {holder} appears in block {hidden[0]} without a proof unit"
+                    return result
+            elif recipient is not None and holder != recipient:
+                result.is_valid, result.error_message = False, f"Value is not transferred to {recipient}"
+                return result
+
+        return result
+
+    # ------------------------------------------------------------------ bundles
+
+    def _get_executor(self):
+        with self.lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _run_unit_tasks(self, tasks: List[tuple]) -> Tuple[List[Optional[str]], Optional[Tuple[int, str]]]:
+        """
+        Run unit checks, in worker processes for large batches.
+
+        Returns (digests, failure): digests[i] is the digest of tasks[i] if it
+        was checked and passed, failure is (position, message) of the first
+        failing task in task order, or None.
+        """
+        digests = [None] * len(tasks)
+        if self.workers <= 1 or len(tasks) < self.parallel_threshold:
+            chunkDigests, failure = _check_unit_chunk(0, tasks)
+            digests[:len(chunkDigests)] = chunkDigests
+            return digests, failure
+
+        chunk_size = max(1, -(-len(tasks) // (self.workers * 4)))
+        executor = self._get_executor()
+        futures = {executor.submit(_check_unit_chunk, offset, tasks[offset:offset + chunk_size]): offset
+                   for offset in range(0, len(tasks), chunk_size)}
+        failure = None
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            offset = futures[future]
+            chunkDigests, chunkFailure = future.result()
+            digests[offset:offset + len(chunkDigests)] = chunkDigests
+            if chunkFailure is not None and (failure is None or chunkFailure[0] < failure[0]):
+                failure = chunkFailure
+                # chunks after the failure cannot move it earlier: drop the queued ones
+                for pending, pendingOffset in futures.items():
+                    if pendingOffset > failure[0]:
+                        pending.cancel()
+        return digests, failure
+
+    def verify_bundle(self, vpbs, recipient: Optional[str] = None) -> VPBBundleResult:
+        """
+        Verify several VPBs received together, e.g. the values of one payment.
+
+        A unit shared by several VPBs is checked once for the whole bundle,
+        the unit checks are spread over the worker processes, and the result
+        reports the first invalid VPB in bundle order.
+        """
+        bundle = self._verify_bundle(list(vpbs), recipient)
+        with self.lock:
+            self.stats['vpbs_verified'] += sum(1 for r in bundle.results if r.is_valid)
+            self.stats['vpbs_rejected'] += sum(1 for r in bundle.results if not r.is_valid)
+            self.stats['units_verified'] += bundle.unit_checks
+            self.stats['units_skipped'] += sum(r.skipped_units for r in bundle.results)
+            self.stats['cache_hits'] += sum(r.cache_hits for r in bundle.results)
+            self.stats['units_deduplicated'] += bundle.deduplicated_checks
+        return bundle
+
+    def _verify_bundle(self, vpbs, recipient: Optional[str]) -> VPBBundleResult:
+        bundle = VPBBundleResult(True)
+        starts = []
+        task_ids = {}  # (block hash, owner, MultiTransactions) -> position in tasks
+        tasks = []
+        task_units = []  # position -> (vpb position, block hash, owner, cache hit) of the first unit needing it
+        failed = None  # (vpb position, message) of the first invalid VPB
+
+        for position, vpb in enumerate(vpbs):
+            result, start = self._prepare(vpb)
+            bundle.results.append(result)
+            if not result.is_valid:
+                failed = (position, result.error_message)
+                break
+            starts.append(start)
+
+            prfList, blockIndexList = vpb[1].prfList, vpb[2]
+            for i in range(start, len(prfList)):
+                unit = prfList[i]
+                valid, message, blockHash, task, cache_hit = self._precheck_unit(unit, blockIndexList[i])
+                if not valid:
+                    failed = (position, message)
+                    break
+                if cache_hit:
+                    result.cache_hits += 1
+                else:
+                    result.verified_units += 1
+                task_key = (blockHash, unit.owner, id(unit.ownerAccTxnsList))
+                if task_key in task_ids:
+                    if not cache_hit:
+                        bundle.deduplicated_checks += 1
+                    continue
+                task_ids[task_key] = len(tasks)
+                tasks.append(task)
+                task_units.append((position, blockHash, unit.owner, cache_hit))
+            if failed is not None:
+                break
+
+        # the unit checks of the VPBs before a precheck failure still run: one of them may fail first
+        bundle.unit_checks = sum(1 for unit in task_units if not unit[3])
+        digests, failure = self._run_unit_tasks(tasks)
+        self._record_verified([(blockHash, digest, owner)
+                               for (_, blockHash, owner, cache_hit), digest in zip(task_units, digests)
+                               if digest is not None and not cache_hit])
+        if failure is not None:
+            position = task_units[failure[0]][0]
+            if failed is None or position <= failed[0]:
+                failed = (position, failure[1])
+
+        for position in range(failed[0] if failed is not None else len(vpbs)):
+            result = self._check_history(vpbs[position], starts[position], recipient, bundle.results[position])
+            if not result.is_valid:
+                failed = (position, result.error_message)
+                break
+
+        if failed is None:
+            return bundle
+        position, message = failed
+        bundle.results[position].is_valid = False
+        bundle.results[position].error_message = message
+        del bundle.results[position + 1:]
+        return bundle.fail(position, message)
+
+    def close(self) -> None:
+        with self.lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
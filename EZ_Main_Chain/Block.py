@@ -11,6 +11,16 @@ import datetime
 import hashlib
 import json
 import pickle
+import struct
+
+# Fields covered by the binary header prefix; changing any of them invalidates the cached hash
+_HEADER_PREFIX_FIELDS = frozenset(("index", "bloom", "m_tree_root", "time", "miner", "pre_hash", "version"))
+
+
+def _pack_str(value):
+    data = str(value).encode("utf-8")
+    return struct.pack(">I", len(data)) + data
+
 
 class Block:
     def __init__(self, index, m_tree_root, miner, pre_hash, nonce=0, bloom_size=1024*1024, bloom_hash_count=5, time=None, version="1.0"):
@@ -37,6 +47,14 @@ class Block:
         self.version = version
         self.sig = temp_signature_system.generate_signature(miner) if index != 0 else 0  # Temporary digital signature
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _HEADER_PREFIX_FIELDS:
+            self.__dict__["_header_prefix"] = None
+            self.__dict__["_hash_cache"] = None
+        elif name == "nonce":
+            self.__dict__["_hash_cache"] = None
+
     def block_to_json(self):
         """
         # encode bloom to json
@@ -55,6 +73,8 @@ class Block:
             "miner": self.miner,
             "pre_hash": self.pre_hash,
             "version": self.version,
+            "bloom_size": self.bloom.size,
+            "bloom_hash_count": self.bloom.hash_count,
             "sig": self.sig
         }
         # Encode the bloom filter to JSON
@@ -81,6 +101,37 @@ class Block:
         block_str += f"Version: {self.version}\n"
         return block_str # no sig_to_str !!!
 
+    def header_prefix_bytes(self):
+        """
+        Compact binary encoding of every header field except the nonce.
+
+        Layout: version, index, pre_hash, m_tree_root, time, miner (length-prefixed
+        UTF-8) followed by the 32-byte Bloom digest. The nonce is appended last by
+        header_to_bytes(), so miners can hash this prefix once and only feed the
+        nonce per attempt. Cached until a header field or the Bloom filter changes.
+        """
+        bloom_key = (id(self.bloom), self.bloom._revision)
+        prefix = self.__dict__.get("_header_prefix")
+        if prefix is None or self.__dict__.get("_header_bloom_key") != bloom_key:
+            time_str = self.time.isoformat() if hasattr(self.time, "isoformat") else self.time
+            prefix = b"".join((
+                _pack_str(self.version),
+                struct.pack(">q", self.index),
+                _pack_str(self.pre_hash),
+                _pack_str(self.m_tree_root),
+                _pack_str(time_str),
+                _pack_str(self.miner),
+                self.bloom.digest(),
+            ))
+            self.__dict__["_header_prefix"] = prefix
+            self.__dict__["_header_bloom_key"] = bloom_key
+            self.__dict__["_hash_cache"] = None
+        return prefix
+
+    def header_to_bytes(self):
+        """Canonical binary header (prefix + 8-byte big-endian nonce) used for block hashing."""
+        return self.header_prefix_bytes() + struct.pack(">Q", self.nonce)
+
     def block_to_short_str(self):
         block_str = f"Index: {self.index}, Miner: {self.miner}"
         return block_str
@@ -133,9 +184,23 @@ class Block:
     def get_version(self):
         return self.version
 
+    def get_bloom_params(self):
+        """Return the (size, hash_count) the block's Bloom filter was built with."""
+        return self.bloom.size, self.bloom.hash_count
+
     def get_hash(self):
-        """Calculate and return the hash of the block."""
-        return hashlib.sha256(self.block_to_str().encode("utf-8")).hexdigest()
+        """
+        Return the hash of the block: SHA-256 over header_to_bytes().
+
+        Memoized; the cache is dropped when the nonce, another header field or
+        the Bloom filter changes.
+        """
+        prefix = self.header_prefix_bytes()
+        block_hash = self.__dict__.get("_hash_cache")
+        if block_hash is None:
+            block_hash = hashlib.sha256(prefix + struct.pack(">Q", self.nonce)).hexdigest()
+            self.__dict__["_hash_cache"] = block_hash
+        return block_hash
 
     def add_item_to_bloom(self, item):
         """Add an item to the block's Bloom filter."""
@@ -0,0 +1,337 @@
+import sys
+import os
+import json
+import mmap
+import struct
+import datetime
+import threading
+from typing import Dict, Optional
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Main_Chain.Block import Block
+from EZ_Block_Units.Bloom import BloomFilter
+from EZ_Main_Chain.BlockTransactionIndex import BlockTransactionIndex
+
+RECORD_MAGIC = b"EZB1"
+# magic, record length, index, nonce, bloom size, bloom hash count
+_RECORD_FIXED = struct.Struct(">4sIqQQI")
+# segment number, offset, record length, block hash (32 bytes)
+_INDEX_ENTRY = struct.Struct(">IQI32s")
+_STR_LEN = struct.Struct(">I")
+
+INDEX_FILE_NAME = "blocks.idx"
+
+
+def _segment_file_name(segment_no: int) -> str:
+    return f"blk{segment_no:05d}.dat"
+
+
+class BlockFileStore:
+    """
+    Append-only, segmented block log read through mmap.
+
+    Each block is written as one binary record (fixed header fields,
+    length-prefixed strings, then the raw Bloom bytes) to the current segment
+    file; segments roll over at max_segment_bytes. A separate index file holds
+    one fixed-size entry per height (segment, offset, length, block hash), so
+    opening the store only maps files and reads nothing, and any header or
+    Bloom bit can be read in place without unpickling. A record may end with
+    the block's BlockTransactionIndex (sender -> Merkle leaf positions).
+
+    Heights are appended consecutively, i.e. the store holds one (main) chain.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 64 * 1024 * 1024, sync: bool = False):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.sync = sync
+        self.lock = threading.RLock()
+        self._segment_maps: Dict[int, mmap.mmap] = {}
+        self._segment_files = {}
+        self._index_map: Optional[mmap.mmap] = None
+        self._index_mapped_count = 0
+        self._hash_to_height: Optional[Dict[str, int]] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX_FILE_NAME)
+        self._recover()
+        self._index_file = open(self.index_path, "ab")
+
+    # ------------------------------------------------------------------ open / recovery
+
+    def _recover(self) -> None:
+        """Drop a torn tail left by a crash between the data write and the index write."""
+        if not os.path.exists(self.index_path):
+            open(self.index_path, "wb").close()
+        index_size = os.path.getsize(self.index_path)
+        count = index_size // _INDEX_ENTRY.size
+        with open(self.index_path, "rb") as f:
+            while count > 0:
+                f.seek((count - 1) * _INDEX_ENTRY.size)
+                segment_no, offset, length, _ = _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+                segment_path = os.path.join(self.directory, _segment_file_name(segment_no))
+                if os.path.exists(segment_path) and os.path.getsize(segment_path) >= offset + length:
+                    break
+                count -= 1
+        if count * _INDEX_ENTRY.size != index_size:
+            with open(self.index_path, "r+b") as f:
+                f.truncate(count * _INDEX_ENTRY.size)
+        self.count = count
+
+        if count:
+            segment_no, offset, length, _ = self._read_index_entry_from_file(count - 1)
+            self.current_segment = segment_no
+            self.current_offset = offset + length
+        else:
+            self.current_segment = 0
+            self.current_offset = 0
+
+        # Records written after the last index entry are unreachable; cut them off
+        segment_path = os.path.join(self.directory, _segment_file_name(self.current_segment))
+        if os.path.exists(segment_path) and os.path.getsize(segment_path) > self.current_offset:
+            with open(segment_path, "r+b") as f:
+                f.truncate(self.current_offset)
+        next_segment = self.current_segment + 1
+        while os.path.exists(os.path.join(self.directory, _segment_file_name(next_segment))):
+            os.remove(os.path.join(self.directory, _segment_file_name(next_segment)))
+            next_segment += 1
+
+    def _read_index_entry_from_file(self, height: int):
+        with open(self.index_path, "rb") as f:
+            f.seek(height * _INDEX_ENTRY.size)
+            return _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+
+    # ------------------------------------------------------------------ encoding
+
+    @staticmethod
+    def encode_block(block: Block, tx_index: Optional[BlockTransactionIndex] = None) -> bytes:
+        """Serialise a Block (and optionally its transaction index) into a self-describing binary record."""
+        bloom = block.get_bloom()
+        if bloom.compressed:
+            bloom_bytes = bloom._decode_compressed_bits().tobytes()
+        else:
+            bloom_bytes = bloom.bit_array.tobytes()
+        expected_len = (bloom.size + 7) // 8
+        if len(bloom_bytes) < expected_len:
+            bloom_bytes += bytes(expected_len - len(bloom_bytes))
+
+        block_time = block.get_time()
+        time_str = block_time.isoformat() if hasattr(block_time, "isoformat") else str(block_time)
+        strings = [block.get_version(), block.get_pre_hash(), block.get_m_tree_root(), time_str,
+                   block.get_miner(), json.dumps(block.get_sig(), sort_keys=True)]
+        body = b"".join(_STR_LEN.pack(len(data)) + data for data in (str(s).encode("utf-8") for s in strings))
+        body += _STR_LEN.pack(len(bloom_bytes)) + bloom_bytes
+        if tx_index is not None:
+            index_bytes = tx_index.to_bytes()
+            body += _STR_LEN.pack(len(index_bytes)) + index_bytes
+
+        record_len = _RECORD_FIXED.size + len(body)
+        fixed = _RECORD_FIXED.pack(RECORD_MAGIC, record_len, block.get_index(), block.get_nonce(),
+                                   bloom.size, bloom.hash_count)
+        return fixed + body
+
+    @staticmethod
+    def _parse_record(view: memoryview) -> dict:
+        magic, record_len, index, nonce, bloom_size, bloom_hash_count = _RECORD_FIXED.unpack_from(view, 0)
+        if magic != RECORD_MAGIC:
+            raise ValueError("Corrupt block record: bad magic")
+        pos = _RECORD_FIXED.size
+        fields = []
+        for _ in range(6):
+            (length,) = _STR_LEN.unpack_from(view, pos)
+            pos += _STR_LEN.size
+            fields.append(str(view[pos:pos + length], "utf-8"))
+            pos += length
+        (bloom_len,) = _STR_LEN.unpack_from(view, pos)
+        pos += _STR_LEN.size
+        tx_index_offset, tx_index_len = None, 0
+        if pos + bloom_len < record_len:
+            (tx_index_len,) = _STR_LEN.unpack_from(view, pos + bloom_len)
+            tx_index_offset = pos + bloom_len + _STR_LEN.size
+        version, pre_hash, m_tree_root, time_str, miner, sig_json = fields
+        return {
+            "index": index,
+            "nonce": nonce,
+            "bloom_size": bloom_size,
+            "bloom_hash_count": bloom_hash_count,
+            "version": version,
+            "pre_hash": pre_hash,
+            "m_tree_root": m_tree_root,
+            "time": time_str,
+            "miner": miner,
+            "sig": json.loads(sig_json),
+            "_bloom_offset": pos,
+            "_bloom_len": bloom_len,
+            "_tx_index_offset": tx_index_offset,
+            "_tx_index_len": tx_index_len
+        }
+
+    # ------------------------------------------------------------------ writing
+
+    def append_block(self, block: Block, tx_index: Optional[BlockTransactionIndex] = None) -> int:
+        """Append block (with its transaction index, if given) at the next height; returns the height written."""
+        with self.lock:
+            if block.get_index() != self.count:
+                raise ValueError(f"Block index {block.get_index()} does not match next height {self.count}")
+            record = self.encode_block(block, tx_index)
+            if self.current_offset and self.current_offset + len(record) > self.max_segment_bytes:
+                self._close_segment_writer(self.current_segment)
+                self.current_segment += 1
+                self.current_offset = 0
+
+            writer = self._segment_writer(self.current_segment)
+            writer.write(record)
+            writer.flush()
+            if self.sync:
+                os.fsync(writer.fileno())
+
+            block_hash = bytes.fromhex(block.get_hash())
+            self._index_file.write(_INDEX_ENTRY.pack(self.current_segment, self.current_offset,
+                                                     len(record), block_hash))
+            self._index_file.flush()
+            if self.sync:
+                os.fsync(self._index_file.fileno())
+
+            if self._hash_to_height is not None:
+                self._hash_to_height[block_hash.hex()] = self.count
+            self.current_offset += len(record)
+            self.count += 1
+            return self.count - 1
+
+    def _segment_writer(self, segment_no: int):
+        writer = self._segment_files.get(segment_no)
+        if writer is None:
+            writer = open(os.path.join(self.directory, _segment_file_name(segment_no)), "ab")
+            self._segment_files[segment_no] = writer
+        return writer
+
+    def _close_segment_writer(self, segment_no: int) -> None:
+        writer = self._segment_files.pop(segment_no, None)
+        if writer is not None:
+            writer.close()
+
+    # ------------------------------------------------------------------ reading
+
+    def _index_entry(self, height: int):
+        if not 0 <= height < self.count:
+            raise IndexError(f"Height {height} not in store")
+        if self._index_map is None or height >= self._index_mapped_count:
+            # the previous map is released by GC once no exported views remain
+            with open(self.index_path, "rb") as f:
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_mapped_count = len(self._index_map) // _INDEX_ENTRY.size
+        return _INDEX_ENTRY.unpack_from(self._index_map, height * _INDEX_ENTRY.size)
+
+    def _record_view(self, height: int) -> memoryview:
+        segment_no, offset, length, _ = self._index_entry(height)
+        segment_map = self._segment_maps.get(segment_no)
+        if segment_map is None or len(segment_map) < offset + length:
+            with open(os.path.join(self.directory, _segment_file_name(segment_no)), "rb") as f:
+                segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._segment_maps[segment_no] = segment_map
+        return memoryview(segment_map)[offset:offset + length]
+
+    def read_header(self, height: int) -> dict:
+        """Decode the header fields of the block at height (Bloom bytes are not copied)."""
+        with self.lock:
+            header = self._parse_record(self._record_view(height))
+        for key in ("_bloom_offset", "_bloom_len", "_tx_index_offset", "_tx_index_len"):
+            header.pop(key)
+        return header
+
+    def get_bloom_view(self, height: int) -> memoryview:
+        """Zero-copy view of the raw Bloom bytes of the block at height."""
+        with self.lock:
+            view = self._record_view(height)
+            header = self._parse_record(view)
+            return view[header["_bloom_offset"]:header["_bloom_offset"] + header["_bloom_len"]]
+
+    def bloom_contains(self, height: int, item: str) -> bool:
+        """Probe the stored Bloom filter of the block at height directly in the mapped file."""
+        with self.lock:
+            view = self._record_view(height)
+            header = self._parse_record(view)
+            bloom_view = view[header["_bloom_offset"]:header["_bloom_offset"] + header["_bloom_len"]]
+            for position in BloomFilter.hash_positions(item, header["bloom_size"], header["bloom_hash_count"]):
+                # bitarray's default big-endian bit order
+                if not bloom_view[position >> 3] & (0x80 >> (position & 7)):
+                    return False
+            return True
+
+    def read_block(self, height: int) -> Block:
+        """Rebuild the Block stored at height."""
+        with self.lock:
+            view = self._record_view(height)
+            header = self._parse_record(view)
+            bloom_bytes = bytes(view[header["_bloom_offset"]:header["_bloom_offset"] + header["_bloom_len"]])
+
+        try:
+            block_time = datetime.datetime.fromisoformat(header["time"])
+        except ValueError:
+            block_time = header["time"]
+        # bypass the constructor: it would sign the block only for the stored signature to replace it
+        block = Block.__new__(Block)
+        block.index = header["index"]
+        block.nonce = header["nonce"]
+        block.bloom = BloomFilter.from_bytes(bloom_bytes, header["bloom_size"], header["bloom_hash_count"])
+        block.m_tree_root = header["m_tree_root"]
+        block.time = block_time
+        block.miner = header["miner"]
+        block.pre_hash = header["pre_hash"]
+        block.version = header["version"]
+        block.sig = header["sig"]
+        return block
+
+    def read_tx_index(self, height: int) -> Optional[BlockTransactionIndex]:
+        """Transaction index stored with the block at height, or None."""
+        with self.lock:
+            view = self._record_view(height)
+            header = self._parse_record(view)
+            if header["_tx_index_offset"] is None:
+                return None
+            offset = header["_tx_index_offset"]
+            index_bytes = bytes(view[offset:offset + header["_tx_index_len"]])
+        return BlockTransactionIndex.from_bytes(index_bytes)
+
+    def get_block_hash(self, height: int) -> str:
+        with self.lock:
+            return self._index_entry(height)[3].hex()
+
+    def find_height_by_hash(self, block_hash: str) -> Optional[int]:
+        """Look up a height by block hash; the hash map is built from the index on first use."""
+        with self.lock:
+            if self._hash_to_height is None:
+                self._hash_to_height = {}
+                for height in range(self.count):
+                    self._hash_to_height[self._index_entry(height)[3].hex()] = height
+            return self._hash_to_height.get(block_hash)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def close(self) -> None:
+        with self.lock:
+            maps = list(self._segment_maps.values())
+            if self._index_map is not None:
+                maps.append(self._index_map)
+            for mapped in maps:
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass  # a caller still holds a view from get_bloom_view()
+            self._segment_maps.clear()
+            self._index_map = None
+            for segment_no in list(self._segment_files):
+                self._close_segment_writer(segment_no)
+            if not self._index_file.closed:
+                self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,103 @@
+import sys
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Block_Units.MerkleTree import MerkleTree
+from EZ_Block_Units.Proof import ProofUnit
+from EZ_Tool_Box.Hash import sha256_hash
+
+
+def leaf_digest(multi_txn) -> str:
+    """Merkle leaf of a MultiTransactions: its digest, or the hash of its encoding when unset."""
+    if multi_txn.digest:
+        return multi_txn.digest
+    return sha256_hash(multi_txn.encode())
+
+
+class BlockTransactionIndex:
+    """
+    Per-block index from sender address to Merkle leaf positions.
+
+    Built when a block is packaged, it keeps the leaf digests in tree order,
+    the sender of each leaf and the sender -> positions map, so an owner's
+    MultiTransactions digests and Merkle proofs for the block are found by
+    dictionary lookup. Only (digest, sender) per leaf is persisted; proofs
+    are rebuilt from the digests on first use and checked against the root.
+    """
+
+    def __init__(self, block_index: int, merkle_root: str, leaf_digests: List[str], leaf_senders: List[str],
+                 multi_txns: Optional[list] = None, merkle_tree: Optional[MerkleTree] = None):
+        if len(leaf_digests) != len(leaf_senders):
+            raise ValueError("Leaf digests and senders do not match")
+        self.block_index = block_index
+        self.merkle_root = merkle_root
+        self.leaf_digests = leaf_digests
+        self.leaf_senders = leaf_senders
+        self.multi_txns = multi_txns  # MultiTransactions by leaf position, when known
+        self._merkle_tree = merkle_tree
+        self.sender_positions: Dict[str, List[int]] = {}
+        for position, sender in enumerate(leaf_senders):
+            self.sender_positions.setdefault(sender, []).append(position)
+
+    @classmethod
+    def from_multi_txns(cls, multi_txns: list, block_index: int = -1) -> 'BlockTransactionIndex':
+        """Index the MultiTransactions of a block in packing order (builds the Merkle tree once)."""
+        digests = [leaf_digest(multi_txn) for multi_txn in multi_txns]
+        tree = MerkleTree(digests) if digests else None
+        root = tree.get_root_hash() if tree is not None else ""
+        return cls(block_index, root, digests, [m.sender for m in multi_txns], list(multi_txns), tree)
+
+    def __len__(self) -> int:
+        return len(self.leaf_digests)
+
+    def __contains__(self, sender: str) -> bool:
+        return sender in self.sender_positions
+
+    def _get_merkle_tree(self) -> MerkleTree:
+        if self._merkle_tree is None:
+            tree = MerkleTree(self.leaf_digests)
+            if tree.get_root_hash() != self.merkle_root:
+                raise ValueError(f"Transaction index does not match the Merkle root of block {self.block_index}")
+            self._merkle_tree = tree
+        return self._merkle_tree
+
+    def get_positions(self, sender: str) -> List[int]:
+        return self.sender_positions.get(sender, [])
+
+    def get_digests(self, sender: str) -> List[str]:
+        return [self.leaf_digests[position] for position in self.get_positions(sender)]
+
+    def get_merkle_proof(self, position: int) -> List[str]:
+        """Merkle proof (MerkleTreeProof list format) of the leaf at position."""
+        return self._get_merkle_tree().prf_list[position]
+
+    def get_owner_proofs(self, sender: str) -> List[Tuple[str, List[str]]]:
+        """(digest, Merkle proof) for every MultiTransactions of sender in this block."""
+        return [(self.leaf_digests[position], self.get_merkle_proof(position))
+                for position in self.get_positions(sender)]
+
+    def build_proof_units(self, owner: str) -> List[ProofUnit]:
+        """ProofUnits of owner in this block; needs the MultiTransactions themselves."""
+        if self.multi_txns is None:
+            raise ValueError("MultiTransactions are not attached to this index")
+        return [ProofUnit(owner, self.multi_txns[position], self.get_merkle_proof(position))
+                for position in self.get_positions(owner)]
+
+    def to_bytes(self) -> bytes:
+        data = {
+            "block_index": self.block_index,
+            "merkle_root": self.merkle_root,
+            "leaves": [[digest, sender] for digest, sender in zip(self.leaf_digests, self.leaf_senders)]
+        }
+        return json.dumps(data, separators=(',', ':')).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BlockTransactionIndex':
+        decoded = json.loads(bytes(data))
+        leaves = decoded["leaves"]
+        return cls(decoded["block_index"], decoded["merkle_root"],
+                   [leaf[0] for leaf in leaves], [leaf[1] for leaf in leaves])
@@ -0,0 +1,211 @@
+import sys
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Main_Chain.Block import Block
+from EZ_Main_Chain.BloomIndex import ChainBloomIndex
+from EZ_Main_Chain.Miner import meets_difficulty
+
+
+class Blockchain:
+    """
+    Indexed main-chain store.
+
+    Every accepted block is kept in a hash -> Block map; the current main chain
+    is a height-ordered list of hashes, so lookups by height or by hash are O(1).
+    Blocks extending any known block are accepted, which keeps competing forks
+    around; the tip is the highest block (first seen wins ties) and the main
+    chain is re-pointed when a fork overtakes it. A ChainBloomIndex over the
+    main chain answers "which blocks may involve this address" queries.
+    """
+
+    def __init__(self, genesis_block: Optional[Block] = None, pow_difficulty_bits: Optional[int] = None,
+                 bloom_index_segment_size: int = 1024):
+        self.blocks_by_hash: Dict[str, Block] = {}
+        self.main_chain: List[str] = []  # height -> block hash on the main chain
+        self.children: Dict[str, List[str]] = {}  # parent hash -> child hashes (all forks)
+        self.tips: Dict[str, int] = {}  # hashes of blocks without children -> height
+        self.pow_difficulty_bits = pow_difficulty_bits
+        self.bloom_index = ChainBloomIndex(segment_size=bloom_index_segment_size)
+        self.lock = threading.RLock()
+        self.stats = {
+            'blocks_added': 0,
+            'blocks_rejected': 0,
+            'reorgs': 0
+        }
+
+        if genesis_block is not None:
+            success, message = self.add_block(genesis_block)
+            if not success:
+                raise ValueError(message)
+
+    def validate_block(self, block: Block) -> Tuple[bool, str]:
+        """Check that block can be appended: known parent, consecutive index and optional proof of work."""
+        block_hash = block.get_hash()
+        if block_hash in self.blocks_by_hash:
+            return False, "Duplicate block"
+
+        if self.pow_difficulty_bits is not None and block.get_index() != 0:
+            if not meets_difficulty(block_hash, self.pow_difficulty_bits):
+                return False, "Block hash does not meet the difficulty target"
+
+        if not self.blocks_by_hash:
+            if block.get_index() != 0:
+                return False, "First block must be a genesis block (index 0)"
+            return True, "Valid genesis block"
+
+        if block.get_index() == 0:
+            return False, "Genesis block already set"
+
+        parent = self.blocks_by_hash.get(block.get_pre_hash())
+        if parent is None:
+            return False, "Unknown parent block"
+
+        # parent hash is memoized, so linkage is checked without re-serialising the parent
+        if not parent.is_valid_next_block_dst(block):
+            return False, f"Invalid block index: expected {parent.get_index() + 1}, got {block.get_index()}"
+
+        return True, "Valid block"
+
+    def add_block(self, block: Block) -> Tuple[bool, str]:
+        """
+        Validate and store a block.
+
+        Returns: (success, message)
+        """
+        with self.lock:
+            is_valid, message = self.validate_block(block)
+            if not is_valid:
+                self.stats['blocks_rejected'] += 1
+                return False, message
+
+            block_hash = block.get_hash()
+            parent_hash = block.get_pre_hash()
+            height = block.get_index()
+
+            self.blocks_by_hash[block_hash] = block
+            self.children[block_hash] = []
+            if height != 0:
+                self.children[parent_hash].append(block_hash)
+                self.tips.pop(parent_hash, None)
+            self.tips[block_hash] = height
+            self.stats['blocks_added'] += 1
+
+            if height == 0 or parent_hash == self.main_chain[-1]:
+                self.main_chain.append(block_hash)
+                self.bloom_index.add_block(block)
+                return True, "Block added to main chain"
+
+            if height > self.get_height():
+                self._reorganize(block_hash)
+                return True, "Block added; main chain reorganized"
+
+            return True, "Block added to side chain"
+
+    def _reorganize(self, new_tip_hash: str) -> None:
+        """Switch the main chain to the branch ending at new_tip_hash."""
+        branch = []
+        current_hash = new_tip_hash
+        while True:
+            block = self.blocks_by_hash[current_hash]
+            height = block.get_index()
+            if height < len(self.main_chain) and self.main_chain[height] == current_hash:
+                break
+            branch.append(block)
+            current_hash = block.get_pre_hash()
+
+        fork_height = self.blocks_by_hash[current_hash].get_index()
+
+        for height in range(len(self.main_chain) - 1, fork_height, -1):
+            self.bloom_index.remove_block(height)
+        del self.main_chain[fork_height + 1:]
+
+        for block in reversed(branch):
+            self.main_chain.append(block.get_hash())
+            self.bloom_index.add_block(block)
+        self.stats['reorgs'] += 1
+
+    def get_block_by_height(self, height: int) -> Optional[Block]:
+        """Get the main-chain block at height"""
+        with self.lock:
+            if 0 <= height < len(self.main_chain):
+                return self.blocks_by_hash[self.main_chain[height]]
+            return None
+
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        """Get any stored block (main chain or fork) by hash"""
+        return self.blocks_by_hash.get(block_hash)
+
+    def get_latest_block(self) -> Optional[Block]:
+        """Get the tip of the main chain"""
+        with self.lock:
+            if not self.main_chain:
+                return None
+            return self.blocks_by_hash[self.main_chain[-1]]
+
+    def get_tip_hash(self) -> Optional[str]:
+        with self.lock:
+            return self.main_chain[-1] if self.main_chain else None
+
+    def get_height(self) -> int:
+        """Height of the main-chain tip (-1 for an empty chain)"""
+        return len(self.main_chain) - 1
+
+    def get_fork_tips(self) -> Dict[str, int]:
+        """All branch tips (hash -> height), including the main-chain tip"""
+        with self.lock:
+            return dict(self.tips)
+
+    def is_in_main_chain(self, block_hash: str) -> bool:
+        with self.lock:
+            block = self.blocks_by_hash.get(block_hash)
+            if block is None:
+                return False
+            height = block.get_index()
+            return height < len(self.main_chain) and self.main_chain[height] == block_hash
+
+    def get_confirmations(self, block_hash: str) -> int:
+        """Number of main-chain blocks on top of block_hash, including itself (0 if not on the main chain)"""
+        with self.lock:
+            if not self.is_in_main_chain(block_hash):
+                return 0
+            return self.get_height() - self.blocks_by_hash[block_hash].get_index() + 1
+
+    def get_blocks_in_range(self, start_height: int, end_height: Optional[int] = None) -> List[Block]:
+        """Main-chain blocks with start_height <= height <= end_height"""
+        with self.lock:
+            if end_height is None:
+                end_height = self.get_height()
+            start_height = max(start_height, 0)
+            return [self.blocks_by_hash[h] for h in self.main_chain[start_height:end_height + 1]]
+
+    def find_blocks_for_address(self, address: str, start_height: int = 0,
+                                end_height: Optional[int] = None) -> List[int]:
+        """Main-chain heights whose Bloom filter may contain address (false positives possible)"""
+        with self.lock:
+            return self.bloom_index.query(address, start_height, end_height)
+
+    def validate_chain(self) -> bool:
+        """Re-check linkage of the whole main chain"""
+        with self.lock:
+            for height in range(1, len(self.main_chain)):
+                parent = self.blocks_by_hash[self.main_chain[height - 1]]
+                if not parent.is_valid_next_block_dst(self.blocks_by_hash[self.main_chain[height]]):
+                    return False
+            return True
+
+    def __len__(self) -> int:
+        return len(self.main_chain)
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self.blocks_by_hash
+
+    def __iter__(self):
+        with self.lock:
+            hashes = list(self.main_chain)
+        for block_hash in hashes:
+            yield self.blocks_by_hash[block_hash]
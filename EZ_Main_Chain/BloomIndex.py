@@ -0,0 +1,170 @@
+import sys
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Block_Units.Bloom import BloomFilter
+
+
+class _BloomSegment:
+    """
+    Bit-sliced Bloom matrix for a fixed run of block heights.
+
+    Blocks are grouped by their (size, hash_count) Bloom parameters. For every
+    group, each set bit position maps to an int used as a bitmap over the
+    segment's slots (slot = height - start_height), so a membership query is
+    the AND of hash_count slices.
+    """
+    def __init__(self, start_height: int):
+        self.start_height = start_height
+        self.slices: Dict[Tuple[int, int], Dict[int, int]] = {}  # params -> {bit position -> slot bitmap}
+        self.members: Dict[Tuple[int, int], int] = {}  # params -> slot bitmap of blocks in the group
+        self.occupied = 0  # slot bitmap of all indexed blocks
+
+    def add(self, slot: int, params: Tuple[int, int], positions: List[int]):
+        slot_bit = 1 << slot
+        group = self.slices.setdefault(params, {})
+        for position in positions:
+            group[position] = group.get(position, 0) | slot_bit
+        self.members[params] = self.members.get(params, 0) | slot_bit
+        self.occupied |= slot_bit
+
+    def remove(self, slot: int):
+        slot_bit = 1 << slot
+        clear = ~slot_bit
+        for params in list(self.members):
+            if not self.members[params] & slot_bit:
+                continue
+            group = self.slices[params]
+            for position in list(group):
+                remaining = group[position] & clear
+                if remaining:
+                    group[position] = remaining
+                else:
+                    del group[position]
+            self.members[params] &= clear
+            if not self.members[params]:
+                del self.members[params]
+                del self.slices[params]
+        self.occupied &= clear
+
+    def query(self, item: str, slot_mask: int) -> int:
+        result = 0
+        for params, group in self.slices.items():
+            candidates = self.members[params] & slot_mask
+            if not candidates:
+                continue
+            size, hash_count = params
+            for position in BloomFilter.hash_positions(item, size, hash_count):
+                candidates &= group.get(position, 0)
+                if not candidates:
+                    break
+            result |= candidates
+        return result
+
+
+class ChainBloomIndex:
+    """
+    Chain-level index over block Bloom filters.
+
+    Answers "which block heights may contain sender X" for a whole height range
+    in one query instead of probing Block.is_in_bloom block by block. Heights
+    are split into segments of segment_size blocks so slot bitmaps stay small
+    and range queries only visit the segments they overlap. Results carry the
+    same false-positive semantics as the underlying Bloom filters.
+    """
+
+    def __init__(self, segment_size: int = 1024):
+        if segment_size <= 0:
+            raise ValueError("segment_size must be positive")
+        self.segment_size = segment_size
+        self.segments: Dict[int, _BloomSegment] = {}  # segment number -> segment
+        self.lock = threading.RLock()
+        self._count = 0
+
+    def add_block(self, block) -> None:
+        """Index a Block by its height using its Bloom filter."""
+        self.add_bloom(block.get_index(), block.get_bloom())
+
+    def add_bloom(self, height: int, bloom: BloomFilter) -> None:
+        """Index a Bloom filter at the given block height, replacing any previous entry."""
+        if height < 0:
+            raise ValueError("height must be non-negative")
+        positions = bloom.set_bit_positions()
+        segment_no, slot = divmod(height, self.segment_size)
+        with self.lock:
+            segment = self.segments.get(segment_no)
+            if segment is None:
+                segment = _BloomSegment(segment_no * self.segment_size)
+                self.segments[segment_no] = segment
+            if segment.occupied >> slot & 1:
+                segment.remove(slot)
+                self._count -= 1
+            segment.add(slot, (bloom.size, bloom.hash_count), positions)
+            self._count += 1
+
+    def remove_block(self, height: int) -> bool:
+        """Drop the entry at height (e.g. when a fork is abandoned)."""
+        segment_no, slot = divmod(height, self.segment_size)
+        with self.lock:
+            segment = self.segments.get(segment_no)
+            if segment is None or not segment.occupied >> slot & 1:
+                return False
+            segment.remove(slot)
+            if not segment.occupied:
+                del self.segments[segment_no]
+            self._count -= 1
+            return True
+
+    def query(self, item: str, start_height: int = 0, end_height: Optional[int] = None) -> List[int]:
+        """
+        Return the ascending block heights in [start_height, end_height] whose
+        Bloom filter may contain item. end_height defaults to the highest indexed block.
+        """
+        result = []
+        with self.lock:
+            if not self.segments:
+                return result
+            if end_height is None:
+                end_height = (max(self.segments) + 1) * self.segment_size - 1
+            if end_height < start_height:
+                return result
+            first_segment = max(start_height, 0) // self.segment_size
+            last_segment = end_height // self.segment_size
+            for segment_no in sorted(self.segments):
+                if segment_no < first_segment or segment_no > last_segment:
+                    continue
+                segment = self.segments[segment_no]
+                low = max(start_height - segment.start_height, 0)
+                high = min(end_height - segment.start_height, self.segment_size - 1)
+                slot_mask = ((1 << (high + 1)) - 1) & ~((1 << low) - 1)
+                hits = segment.query(item, slot_mask)
+                while hits:
+                    low_bit = hits & -hits
+                    result.append(segment.start_height + low_bit.bit_length() - 1)
+                    hits ^= low_bit
+        return result
+
+    def query_many(self, items: List[str], start_height: int = 0,
+                   end_height: Optional[int] = None) -> Dict[str, List[int]]:
+        """Run query() for several items (e.g. all addresses of a wallet)."""
+        return {item: self.query(item, start_height, end_height) for item in items}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, height: int) -> bool:
+        segment_no, slot = divmod(height, self.segment_size)
+        segment = self.segments.get(segment_no)
+        return segment is not None and bool(segment.occupied >> slot & 1)
+
+
+def build_chain_bloom_index(blocks, segment_size: int = 1024) -> ChainBloomIndex:
+    """Build a ChainBloomIndex from an iterable of Block objects."""
+    index = ChainBloomIndex(segment_size=segment_size)
+    for block in blocks:
+        index.add_block(block)
+    return index
@@ -0,0 +1,238 @@
+import sys
+import os
+import time
+import hashlib
+import struct
+import threading
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from typing import Optional
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(__file__) + '/..')
+
+from EZ_Main_Chain.Block import Block
+
+MAX_NONCE = 2 ** 64 - 1
+_NONCE_STRUCT = struct.Struct(">Q")
+
+
+def difficulty_target(difficulty_bits: int) -> int:
+    """Return the integer target a block hash must be below for the given number of leading zero bits."""
+    if not 0 <= difficulty_bits <= 256:
+        raise ValueError("difficulty_bits must be between 0 and 256")
+    return 1 << (256 - difficulty_bits)
+
+
+def meets_difficulty(block_hash: str, difficulty_bits: int) -> bool:
+    """Check a hex block hash against a leading-zero-bits difficulty."""
+    return int(block_hash, 16) < difficulty_target(difficulty_bits)
+
+
+def _search_nonces(prefix: bytes, target: int, start: int, step: int, end: int,
+                   stop_event, check_interval: int):
+    """
+    Scan nonces start, start + step, ... (inclusive end) over a precomputed SHA-256 midstate.
+
+    Returns (nonce or None, hash hex or None, attempts).
+    """
+    midstate = hashlib.sha256(prefix)
+    copy_state = midstate.copy
+    pack = _NONCE_STRUCT.pack
+    from_bytes = int.from_bytes
+    attempts = 0
+    nonce = start
+    while nonce <= end:
+        batch_end = min(end, nonce + step * (check_interval - 1))
+        for candidate in range(nonce, batch_end + 1, step):
+            hasher = copy_state()
+            hasher.update(pack(candidate))
+            digest = hasher.digest()
+            if from_bytes(digest, "big") < target:
+                return candidate, digest.hex(), attempts + (candidate - nonce) // step + 1
+        attempts += (batch_end - nonce) // step + 1
+        nonce = batch_end + step
+        if stop_event.is_set():
+            break
+    return None, None, attempts
+
+
+def _mining_worker(prefix, target, start, step, end, stop_event, result_queue, check_interval):
+    nonce, block_hash, attempts = _search_nonces(prefix, target, start, step, end, stop_event, check_interval)
+    if nonce is not None:
+        stop_event.set()
+    result_queue.put((nonce, block_hash, attempts))
+
+
+@dataclass
+class MiningResult:
+    """Outcome of a proof-of-work search"""
+    found: bool
+    nonce: Optional[int] = None
+    block_hash: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def hash_rate(self) -> float:
+        return self.attempts / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BlockMiner:
+    """
+    Proof-of-work nonce search for Block.
+
+    The static part of the header (Block.header_prefix_bytes) is hashed once;
+    each attempt copies that SHA-256 midstate and feeds only the 8-byte nonce,
+    which reproduces Block.get_hash() exactly. With workers > 1 the nonce space
+    is interleaved across processes that stop as soon as any of them finds a
+    solution or cancel() is called.
+    """
+
+    def __init__(self, difficulty_bits: int = 16, workers: int = 1, check_interval: int = 4096):
+        self.difficulty_bits = difficulty_bits
+        self.target = difficulty_target(difficulty_bits)
+        self.workers = max(1, workers)
+        self.check_interval = max(1, check_interval)
+        self._stop_event = None
+        self._cancel_requested = threading.Event()
+        self._state_lock = threading.Lock()
+        self._running = False
+
+    def cancel(self) -> None:
+        """
+        Request early termination of the running mine() call (safe to call from another thread).
+
+        Does nothing while no search runs: a cancel() never aborts a mine()
+        call started after it.
+        """
+        with self._state_lock:
+            if not self._running:
+                return
+            self._cancel_requested.set()
+            if self._stop_event is not None:
+                self._stop_event.set()
+
+    def mine(self, block: Block, start_nonce: int = 0, max_nonce: int = MAX_NONCE,
+             timeout: Optional[float] = None) -> MiningResult:
+        """
+        Search nonces in [start_nonce, max_nonce] until the block hash meets the difficulty.
+
+        On success block.nonce is set to the winning nonce. The search ends early
+        on cancel() or after timeout seconds. Raises RuntimeError if a worker
+        process dies before reporting and no nonce was found.
+        """
+        if start_nonce < 0 or max_nonce > MAX_NONCE or start_nonce > max_nonce:
+            raise ValueError("invalid nonce range")
+        prefix = block.header_prefix_bytes()
+        started = time.time()
+        with self._state_lock:
+            self._running = True
+            self._cancel_requested.clear()
+
+        try:
+            if self.workers == 1:
+                nonce, block_hash, attempts = self._mine_inline(prefix, start_nonce, max_nonce, timeout)
+            else:
+                nonce, block_hash, attempts = self._mine_parallel(prefix, start_nonce, max_nonce, timeout)
+            cancelled = nonce is None and self._cancel_requested.is_set()
+        finally:
+            with self._state_lock:
+                self._running = False
+                self._stop_event = None
+                self._cancel_requested.clear()
+
+        result = MiningResult(
+            found=nonce is not None,
+            nonce=nonce,
+            block_hash=block_hash,
+            attempts=attempts,
+            elapsed=time.time() - started,
+            cancelled=cancelled
+        )
+        if result.found:
+            block.nonce = nonce
+        return result
+
+    def _mine_inline(self, prefix, start_nonce, max_nonce, timeout):
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+        if self._cancel_requested.is_set():
+            stop_event.set()
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, stop_event.set)
+            timer.daemon = True
+            timer.start()
+        try:
+            return _search_nonces(prefix, self.target, start_nonce, 1, max_nonce,
+                                  stop_event, self.check_interval)
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _mine_parallel(self, prefix, start_nonce, max_nonce, timeout):
+        ctx = multiprocessing.get_context()
+        stop_event = ctx.Event()
+        result_queue = ctx.Queue()
+        self._stop_event = stop_event
+        if self._cancel_requested.is_set():
+            stop_event.set()
+
+        processes = []
+        for i in range(self.workers):
+            if start_nonce + i > max_nonce:
+                break
+            process = ctx.Process(
+                target=_mining_worker,
+                args=(prefix, self.target, start_nonce + i, self.workers, max_nonce,
+                      stop_event, result_queue, self.check_interval),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+
+        deadline = time.time() + timeout if timeout is not None else None
+        best_nonce, best_hash, total_attempts = None, None, 0
+        pending = len(processes)
+        exited = False
+        try:
+            while pending:
+                wait = 0.05
+                if deadline is not None and time.time() >= deadline:
+                    stop_event.set()
+                try:
+                    nonce, block_hash, attempts = result_queue.get(timeout=wait)
+                except queue.Empty:
+                    if exited:
+                        # every worker has exited and the queue is drained: the rest never reported
+                        break
+                    if any(process.exitcode for process in processes):
+                        stop_event.set()  # a crashed worker leaves a gap in the nonce space
+                    # a worker flushes its result before it exits, so one more read collects it
+                    exited = not any(process.is_alive() for process in processes)
+                    continue
+                pending -= 1
+                total_attempts += attempts
+                if nonce is not None and (best_nonce is None or nonce < best_nonce):
+                    best_nonce, best_hash = nonce, block_hash
+                    stop_event.set()
+        finally:
+            stop_event.set()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            result_queue.close()
+        if pending and best_nonce is None:
+            exit_codes = [process.exitcode for process in processes]
+            raise RuntimeError(f"{pending} mining worker(s) exited without a result (exit codes {exit_codes})")
+        return best_nonce, best_hash, total_attempts
+
+
+def mine_block(block: Block, difficulty_bits: int = 16, workers: int = 1,
+               timeout: Optional[float] = None) -> MiningResult:
+    """Convenience wrapper: mine a block with a fresh BlockMiner."""
+    return BlockMiner(difficulty_bits=difficulty_bits, workers=workers).mine(block, timeout=timeout)
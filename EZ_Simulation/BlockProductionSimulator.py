@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Discrete-event simulation of ingest and block production.
+
+Arrivals (the LoadGenerator Poisson schedule, real wallets and signatures)
+and periodic block ticks are events on a simulated clock, so a run covering
+minutes of chain time finishes as fast as the real work allows. Each block
+tick runs the full packaging path: package_transactions ->
+create_block_from_package -> remove_packaged_transactions.
+
+The node is modelled as a single server: with charge_cpu_time the measured
+CPU time of admission and block production advances the simulated clock, so
+a slow stage delays the events queued behind it. Results include
+admission-to-inclusion latency percentiles and histogram, pool depth over
+time and per-stage CPU time, exportable as JSON and CSV.
+
+Usage:
+    python EZ_Simulation/BlockProductionSimulator.py --rate 200 --duration 60 --block-interval 5
+    python EZ_Simulation/BlockProductionSimulator.py --rate 500 --max-block 500 --json sim.json --csv sim.csv
+"""
+
+import sys
+import os
+import io
+import csv
+import json
+import time
+import heapq
+import shutil
+import tempfile
+import argparse
+import contextlib
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EZ_Simulation.LoadGenerator import (LoadConfig, LatencySummary, SenderWallet, build_schedule,
+                                         sender_address)
+from EZ_Transaction_Pool.TransactionPool import TransactionPool
+from EZ_Transaction_Pool.PackTransactions import TransactionPackager
+from EZ_Tool_Box.KeyStore import KeyStore, DEFAULT_SEED, default_key_store_path
+
+# Event kinds, in tie-break order at equal simulated times
+EVENT_BLOCK = 0
+EVENT_ARRIVAL = 1
+EVENT_SAMPLE = 2
+
+# Stages timed with CPU time
+STAGE_CREATE = "create_sign"  # client side: wallet selection and signing (never charged to the node)
+STAGE_ADMISSION = "admission"  # pool validation and insert
+STAGE_PACKAGE = "package"  # package_transactions
+STAGE_CREATE_BLOCK = "create_block"  # create_block_from_package
+STAGE_REMOVE = "remove"  # remove_packaged_transactions
+NODE_STAGES = (STAGE_ADMISSION, STAGE_PACKAGE, STAGE_CREATE_BLOCK, STAGE_REMOVE)
+
+DEFAULT_HISTOGRAM_BOUNDS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+@dataclass
+class BlockSimConfig:
+    """Configuration of a block production simulation (times are simulated seconds)"""
+    num_senders: int = 100
+    num_recipients: int = 1000
+    arrival_rate: float = 100.0  # MultiTransactions per simulated second
+    duration: float = 60.0  # simulated seconds of arrivals (blocks continue until the pool drains)
+    block_interval: float = 5.0
+    max_multi_txns_per_block: int = 1000
+    recipients_per_batch: int = 2
+    max_amount: int = 50
+    sender_skew: float = 0.0
+    aggregate_signatures: bool = False
+    validation_enabled: bool = True
+    charge_cpu_time: bool = True  # node CPU time advances the simulated clock
+    sample_interval: float = 1.0  # pool depth sampling period
+    histogram_bounds: Tuple[float, ...] = DEFAULT_HISTOGRAM_BOUNDS
+    miner_address: str = "sim_miner"
+    seed: int = 42
+    key_seed: str = DEFAULT_SEED
+    key_store_path: Optional[str] = None
+    quiet: bool = True
+    workdir: Optional[str] = None
+
+    def load_config(self) -> LoadConfig:
+        return LoadConfig(num_senders=self.num_senders, num_recipients=self.num_recipients,
+                          target_rate=self.arrival_rate, duration=self.duration,
+                          recipients_per_batch=self.recipients_per_batch, max_amount=self.max_amount,
+                          sender_skew=self.sender_skew, aggregate_signatures=self.aggregate_signatures,
+                          seed=self.seed, key_seed=self.key_seed)
+
+
+@dataclass
+class StageStats:
+    """CPU time spent in one pipeline stage"""
+    count: int = 0
+    total: float = 0.0
+    latency: LatencySummary = field(default_factory=LatencySummary)
+
+
+@dataclass
+class BlockRecord:
+    """One produced block"""
+    index: int
+    time: float  # simulated time the block was produced
+    multi_txns: int
+    single_txns: int
+    pool_depth: int  # pool depth after removal
+    block_hash: str
+    package_cpu: float
+    create_block_cpu: float
+    remove_cpu: float
+
+
+@dataclass
+class BlockSimResult:
+    """Outcome of a block production simulation"""
+    offered: int = 0
+    admitted: int = 0
+    rejected: int = 0
+    errors: int = 0
+    included: int = 0
+    simulated_time: float = 0.0
+    wall_time: float = 0.0
+    inclusion_latency: LatencySummary = field(default_factory=LatencySummary)
+    latency_histogram: List[Tuple[float, int]] = field(default_factory=list)  # (upper bound, count)
+    max_pool_depth: int = 0
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    blocks: List[BlockRecord] = field(default_factory=list)
+    pool_depth: List[Tuple[float, int]] = field(default_factory=list)  # (simulated time, depth)
+
+    @property
+    def throughput(self) -> float:
+        """Included MultiTransactions per simulated second"""
+        return self.included / self.simulated_time if self.simulated_time > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["throughput"] = self.throughput
+        data["latency_histogram"] = [[bound if bound != float("inf") else "inf", count]
+                                     for bound, count in self.latency_histogram]
+        return data
+
+    def save_json(self, path: str, config: Optional[BlockSimConfig] = None) -> None:
+        data = {"result": self.to_dict()}
+        if config is not None:
+            data["config"] = asdict(config)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def save_csv(self, path: str) -> Tuple[str, str]:
+        """Write the per-block rows to path and the pool depth samples next to it; returns both paths."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["index", "time", "multi_txns", "single_txns", "pool_depth", "block_hash",
+                             "package_cpu", "create_block_cpu", "remove_cpu"])
+            for block in self.blocks:
+                writer.writerow([block.index, f"{block.time:.6f}", block.multi_txns, block.single_txns,
+                                 block.pool_depth, block.block_hash, f"{block.package_cpu:.6f}",
+                                 f"{block.create_block_cpu:.6f}", f"{block.remove_cpu:.6f}"])
+
+        root, ext = os.path.splitext(path)
+        depth_path = f"{root}_pool_depth{ext or '.csv'}"
+        with open(depth_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time", "pool_depth"])
+            for sim_time, depth in self.pool_depth:
+                writer.writerow([f"{sim_time:.6f}", depth])
+        return path, depth_path
+
+
+def latency_histogram(samples: List[float], bounds: Tuple[float, ...]) -> List[Tuple[float, int]]:
+    """Counts per bucket (previous bound, bound]; a final +inf bucket holds the rest."""
+    bounds = sorted(bounds) + [float("inf")]
+    counts = [0] * len(bounds)
+    for sample in samples:
+        for i, bound in enumerate(bounds):
+            if sample <= bound:
+                counts[i] += 1
+                break
+    return list(zip(bounds, counts))
+
+
+class BlockProductionSimulator:
+    """Event-driven ingest and block production against one TransactionPool."""
+
+    def __init__(self, config: BlockSimConfig):
+        self.config = config
+        load_config = config.load_config()
+        self.schedule = build_schedule(load_config)
+        senders = sorted({arrival[2] for arrival in self.schedule})
+        key_store = KeyStore(config.key_store_path or default_key_store_path(config.key_seed), config.key_seed)
+        try:
+            key_pairs = key_store.get_key_pairs(sender_address(i) for i in senders)
+        finally:
+            key_store.close()
+        self.wallets = {i: SenderWallet(i, key_pairs[sender_address(i)][0], load_config) for i in senders}
+        self.public_keys = {sender_address(i): key_pairs[sender_address(i)][1] for i in senders}
+
+        self._own_workdir = config.workdir is None
+        self.workdir = config.workdir or tempfile.mkdtemp(prefix="ez_blocksim_")
+        self.pool = TransactionPool(os.path.join(self.workdir, "blocksim_pool.db"))
+        self.packager = TransactionPackager(max_multi_txns_per_block=config.max_multi_txns_per_block)
+
+        self.result = BlockSimResult(offered=len(self.schedule))
+        self.now = 0.0  # simulated clock
+        self._busy_until = 0.0  # the node serves one event at a time
+        self._events: List[Tuple[float, int, int, int]] = []  # (time, kind, order, payload)
+        self._order = 0
+        self._admitted_at: Dict[str, float] = {}
+        self._inclusion_latency: List[float] = []
+        self._stage_samples: Dict[str, List[float]] = {
+            stage: [] for stage in (STAGE_CREATE,) + NODE_STAGES}
+        self._last_hash = "0"
+        self._next_index = 1
+
+    def _push(self, at: float, kind: int, payload: int = 0) -> None:
+        heapq.heappush(self._events, (at, kind, self._order, payload))
+        self._order += 1
+
+    def _timed(self, stage: str, func, *args):
+        """Run func, recording its CPU time; node stages also advance the simulated clock when charged."""
+        started = time.process_time()
+        value = func(*args)
+        elapsed = time.process_time() - started
+        self._stage_samples[stage].append(elapsed)
+        if stage != STAGE_CREATE and self.config.charge_cpu_time:
+            self.now += elapsed
+        return value, elapsed
+
+    def _on_arrival(self, seq: int) -> None:
+        _, _, sender, requests = self.schedule[seq]
+        try:
+            multi_txn, _ = self._timed(STAGE_CREATE, self.wallets[sender].create, requests)
+        except Exception as e:
+            self.result.errors += 1
+            print(f"Error creating arrival {seq}: {e}")
+            return
+        public_key = self.public_keys[multi_txn.sender] if self.config.validation_enabled else None
+        (success, _), _ = self._timed(STAGE_ADMISSION, self.pool.add_multi_transactions, multi_txn, public_key)
+        if success:
+            self.result.admitted += 1
+            self._admitted_at[multi_txn.digest] = self.now
+            self.result.max_pool_depth = max(self.result.max_pool_depth, len(self.pool.pool))
+        else:
+            self.result.rejected += 1
+
+    def _on_block(self) -> None:
+        package, package_cpu = self._timed(STAGE_PACKAGE, self.packager.package_transactions, self.pool)
+        selected = package.selected_multi_txns
+        if not selected:
+            return
+        block, create_block_cpu = self._timed(STAGE_CREATE_BLOCK, self.packager.create_block_from_package,
+                                              package, self.config.miner_address, self._last_hash,
+                                              self._next_index)
+        _, remove_cpu = self._timed(STAGE_REMOVE, self.packager.remove_packaged_transactions, self.pool, selected)
+
+        for multi_txn in selected:
+            admitted_at = self._admitted_at.pop(multi_txn.digest, None)
+            if admitted_at is not None:
+                self._inclusion_latency.append(self.now - admitted_at)
+        self._last_hash = block.get_hash()
+        record = BlockRecord(self._next_index, self.now, len(selected), sum(len(m) for m in selected),
+                             len(self.pool.pool), self._last_hash, package_cpu, create_block_cpu, remove_cpu)
+        self.result.blocks.append(record)
+        self.result.included += len(selected)
+        self._next_index += 1
+        if not self.config.quiet:
+            print(f"  t={record.time:9.3f}s block {record.index}: {record.multi_txns} MultiTransactions, "
+                  f"pool {record.pool_depth}, package {package_cpu * 1000:.1f} ms")
+
+    def run(self) -> BlockSimResult:
+        """Process every event, then keep producing blocks until the pool is empty."""
+        config = self.config
+        wall_started = time.perf_counter()
+        for offset, seq, _, _ in self.schedule:
+            self._push(offset, EVENT_ARRIVAL, seq)
+        self._push(config.block_interval, EVENT_BLOCK)
+        if config.sample_interval > 0:
+            self._push(0.0, EVENT_SAMPLE)
+
+        quiet = contextlib.redirect_stdout(io.StringIO()) if config.quiet else contextlib.nullcontext()
+        with quiet:
+            while self._events:
+                at, kind, _, payload = heapq.heappop(self._events)
+                if kind == EVENT_SAMPLE:
+                    # observation only: sampling never waits for the node
+                    self.result.pool_depth.append((at, len(self.pool.pool)))
+                    if at + config.sample_interval <= config.duration or self.pool.pool:
+                        self._push(at + config.sample_interval, EVENT_SAMPLE)
+                    continue
+                self.now = max(at, self._busy_until)
+                if kind == EVENT_ARRIVAL:
+                    self._on_arrival(payload)
+                else:
+                    self._on_block()
+                    if at + config.block_interval <= config.duration or self.pool.pool or \
+                            any(event[1] == EVENT_ARRIVAL for event in self._events):
+                        self._push(at + config.block_interval, EVENT_BLOCK)
+                self._busy_until = self.now
+
+        result = self.result
+        result.simulated_time = self.now
+        result.wall_time = time.perf_counter() - wall_started
+        result.inclusion_latency = LatencySummary.from_samples(self._inclusion_latency)
+        result.latency_histogram = latency_histogram(self._inclusion_latency, config.histogram_bounds)
+        result.stages = {stage: StageStats(len(samples), sum(samples), LatencySummary.from_samples(samples))
+                         for stage, samples in self._stage_samples.items()}
+        return result
+
+    def cleanup(self) -> None:
+        if self._own_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def run_block_simulation(config: BlockSimConfig) -> BlockSimResult:
+    simulator = BlockProductionSimulator(config)
+    try:
+        return simulator.run()
+    finally:
+        simulator.cleanup()
+
+
+def format_result(result: BlockSimResult) -> str:
+    latency = result.inclusion_latency
+    lines = [
+        f"Offered: {result.offered}   admitted: {result.admitted}   rejected: {result.rejected}   "
+        f"errors: {result.errors}   included: {result.included} in {len(result.blocks)} blocks",
+        f"Simulated {result.simulated_time:.2f}s in {result.wall_time:.2f}s wall, "
+        f"{result.throughput:.1f} included/s, max pool depth {result.max_pool_depth}",
+        f"Admission -> inclusion (s): p50 {latency.p50:.3f}   p95 {latency.p95:.3f}   "
+        f"p99 {latency.p99:.3f}   max {latency.max:.3f}",
+        f"{'stage CPU (ms)':<16} {'count':>7} {'total':>10} {'p50':>8} {'p95':>8} {'p99':>8}",
+    ]
+    for stage, stats in result.stages.items():
+        lines.append(f"{stage:<16} {stats.count:>7} {stats.total * 1000:>10.1f} {stats.latency.p50 * 1000:>8.3f} "
+                     f"{stats.latency.p95 * 1000:>8.3f} {stats.latency.p99 * 1000:>8.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Discrete-event ingest and block production simulation")
+    parser.add_argument("--rate", type=float, default=100.0, help="MultiTransactions per simulated second")
+    parser.add_argument("--duration", type=float, default=60.0, help="simulated seconds of arrivals")
+    parser.add_argument("--senders", type=int, default=100, help="number of sender wallets")
+    parser.add_argument("--recipients", type=int, default=2, help="recipients per MultiTransactions")
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of the sender choice")
+    parser.add_argument("--block-interval", type=float, default=5.0, help="simulated seconds between blocks")
+    parser.add_argument("--max-block", type=int, default=1000, help="max MultiTransactions per block")
+    parser.add_argument("--aggregate", action="store_true", help="aggregate (Merkle root) signatures")
+    parser.add_argument("--no-cpu-charge", action="store_true",
+                        help="do not advance the simulated clock by node CPU time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the result to this JSON file")
+    parser.add_argument("--csv", help="write per-block rows to this CSV file (pool depth goes next to it)")
+    parser.add_argument("--verbose", action="store_true", help="print every block")
+    args = parser.parse_args(argv)
+
+    config = BlockSimConfig(num_senders=args.senders, arrival_rate=args.rate, duration=args.duration,
+                            recipients_per_batch=args.recipients, sender_skew=args.skew,
+                            block_interval=args.block_interval, max_multi_txns_per_block=args.max_block,
+                            aggregate_signatures=args.aggregate, charge_cpu_time=not args.no_cpu_charge,
+                            seed=args.seed, quiet=not args.verbose)
+    result = run_block_simulation(config)
+    print(format_result(result))
+    if args.json:
+        result.save_json(args.json, config)
+        print(f"\nResults written to {args.json}")
+    if args.csv:
+        paths = result.save_csv(args.csv)
+        print(f"CSV written to {', '.join(paths)}")
+    return 0 if result.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
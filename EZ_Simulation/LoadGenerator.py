@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Open-loop, signed load generator for the transaction pool and packager.
+
+MultiTransactions arrive on a precomputed Poisson schedule (senders chosen
+with a configurable Zipf skew) whatever the state of the system, and are
+created by real CreateMultiTransactions wallets holding non-overlapping
+values, with real signatures from the seeded key store. Creation and signing
+can run in worker processes; the main process feeds the TransactionPool and
+packages a block every block_interval seconds. Latencies are measured from
+the scheduled arrival time, so queueing delay is included.
+
+Usage:
+    python EZ_Simulation/LoadGenerator.py --rate 200 --duration 10 --workers 4
+    python EZ_Simulation/LoadGenerator.py --rate 50 --skew 1.1 --aggregate --json load.json
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import queue
+import bisect
+import random
+import shutil
+import tempfile
+import argparse
+import contextlib
+import statistics
+import multiprocessing
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EZ_Transaction.CreateMultiTransactions import CreateMultiTransactions
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Transaction_Pool.TransactionPool import TransactionPool
+from EZ_Transaction_Pool.PackTransactions import TransactionPackager
+from EZ_Value.Value import Value, ValueState
+from EZ_Tool_Box.KeyStore import KeyStore, DEFAULT_SEED, default_key_store_path
+from EZ_Tool_Box.Metrics import metrics
+
+SENDER_SPAN_BITS = 48  # every sender funds itself from its own [(i + 1) << 48, (i + 2) << 48) range
+
+
+@dataclass
+class LoadConfig:
+    """Configuration of an open-loop load run"""
+    num_senders: int = 100
+    num_recipients: int = 1000
+    target_rate: float = 100.0  # MultiTransactions per second (Poisson arrivals)
+    duration: float = 10.0  # seconds of offered load
+    recipients_per_batch: int = 2
+    max_amount: int = 50
+    value_size: int = 1000  # size of each value a wallet is topped up with
+    sender_skew: float = 0.0  # Zipf exponent of the sender choice (0 = uniform)
+    workers: int = 0  # worker processes creating and signing (0 = in the main process)
+    aggregate_signatures: bool = False  # one Merkle-root signature per MultiTransactions
+    validation_enabled: bool = True  # the pool verifies signatures
+    block_interval: float = 1.0  # package the pool every block_interval seconds (0 = only at the end)
+    max_multi_txns_per_block: int = 1000
+    seed: int = 42
+    key_seed: str = DEFAULT_SEED
+    key_store_path: Optional[str] = None
+    quiet: bool = True  # swallow component output, no per-block progress lines
+    workdir: Optional[str] = None  # where the pool database lives (temp dir by default)
+
+
+@dataclass
+class LatencySummary:
+    """Latency percentiles in seconds"""
+    count: int = 0
+    mean: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> 'LatencySummary':
+        if not samples:
+            return cls()
+        ordered = sorted(samples)
+
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return cls(len(ordered), statistics.mean(ordered), percentile(0.5), percentile(0.9),
+                   percentile(0.95), percentile(0.99), ordered[-1])
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run"""
+    offered: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    errors: int = 0
+    blocks: int = 0
+    packaged: int = 0
+    duration: float = 0.0
+    offered_rate: float = 0.0
+    ingest_latency: LatencySummary = field(default_factory=LatencySummary)  # arrival -> accepted by the pool
+    package_latency: LatencySummary = field(default_factory=LatencySummary)  # arrival -> packaged into a block
+    create_time: LatencySummary = field(default_factory=LatencySummary)  # wallet selection + signing
+    pack_time: LatencySummary = field(default_factory=LatencySummary)  # packager time per block
+
+    @property
+    def throughput(self) -> float:
+        """Accepted MultiTransactions per second"""
+        return self.accepted / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def packaged_throughput(self) -> float:
+        return self.packaged / self.duration if self.duration > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["throughput"] = self.throughput
+        data["packaged_throughput"] = self.packaged_throughput
+        return data
+
+
+# (offset seconds, sequence number, sender index, [(recipient, amount), ...])
+Arrival = Tuple[float, int, int, List[Tuple[str, int]]]
+
+
+def sender_address(index: int) -> str:
+    return f"load_sender_{index:05d}"
+
+
+def recipient_address(index: int) -> str:
+    return f"load_recipient_{index:05d}"
+
+
+def build_schedule(config: LoadConfig, recipient_name: Callable[[int], str] = recipient_address) -> List[Arrival]:
+    """Poisson arrivals over config.duration; senders drawn with Zipf weights 1 / (rank + 1) ** skew."""
+    rng = random.Random(config.seed)
+    cumulative = []
+    total = 0.0
+    for rank in range(config.num_senders):
+        total += 1.0 / (rank + 1) ** config.sender_skew
+        cumulative.append(total)
+
+    schedule = []
+    offset = rng.expovariate(config.target_rate)
+    while offset < config.duration:
+        sender = min(bisect.bisect_left(cumulative, rng.random() * total), config.num_senders - 1)
+        requests = [(recipient_name(rng.randrange(config.num_recipients)), rng.randint(1, config.max_amount))
+                    for _ in range(config.recipients_per_batch)]
+        schedule.append((offset, len(schedule), sender, requests))
+        offset += rng.expovariate(config.target_rate)
+    return schedule
+
+
+class SenderWallet:
+    """A CreateMultiTransactions wallet funded from the sender's own value range."""
+
+    def __init__(self, index: int, private_key_pem: bytes, config: LoadConfig):
+        self.address = sender_address(index)
+        self.creator = CreateMultiTransactions(self.address)
+        self.private_key_pem = private_key_pem
+        self.config = config
+        self.next_begin = (index + 1) << SENDER_SPAN_BITS
+        self.nonce = 0
+
+    def _fund(self, requests: List[Tuple[str, int]]) -> None:
+        # payments are picked greedily one after another and each one may overshoot by up to one
+        # value (its change stays pending until settled), so keep that much headroom unspent
+        selector = self.creator.value_selector
+        size = max(self.config.value_size, self.config.max_amount)
+        needed = sum(amount for _, amount in requests) + (len(requests) - 1) * size
+        balance = selector.get_account_balance(ValueState.UNSPENT)
+        values = []
+        while balance < needed:
+            values.append(Value(hex(self.next_begin), size))
+            self.next_begin += size
+            balance += size
+        if values:
+            selector.add_values_from_list(values)
+
+    def create(self, requests: List[Tuple[str, int]]) -> MultiTransactions:
+        """Create and sign one MultiTransactions, then settle the wallet (spent values dropped, change unspent)."""
+        self._fund(requests)
+        result = self.creator.create_multi_transactions(
+            [{"recipient": recipient, "amount": amount} for recipient, amount in requests],
+            self.private_key_pem, base_nonce=self.nonce, aggregate=self.config.aggregate_signatures)
+        self.nonce += len(requests)
+
+        selector = self.creator.value_selector
+        selector.confirm_transaction_values(result["selected_values"])
+        selector.cleanup_confirmed_values()
+        selector.rollback_transaction_selection(result["change_values"])
+        self.creator.clear_created_multi_transactions()
+        return result["multi_transactions"]
+
+
+def _quiet(config: LoadConfig):
+    return contextlib.redirect_stdout(io.StringIO()) if config.quiet else contextlib.nullcontext()
+
+
+def _wait_until(deadline: float) -> None:
+    delay = deadline - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _worker_main(config: LoadConfig, arrivals: List[Arrival], private_keys: Dict[int, bytes],
+                 start_at: float, out_queue) -> None:
+    """Worker process: create arrivals on schedule and hand the encoded MultiTransactions to the main process."""
+    wallets: Dict[int, SenderWallet] = {}
+    with _quiet(config):
+        for offset, seq, sender, requests in arrivals:
+            _wait_until(start_at + offset)
+            try:
+                wallet = wallets.get(sender)
+                if wallet is None:
+                    wallet = wallets[sender] = SenderWallet(sender, private_keys[sender], config)
+                started = time.perf_counter()
+                multi_txn = wallet.create(requests)
+                out_queue.put((seq, time.perf_counter() - started, multi_txn.encode()))
+            except Exception as e:
+                out_queue.put((seq, 0.0, None))
+                print(f"Error creating arrival {seq}: {e}")
+    out_queue.put(None)
+
+
+class LoadGenerator:
+    """Runs an open-loop load against a TransactionPool and TransactionPackager."""
+
+    def __init__(self, config: LoadConfig):
+        self.config = config
+        self.schedule = build_schedule(config)
+        senders = sorted({arrival[2] for arrival in self.schedule})
+        key_store = KeyStore(config.key_store_path or default_key_store_path(config.key_seed), config.key_seed)
+        try:
+            key_pairs = key_store.get_key_pairs(sender_address(i) for i in senders)
+        finally:
+            key_store.close()
+        self.private_keys = {i: key_pairs[sender_address(i)][0] for i in senders}
+        self.public_keys = {sender_address(i): key_pairs[sender_address(i)][1] for i in senders}
+
+        self._own_workdir = config.workdir is None
+        self.workdir = config.workdir or tempfile.mkdtemp(prefix="ez_load_")
+        self.pool = TransactionPool(os.path.join(self.workdir, "load_pool.db"))
+        self.packager = TransactionPackager(max_multi_txns_per_block=config.max_multi_txns_per_block)
+
+        self.result = LoadResult(offered=len(self.schedule))
+        self._start_at = 0.0
+        self._arrival_at: Dict[str, float] = {}  # digest -> scheduled arrival (wall clock)
+        self._ingest_latency: List[float] = []
+        self._package_latency: List[float] = []
+        self._create_time: List[float] = []
+        self._pack_time: List[float] = []
+
+    def _ingest(self, seq: int, multi_txn: Optional[MultiTransactions], create_time: float) -> None:
+        if multi_txn is None:
+            self.result.errors += 1
+            return
+        self._create_time.append(create_time)
+        public_key = self.public_keys[multi_txn.sender] if self.config.validation_enabled else None
+        success, _ = self.pool.add_multi_transactions(multi_txn, public_key)
+        if success:
+            arrival = self._start_at + self.schedule[seq][0]
+            self.result.accepted += 1
+            self._arrival_at[multi_txn.digest] = arrival
+            self._ingest_latency.append(time.time() - arrival)
+        else:
+            self.result.rejected += 1
+
+    def _package_block(self) -> int:
+        started = time.perf_counter()
+        package = self.packager.package_transactions(self.pool)
+        self.packager.remove_packaged_transactions(self.pool, package.selected_multi_txns)
+        self._pack_time.append(time.perf_counter() - started)
+
+        now = time.time()
+        for multi_txn in package.selected_multi_txns:
+            arrival = self._arrival_at.pop(multi_txn.digest, None)
+            if arrival is not None:
+                self._package_latency.append(now - arrival)
+        packaged = len(package.selected_multi_txns)
+        if packaged:
+            self.result.blocks += 1
+            self.result.packaged += packaged
+            if not self.config.quiet:
+                print(f"  block {self.result.blocks}: {packaged} MultiTransactions, "
+                      f"{self._pack_time[-1] * 1000:.1f} ms, pool {len(self.pool.pool)}")
+        return packaged
+
+    def _next_block_at(self, last_block_at: float) -> float:
+        interval = self.config.block_interval
+        return last_block_at + interval if interval > 0 else float("inf")
+
+    def _run_inline(self) -> None:
+        wallets: Dict[int, SenderWallet] = {}
+        next_block_at = self._next_block_at(self._start_at)
+        for offset, seq, sender, requests in self.schedule:
+            due = self._start_at + offset
+            while next_block_at <= due:
+                _wait_until(next_block_at)
+                self._package_block()
+                next_block_at = self._next_block_at(next_block_at)
+            _wait_until(due)
+            try:
+                wallet = wallets.get(sender)
+                if wallet is None:
+                    wallet = wallets[sender] = SenderWallet(sender, self.private_keys[sender], self.config)
+                started = time.perf_counter()
+                multi_txn = wallet.create(requests)
+                create_time = time.perf_counter() - started
+            except Exception as e:
+                multi_txn, create_time = None, 0.0
+                print(f"Error creating arrival {seq}: {e}")
+            self._ingest(seq, multi_txn, create_time)
+            if time.time() >= next_block_at:
+                self._package_block()
+                next_block_at = self._next_block_at(next_block_at)
+
+    def _run_workers(self) -> None:
+        workers = self.config.workers
+        ctx = multiprocessing.get_context()
+        out_queue = ctx.Queue()
+        per_worker: List[List[Arrival]] = [[] for _ in range(workers)]
+        for arrival in self.schedule:
+            per_worker[arrival[2] % workers].append(arrival)  # a sender's wallet lives in one worker
+
+        processes = [ctx.Process(target=_worker_main, daemon=True,
+                                 args=(self.config, arrivals, {a[2]: self.private_keys[a[2]] for a in arrivals},
+                                       self._start_at, out_queue))
+                     for arrivals in per_worker]
+        for process in processes:
+            process.start()
+
+        running = workers
+        next_block_at = self._next_block_at(self._start_at)
+        try:
+            while running:
+                timeout = max(0.0, min(next_block_at - time.time(), 1.0))
+                try:
+                    item = out_queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = False
+                if item is None:
+                    running -= 1
+                elif item is not False:
+                    seq, create_time, encoded = item
+                    self._ingest(seq, MultiTransactions.decode(encoded) if encoded is not None else None, create_time)
+                if time.time() >= next_block_at:
+                    self._package_block()
+                    next_block_at = self._next_block_at(next_block_at)
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+    def run(self) -> LoadResult:
+        """Run the schedule, then package until the pool is empty; returns the collected results."""
+        if not self.config.quiet:
+            print(f"Offering {len(self.schedule)} MultiTransactions over {self.config.duration:.1f}s "
+                  f"({self.config.target_rate:.1f}/s, skew {self.config.sender_skew}, workers {self.config.workers})")
+        # workers need a moment to start; the schedule begins once they can keep it
+        self._start_at = time.time() + (0.5 if self.config.workers > 0 else 0.0)
+        with _quiet(self.config):
+            if self.config.workers > 0:
+                self._run_workers()
+            else:
+                self._run_inline()
+            while self.pool.pool and self._package_block():
+                pass
+
+        result = self.result
+        result.duration = time.time() - self._start_at
+        result.offered_rate = result.offered / self.config.duration if self.config.duration > 0 else 0.0
+        result.ingest_latency = LatencySummary.from_samples(self._ingest_latency)
+        result.package_latency = LatencySummary.from_samples(self._package_latency)
+        result.create_time = LatencySummary.from_samples(self._create_time)
+        result.pack_time = LatencySummary.from_samples(self._pack_time)
+        return result
+
+    def cleanup(self) -> None:
+        if self._own_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def run_load(config: LoadConfig) -> LoadResult:
+    generator = LoadGenerator(config)
+    try:
+        return generator.run()
+    finally:
+        generator.cleanup()
+
+
+def format_result(result: LoadResult) -> str:
+    lines = [
+        f"Offered: {result.offered} ({result.offered_rate:.1f}/s)   accepted: {result.accepted}   "
+        f"rejected: {result.rejected}   errors: {result.errors}",
+        f"Throughput: {result.throughput:.1f} accepted/s, {result.packaged_throughput:.1f} packaged/s "
+        f"in {result.blocks} blocks over {result.duration:.2f}s",
+        f"{'latency (ms)':<16} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}",
+    ]
+    for name, summary in (("ingest", result.ingest_latency), ("package", result.package_latency),
+                          ("create+sign", result.create_time), ("pack/block", result.pack_time)):
+        lines.append(f"{name:<16} {summary.p50 * 1000:>9.2f} {summary.p90 * 1000:>9.2f} "
+                     f"{summary.p99 * 1000:>9.2f} {summary.max * 1000:>9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop signed load against the transaction pool and packager")
+    parser.add_argument("--rate", type=float, default=100.0, help="target MultiTransactions per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of offered load")
+    parser.add_argument("--senders", type=int, default=100, help="number of sender wallets")
+    parser.add_argument("--recipients", type=int, default=2, help="recipients per MultiTransactions")
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of the sender choice")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes creating and signing")
+    parser.add_argument("--aggregate", action="store_true", help="aggregate (Merkle root) signatures")
+    parser.add_argument("--block-interval", type=float, default=1.0, help="seconds between packaged blocks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the result to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="print per-block progress")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect pipeline metrics (main process only) and print them")
+    args = parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+
+    config = LoadConfig(num_senders=args.senders, target_rate=args.rate, duration=args.duration,
+                        recipients_per_batch=args.recipients, sender_skew=args.skew, workers=args.workers,
+                        aggregate_signatures=args.aggregate, block_interval=args.block_interval,
+                        seed=args.seed, quiet=not args.verbose)
+    result = run_load(config)
+    print(format_result(result))
+    if args.metrics:
+        print("\nPipeline metrics:")
+        print(metrics.format_snapshot())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": asdict(config), "result": result.to_dict()}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    return 0 if result.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
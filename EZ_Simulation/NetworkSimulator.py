@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Deterministic multi-node network simulation, in one process.
+
+Every simulated node is one account with its own chain store (Blockchain),
+transaction pool and packager. Nodes talk over an in-memory transport with
+per-link latency and per-node uplink bandwidth, all on a discrete-event
+clock, so hundreds of nodes fit on one machine:
+
+- a node's wallet creates and signs a MultiTransactions (LoadGenerator
+  schedule) and sends it to every miner;
+- miners take turns producing a block every block_interval; the block
+  (header, Bloom filter and leaf digests) is gossiped over a random peer
+  graph, and each sender in it receives its Merkle proof from the miner;
+- once a sender holds both the block and its proof, it hands every
+  recipient a VPB bundle (ProofBundle encoding) for the values it received.
+
+Schedule, topology and link latencies all derive from the seed, so reruns
+process the same events in the same order (message sizes can differ by the
+odd byte, as ECDSA signatures vary in length). The run reports block
+propagation times, VPB transfer sizes, inclusion and end-to-end confirmation
+times (submission until the last recipient holds its VPB), and message and
+byte counts per message kind.
+
+Usage:
+    python EZ_Simulation/NetworkSimulator.py --nodes 100 --miners 4 --rate 20 --duration 30
+    python EZ_Simulation/NetworkSimulator.py --nodes 1000 --latency 0.08 --bandwidth 1e6 --json net.json
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import heapq
+import random
+import shutil
+import datetime
+import tempfile
+import argparse
+import contextlib
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EZ_Simulation.LoadGenerator import LoadConfig, LatencySummary, SenderWallet, build_schedule, sender_address
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Transaction_Pool.TransactionPool import TransactionPool
+from EZ_Transaction_Pool.PackTransactions import TransactionPackager
+from EZ_Main_Chain.Block import Block
+from EZ_Main_Chain.Blockchian import Blockchain
+from EZ_Block_Units.Proof import Proof, ProofUnit
+from EZ_Block_Units.ProofBundle import encode_vpb_bundle
+from EZ_Tool_Box.KeyStore import KeyStore, DEFAULT_SEED, default_key_store_path
+
+# Message kinds
+MSG_TXN = "txn"  # sender -> miners: MultiTransactions
+MSG_BLOCK = "block"  # gossip: block header, Bloom filter and leaf digests
+MSG_PROOF = "mtree_proof"  # miner -> sender: Merkle proof of the sender's MultiTransactions
+MSG_VPB = "vpb"  # sender -> recipient: VPB bundle of the transferred values
+
+# Event kinds, in tie-break order at equal simulated times
+EVENT_DELIVER = 0
+EVENT_BLOCK = 1
+EVENT_ARRIVAL = 2
+
+GENESIS_TIME = datetime.datetime(2024, 1, 1)
+
+
+@dataclass
+class NetworkConfig:
+    """Configuration of a network simulation (times are simulated seconds)"""
+    num_nodes: int = 20
+    num_miners: int = 4  # nodes 0 .. num_miners - 1 produce blocks in turn
+    peer_degree: int = 8  # gossip peers each node dials (links are bidirectional)
+    latency: float = 0.05  # one-way link latency
+    latency_jitter: float = 0.5  # each link's latency is fixed in latency * [1, 1 + jitter]
+    bandwidth: float = 1_250_000.0  # uplink bytes per second per node (10 Mbit/s)
+    tx_rate: float = 20.0  # MultiTransactions per simulated second, network-wide
+    duration: float = 30.0  # simulated seconds of transaction arrivals
+    block_interval: float = 5.0
+    max_multi_txns_per_block: int = 1000
+    recipients_per_batch: int = 2
+    max_amount: int = 50
+    sender_skew: float = 0.0
+    aggregate_signatures: bool = False
+    validation_enabled: bool = True
+    seed: int = 42
+    key_seed: str = DEFAULT_SEED
+    key_store_path: Optional[str] = None
+    quiet: bool = True
+    workdir: Optional[str] = None
+
+    def load_config(self) -> LoadConfig:
+        return LoadConfig(num_senders=self.num_nodes, num_recipients=self.num_nodes, target_rate=self.tx_rate,
+                          duration=self.duration, recipients_per_batch=self.recipients_per_batch,
+                          max_amount=self.max_amount, sender_skew=self.sender_skew,
+                          aggregate_signatures=self.aggregate_signatures, seed=self.seed, key_seed=self.key_seed)
+
+
+@dataclass
+class NetworkSimResult:
+    """Outcome of a network simulation"""
+    num_nodes: int = 0
+    offered: int = 0
+    admitted: int = 0  # accepted by at least one miner
+    rejections: int = 0  # miner-side rejections (a MultiTransactions is checked by every miner)
+    errors: int = 0
+    blocks: int = 0
+    included: int = 0
+    duplicate_inclusions: int = 0
+    confirmed: int = 0
+    reorgs: int = 0
+    vpb_transfers: int = 0
+    vpb_bytes: int = 0
+    simulated_time: float = 0.0
+    wall_time: float = 0.0
+    inclusion_latency: LatencySummary = field(default_factory=LatencySummary)  # submitted -> in a block
+    confirmation_latency: LatencySummary = field(default_factory=LatencySummary)  # submitted -> all VPBs delivered
+    block_half_propagation: LatencySummary = field(default_factory=LatencySummary)  # produced -> half the nodes
+    block_full_propagation: LatencySummary = field(default_factory=LatencySummary)  # produced -> every node
+    block_receipt_delay: LatencySummary = field(default_factory=LatencySummary)  # produced -> each node
+    block_size: LatencySummary = field(default_factory=LatencySummary)  # bytes
+    vpb_size: LatencySummary = field(default_factory=LatencySummary)  # bytes per VPB bundle
+    network: Dict[str, Dict[str, int]] = field(default_factory=dict)  # kind -> messages / bytes
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def save_json(self, path: str, config: Optional[NetworkConfig] = None) -> None:
+        data = {"result": self.to_dict()}
+        if config is not None:
+            data["config"] = asdict(config)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def build_topology(num_nodes: int, peer_degree: int, seed: int) -> List[List[int]]:
+    """Connected random peer graph: a ring plus up to peer_degree - 2 random links dialled by every node."""
+    rng = random.Random(f"topology:{seed}")
+    peers: List[Set[int]] = [set() for _ in range(num_nodes)]
+    if num_nodes < 2:
+        return [[] for _ in range(num_nodes)]
+    for node in range(num_nodes):
+        peers[node].add((node + 1) % num_nodes)
+        peers[(node + 1) % num_nodes].add(node)
+    extra = min(max(peer_degree - 2, 0), num_nodes - 3) if num_nodes > 3 else 0
+    for node in range(num_nodes):
+        for peer in rng.sample(range(num_nodes), extra + 1):
+            if peer != node:
+                peers[node].add(peer)
+                peers[peer].add(node)
+    return [sorted(node_peers) for node_peers in peers]
+
+
+class InMemoryTransport:
+    """
+    Deterministic links between simulated nodes.
+
+    A node's uplink sends one message at a time at config.bandwidth, so a
+    broadcast queues behind itself; each message then takes its link's fixed
+    latency. Messages to self are delivered immediately and not counted.
+    """
+
+    def __init__(self, config: NetworkConfig, deliver):
+        self.config = config
+        self._deliver = deliver  # callback(at, dst, src, kind, payload)
+        self._link_latency: Dict[Tuple[int, int], float] = {}
+        self._uplink_free = [0.0] * config.num_nodes
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def link_latency(self, src: int, dst: int) -> float:
+        link = (src, dst) if src < dst else (dst, src)
+        latency = self._link_latency.get(link)
+        if latency is None:
+            jitter = random.Random(f"link:{self.config.seed}:{link[0]}:{link[1]}").random()
+            latency = self.config.latency * (1 + self.config.latency_jitter * jitter)
+            self._link_latency[link] = latency
+        return latency
+
+    def send(self, now: float, src: int, dst: int, kind: str, payload: Any, size: int) -> float:
+        """Queue a message on src's uplink; returns its delivery time."""
+        if src == dst:
+            self._deliver(now, dst, src, kind, payload)
+            return now
+        departs = max(now, self._uplink_free[src]) + size / self.config.bandwidth
+        self._uplink_free[src] = departs
+        at = departs + self.link_latency(src, dst)
+        stats = self.stats.setdefault(kind, {'messages': 0, 'bytes': 0})
+        stats['messages'] += 1
+        stats['bytes'] += size
+        self._deliver(at, dst, src, kind, payload)
+        return at
+
+
+class SimNode:
+    """One simulated account: chain store, transaction pool, packager and (when it sends) a wallet."""
+
+    def __init__(self, node_id: int, genesis: Block, config: NetworkConfig, workdir: str):
+        self.node_id = node_id
+        self.address = sender_address(node_id)
+        self.is_miner = node_id < config.num_miners
+        self.chain = Blockchain(genesis)
+        self.packager = TransactionPackager(max_multi_txns_per_block=config.max_multi_txns_per_block)
+        self.peers: List[int] = []
+        self.wallet: Optional[SenderWallet] = None
+        self.orphans: Dict[str, List[Tuple[Block, List[str]]]] = {}  # missing parent hash -> waiting blocks
+        self.pending: Dict[str, MultiTransactions] = {}  # own MultiTransactions awaiting a proof
+        self.proofs: Dict[str, Tuple[str, int, List[str]]] = {}  # digest -> (block hash, height, Merkle proof)
+        self._pool_path = os.path.join(workdir, f"node_{node_id:05d}_pool.db")
+        self._pool: Optional[TransactionPool] = None
+
+    @property
+    def pool(self) -> TransactionPool:
+        # opened on first use: only miners ever receive transactions
+        if self._pool is None:
+            self._pool = TransactionPool(self._pool_path)
+        return self._pool
+
+    @property
+    def has_pool(self) -> bool:
+        return self._pool is not None
+
+
+class NetworkSimulator:
+    """Discrete-event simulation of num_nodes EZchain nodes."""
+
+    def __init__(self, config: NetworkConfig):
+        if not 1 <= config.num_miners <= config.num_nodes:
+            raise ValueError("num_miners must be between 1 and num_nodes")
+        self.config = config
+        self.load_config = config.load_config()
+        self.schedule = build_schedule(self.load_config, sender_address)
+
+        senders = sorted({arrival[2] for arrival in self.schedule})
+        key_store = KeyStore(config.key_store_path or default_key_store_path(config.key_seed), config.key_seed)
+        try:
+            key_pairs = key_store.get_key_pairs(sender_address(i) for i in senders)
+        finally:
+            key_store.close()
+        self.public_keys = {address: key_pair[1] for address, key_pair in key_pairs.items()}
+
+        self._own_workdir = config.workdir is None
+        self.workdir = config.workdir or tempfile.mkdtemp(prefix="ez_netsim_")
+        genesis = Block(index=0, m_tree_root="", miner="genesis", pre_hash="0", bloom_size=64,
+                        bloom_hash_count=1, time=GENESIS_TIME)
+        self.nodes = [SimNode(i, genesis, config, self.workdir) for i in range(config.num_nodes)]
+        for node, peers in zip(self.nodes, build_topology(config.num_nodes, config.peer_degree, config.seed)):
+            node.peers = peers
+        for i in senders:
+            self.nodes[i].wallet = SenderWallet(i, key_pairs[sender_address(i)][0], self.load_config)
+        self.node_by_address = {node.address: node for node in self.nodes}
+
+        self.transport = InMemoryTransport(config, self._schedule_delivery)
+        self.result = NetworkSimResult(num_nodes=config.num_nodes, offered=len(self.schedule))
+        self.now = 0.0
+        self._events: List[Tuple[float, int, int, Any]] = []
+        self._order = 0
+        self._txns_in_flight = 0
+        self._submitted_at: Dict[str, float] = {}
+        self._awaiting_inclusion: Set[str] = set()
+        self._included: Set[str] = set()
+        self._transfers: Dict[str, int] = {}  # digest -> VPB bundles still in flight
+        self._block_produced_at: Dict[str, float] = {}
+        self._block_receipts: Dict[str, List[float]] = {}
+        self._samples: Dict[str, List[float]] = {
+            name: [] for name in ("inclusion", "confirmation", "receipt", "block_size", "vpb_size")}
+
+    def _push(self, at: float, kind: int, payload: Any) -> None:
+        heapq.heappush(self._events, (at, kind, self._order, payload))
+        self._order += 1
+
+    def _schedule_delivery(self, at: float, dst: int, src: int, kind: str, payload: Any) -> None:
+        self._push(at, EVENT_DELIVER, (dst, src, kind, payload))
+
+    # --- transactions -------------------------------------------------------
+
+    def _on_arrival(self, seq: int) -> None:
+        _, _, sender, requests = self.schedule[seq]
+        node = self.nodes[sender]
+        try:
+            multi_txn = node.wallet.create(requests)
+        except Exception as e:
+            self.result.errors += 1
+            print(f"Error creating arrival {seq}: {e}")
+            return
+        node.pending[multi_txn.digest] = multi_txn
+        self._submitted_at[multi_txn.digest] = self.now
+        size = len(multi_txn.encode())
+        for miner in range(self.config.num_miners):
+            self._txns_in_flight += 1
+            self.transport.send(self.now, node.node_id, miner, MSG_TXN, multi_txn, size)
+
+    def _on_txn(self, node: SimNode, multi_txn: MultiTransactions) -> None:
+        self._txns_in_flight -= 1
+        if multi_txn.digest in self._included:
+            return  # already in a block this miner has seen
+        public_key = self.public_keys.get(multi_txn.sender) if self.config.validation_enabled else None
+        success, _ = node.pool.add_multi_transactions(multi_txn, public_key)
+        if success:
+            if multi_txn.digest not in self._awaiting_inclusion:
+                self.result.admitted += 1
+            self._awaiting_inclusion.add(multi_txn.digest)
+        else:
+            self.result.rejections += 1
+
+    # --- blocks ---------------------------------------------------------------
+
+    def _on_block_tick(self, tick: int) -> None:
+        producer = self.nodes[tick % self.config.num_miners]
+        if not producer.has_pool or not producer.pool.pool:
+            return
+        package = producer.packager.package_transactions(producer.pool)
+        if not package.selected_multi_txns:
+            return
+        block = producer.packager.create_block_from_package(
+            package, producer.address, producer.chain.get_tip_hash(), producer.chain.get_height() + 1)
+        digests = list(package.tx_index.leaf_digests)
+        size = len(block.block_to_pickle()) + len(package.tx_index.to_bytes())
+        block_hash = block.get_hash()
+
+        self.result.blocks += 1
+        self._block_produced_at[block_hash] = self.now
+        self._block_receipts[block_hash] = []
+        self._samples["block_size"].append(size)
+        for digest in digests:
+            if digest in self._included:
+                self.result.duplicate_inclusions += 1
+                continue
+            self._included.add(digest)
+            self._awaiting_inclusion.discard(digest)
+            self.result.included += 1
+            self._samples["inclusion"].append(self.now - self._submitted_at[digest])
+        if not self.config.quiet:
+            print(f"  t={self.now:9.3f}s block {block.get_index()} by {producer.address}: "
+                  f"{len(digests)} MultiTransactions, {size} bytes")
+
+        self._receive_block(producer, block, digests, size, src=None)
+        for position, multi_txn in enumerate(package.selected_multi_txns):
+            proof = package.tx_index.get_merkle_proof(position)
+            payload = (block_hash, block.get_index(), digests[position], proof)
+            sender = self.node_by_address[multi_txn.sender]
+            self.transport.send(self.now, producer.node_id, sender.node_id, MSG_PROOF, payload,
+                                len(json.dumps(payload)))
+
+    def _receive_block(self, node: SimNode, block: Block, digests: List[str], size: int,
+                       src: Optional[int]) -> None:
+        block_hash = block.get_hash()
+        if block_hash in node.chain:
+            return
+        success, message = node.chain.add_block(block)
+        if not success:
+            if message == "Unknown parent block":
+                node.orphans.setdefault(block.get_pre_hash(), []).append((block, digests))
+            return
+
+        self._block_receipts[block_hash].append(self.now - self._block_produced_at[block_hash])
+        if node.has_pool:
+            for digest in digests:
+                node.pool.remove_multi_transactions(digest)
+        for digest, (proof_block_hash, _, _) in list(node.proofs.items()):
+            if proof_block_hash == block_hash:
+                self._transfer_values(node, digest)
+        for peer in node.peers:
+            if peer != src:
+                self.transport.send(self.now, node.node_id, peer, MSG_BLOCK, (block, digests, size), size)
+        for orphan, orphan_digests in node.orphans.pop(block_hash, []):
+            self._receive_block(node, orphan, orphan_digests, size, src=None)
+
+    # --- VPB transfers ----------------------------------------------------------
+
+    def _on_proof(self, node: SimNode, payload: Tuple[str, int, str, List[str]]) -> None:
+        block_hash, height, digest, proof = payload
+        if digest not in node.pending:
+            return  # already transferred (the MultiTransactions was packaged twice)
+        node.proofs[digest] = (block_hash, height, proof)
+        if block_hash in node.chain:
+            self._transfer_values(node, digest)
+
+    def _transfer_values(self, node: SimNode, digest: str) -> None:
+        """Send every recipient of the MultiTransactions a VPB bundle of the values it received."""
+        multi_txn = node.pending.pop(digest, None)
+        block_hash, height, proof = node.proofs.pop(digest)
+        if multi_txn is None:
+            return
+        unit = ProofUnit(node.address, multi_txn, proof)
+        received: Dict[str, list] = {}
+        for txn in multi_txn:
+            if txn.recipient != node.address:
+                received.setdefault(txn.recipient, []).extend(txn.value)
+        if not received:
+            self._confirm(digest)
+            return
+        self._transfers[digest] = len(received)
+        for recipient, values in received.items():
+            bundle = encode_vpb_bundle([(value, Proof([unit]), [height]) for value in values])
+            self.result.vpb_transfers += 1
+            self.result.vpb_bytes += len(bundle)
+            self._samples["vpb_size"].append(len(bundle))
+            self.transport.send(self.now, node.node_id, self.node_by_address[recipient].node_id, MSG_VPB,
+                                digest, len(bundle))
+
+    def _on_vpb(self, digest: str) -> None:
+        self._transfers[digest] -= 1
+        if not self._transfers[digest]:
+            del self._transfers[digest]
+            self._confirm(digest)
+
+    def _confirm(self, digest: str) -> None:
+        self.result.confirmed += 1
+        self._samples["confirmation"].append(self.now - self._submitted_at[digest])
+
+    # --- event loop -------------------------------------------------------------
+
+    def _on_deliver(self, dst: int, src: int, kind: str, payload: Any) -> None:
+        node = self.nodes[dst]
+        if kind == MSG_TXN:
+            self._on_txn(node, payload)
+        elif kind == MSG_BLOCK:
+            block, digests, size = payload
+            self._receive_block(node, block, digests, size, src)
+        elif kind == MSG_PROOF:
+            self._on_proof(node, payload)
+        elif kind == MSG_VPB:
+            self._on_vpb(payload)
+
+    def _more_blocks_needed(self, at: float) -> bool:
+        return at <= self.config.duration or bool(self._awaiting_inclusion) or self._txns_in_flight > 0
+
+    def run(self) -> NetworkSimResult:
+        """Process every event; miners keep producing until every admitted MultiTransactions is included."""
+        wall_started = time.perf_counter()
+        for offset, seq, _, _ in self.schedule:
+            self._push(offset, EVENT_ARRIVAL, seq)
+        self._push(self.config.block_interval, EVENT_BLOCK, 0)
+
+        quiet = contextlib.redirect_stdout(io.StringIO()) if self.config.quiet else contextlib.nullcontext()
+        with quiet:
+            while self._events:
+                at, kind, _, payload = heapq.heappop(self._events)
+                self.now = at
+                if kind == EVENT_DELIVER:
+                    self._on_deliver(*payload)
+                elif kind == EVENT_ARRIVAL:
+                    self._on_arrival(payload)
+                else:
+                    self._on_block_tick(payload)
+                    next_at = at + self.config.block_interval
+                    if self._more_blocks_needed(next_at):
+                        self._push(next_at, EVENT_BLOCK, payload + 1)
+
+        return self._collect(time.perf_counter() - wall_started)
+
+    def _collect(self, wall_time: float) -> NetworkSimResult:
+        result = self.result
+        result.simulated_time = self.now
+        result.wall_time = wall_time
+        result.reorgs = sum(node.chain.stats['reorgs'] for node in self.nodes)
+        half = (self.config.num_nodes + 1) // 2
+        half_times, full_times = [], []
+        for receipts in self._block_receipts.values():
+            receipts.sort()
+            if len(receipts) >= half:
+                half_times.append(receipts[half - 1])
+            if len(receipts) == self.config.num_nodes:
+                full_times.append(receipts[-1])
+            self._samples["receipt"].extend(receipts)
+        result.block_half_propagation = LatencySummary.from_samples(half_times)
+        result.block_full_propagation = LatencySummary.from_samples(full_times)
+        result.block_receipt_delay = LatencySummary.from_samples(self._samples["receipt"])
+        result.inclusion_latency = LatencySummary.from_samples(self._samples["inclusion"])
+        result.confirmation_latency = LatencySummary.from_samples(self._samples["confirmation"])
+        result.block_size = LatencySummary.from_samples(self._samples["block_size"])
+        result.vpb_size = LatencySummary.from_samples(self._samples["vpb_size"])
+        result.network = {kind: dict(stats) for kind, stats in sorted(self.transport.stats.items())}
+        return result
+
+    def cleanup(self) -> None:
+        if self._own_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def run_network_simulation(config: NetworkConfig) -> NetworkSimResult:
+    simulator = NetworkSimulator(config)
+    try:
+        return simulator.run()
+    finally:
+        simulator.cleanup()
+
+
+def format_result(result: NetworkSimResult) -> str:
+    def seconds(summary: LatencySummary) -> str:
+        return f"p50 {summary.p50:.3f}s   p95 {summary.p95:.3f}s   p99 {summary.p99:.3f}s   max {summary.max:.3f}s"
+
+    lines = [
+        f"Nodes: {result.num_nodes}   offered: {result.offered}   admitted: {result.admitted}   "
+        f"included: {result.included} in {result.blocks} blocks   confirmed: {result.confirmed}   "
+        f"errors: {result.errors}",
+        f"Simulated {result.simulated_time:.2f}s in {result.wall_time:.2f}s wall   reorgs: {result.reorgs}   "
+        f"duplicate inclusions: {result.duplicate_inclusions}",
+        f"Inclusion:          {seconds(result.inclusion_latency)}",
+        f"Confirmation (VPB): {seconds(result.confirmation_latency)}",
+        f"Block -> half:      {seconds(result.block_half_propagation)}",
+        f"Block -> all:       {seconds(result.block_full_propagation)}",
+        f"Block size: mean {result.block_size.mean:.0f} B   VPB bundle: mean {result.vpb_size.mean:.0f} B, "
+        f"p99 {result.vpb_size.p99:.0f} B, total {result.vpb_bytes} B in {result.vpb_transfers} transfers",
+    ]
+    for kind, stats in result.network.items():
+        lines.append(f"  {kind:<12} {stats['messages']:>9} messages {stats['bytes']:>12} bytes")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Deterministic in-process multi-node EZchain simulation")
+    parser.add_argument("--nodes", type=int, default=20, help="number of simulated nodes")
+    parser.add_argument("--miners", type=int, default=4, help="nodes producing blocks in turn")
+    parser.add_argument("--peers", type=int, default=8, help="gossip peers dialled per node")
+    parser.add_argument("--latency", type=float, default=0.05, help="one-way link latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="per-link latency spread (fraction)")
+    parser.add_argument("--bandwidth", type=float, default=1_250_000.0, help="uplink bytes per second")
+    parser.add_argument("--rate", type=float, default=20.0, help="MultiTransactions per simulated second")
+    parser.add_argument("--duration", type=float, default=30.0, help="simulated seconds of arrivals")
+    parser.add_argument("--block-interval", type=float, default=5.0, help="simulated seconds between blocks")
+    parser.add_argument("--recipients", type=int, default=2, help="recipients per MultiTransactions")
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of the sender choice")
+    parser.add_argument("--aggregate", action="store_true", help="aggregate (Merkle root) signatures")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write the result to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="print every block")
+    args = parser.parse_args(argv)
+
+    config = NetworkConfig(num_nodes=args.nodes, num_miners=args.miners, peer_degree=args.peers,
+                           latency=args.latency, latency_jitter=args.jitter, bandwidth=args.bandwidth,
+                           tx_rate=args.rate, duration=args.duration, block_interval=args.block_interval,
+                           recipients_per_batch=args.recipients, sender_skew=args.skew,
+                           aggregate_signatures=args.aggregate, seed=args.seed, quiet=not args.verbose)
+    result = run_network_simulation(config)
+    print(format_result(result))
+    if args.json:
+        result.save_json(args.json, config)
+        print(f"\nResults written to {args.json}")
+    return 0 if result.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
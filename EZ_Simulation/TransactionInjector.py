@@ -17,6 +17,8 @@ from EZ_Transaction_Pool.TransactionPool import TransactionPool
 from EZ_Transaction.MultiTransactions import MultiTransactions
 from EZ_Transaction.SingleTransaction import Transaction
 from EZ_Value.Value import Value, ValueState
+from EZ_Tool_Box.KeyStore import KeyStore, DEFAULT_SEED, default_key_store_path
+from EZ_Tool_Box.SecureSignature import secure_signature_handler
 
 
 @dataclass
@@ -32,6 +34,8 @@ class SimulationConfig:
     invalid_probability: float = 0.02  # probability of invalid transactions
     preserve_database: bool = True  # whether to preserve the database file after simulation
     database_output_dir: str = "EZ_simulation_data"  # directory to save database files
+    key_seed: str = DEFAULT_SEED  # sender keys are derived from this seed
+    key_store_path: Optional[str] = None  # persistent key cache (default: shared file in the temp dir)
 
 
 @dataclass
@@ -60,6 +64,7 @@ class TransactionInjector:
     def __init__(self, config: SimulationConfig):
         self.config = config
         self.transaction_pool = TransactionPool("simulation_pool.db")
+        self.key_store = KeyStore(config.key_store_path or default_key_store_path(config.key_seed), config.key_seed)
         self.sender_keys = self._generate_sender_keys()
         self.injected_transactions = []
         self.stats = SimulationStats()
@@ -70,24 +75,23 @@ class TransactionInjector:
             os.makedirs(self.config.database_output_dir)
         
     def _generate_sender_keys(self) -> Dict[str, bytes]:
-        """Generate sender addresses and their corresponding public keys"""
-        from cryptography.hazmat.primitives import serialization
-        
-        sender_keys = {}
-        
-        # Generate test sender addresses and keys
-        for i in range(self.config.num_senders):
-            sender = f"sender_{i:03d}"
-            # Generate a new ECDSA key pair for each sender
-            private_key = ec.generate_private_key(ec.SECP256R1())
-            public_key = private_key.public_key()
-            public_key_pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
-            sender_keys[sender] = public_key_pem
-            
-        return sender_keys
+        """Sender addresses and their public keys (key pairs come from the seeded key store)"""
+        senders = [f"sender_{i:03d}" for i in range(self.config.num_senders)]
+        key_pairs = self.key_store.get_key_pairs(senders)
+        return {sender: key_pairs[sender][1] for sender in senders}
+    
+    def _sign_multi_transactions(self, multi_txn: MultiTransactions) -> None:
+        """Sign every transaction and the MultiTransactions with the sender's private key"""
+        private_key_pem = self.key_store.get_private_key(multi_txn.sender)
+        with secure_signature_handler.signing_session(private_key_pem) as session:
+            session.sign_batch(multi_txn.multi_txns + [multi_txn])
+    
+    @staticmethod
+    def _add_dummy_signatures(multi_txn: MultiTransactions) -> None:
+        # Dummy signatures only pass the existence checks; used when signing is disabled
+        multi_txn.signature = b"dummy_signature_for_simulation"
+        for txn in multi_txn.multi_txns:
+            txn.signature = b"dummy_transaction_signature"
     
     def _generate_values(self, num_values: int = 3) -> List[Value]:
         """Generate random values for transactions"""
@@ -114,12 +118,6 @@ class TransactionInjector:
             nonce=nonce
         )
         
-        # Sign the transaction if enabled
-        if self.config.signature_enabled and sender in self.sender_keys:
-            # For simulation, we'll use a simple signing approach
-            # In real implementation, you'd use proper private keys
-            pass
-            
         return tx
     
     def _create_multi_transactions(self, sender: str, batch_size: int) -> MultiTransactions:
@@ -140,11 +138,9 @@ class TransactionInjector:
         # Create MultiTransactions
         multi_txn = MultiTransactions(sender=sender, multi_txns=transactions)
         
-        # Set digest and sign if enabled
+        # Set digest (signing happens when the batch is injected)
         if self.config.signature_enabled:
             multi_txn.set_digest()
-            # In real implementation, you'd sign with private key here
-            # For simulation, we'll skip actual signing
             
         return multi_txn
     
@@ -186,20 +182,11 @@ class TransactionInjector:
             # Always set digest for proper validation
             multi_txn.set_digest()
             
-            # For simulation purposes, add signatures to all transactions
-            if self.config.validation_enabled:
-                # Add dummy signature to MultiTransactions
-                multi_txn.signature = b"dummy_signature_for_simulation"
-                
-                # Add dummy signatures to individual transactions
-                for txn in multi_txn.multi_txns:
-                    txn.signature = b"dummy_transaction_signature"
+            # Sign with the sender's key, or add dummy signatures to pass the existence checks
+            if self.config.signature_enabled:
+                self._sign_multi_transactions(multi_txn)
             else:
-                # Even when validation is disabled, we need to provide dummy signatures
-                # to pass the basic existence checks
-                multi_txn.signature = b"dummy_signature_for_simulation"
-                for txn in multi_txn.multi_txns:
-                    txn.signature = b"dummy_transaction_signature"
+                self._add_dummy_signatures(multi_txn)
             
             # Add to pool
             public_key = self.sender_keys[sender] if self.config.validation_enabled else None
@@ -247,20 +234,11 @@ class TransactionInjector:
             # Always set digest for proper validation
             multi_txn.set_digest()
             
-            # For simulation purposes, add signatures to all transactions
-            if self.config.validation_enabled:
-                # Add dummy signature to MultiTransactions
-                multi_txn.signature = b"dummy_signature_for_simulation"
-                
-                # Add dummy signatures to individual transactions
-                for txn in multi_txn.multi_txns:
-                    txn.signature = b"dummy_transaction_signature"
+            # Sign with the sender's key, or add dummy signatures to pass the existence checks
+            if self.config.signature_enabled:
+                self._sign_multi_transactions(multi_txn)
             else:
-                # Even when validation is disabled, we need to provide dummy signatures
-                # to pass the basic existence checks
-                multi_txn.signature = b"dummy_signature_for_simulation"
-                for txn in multi_txn.multi_txns:
-                    txn.signature = b"dummy_transaction_signature"
+                self._add_dummy_signatures(multi_txn)
             
             # Add to pool
             public_key = self.sender_keys[sender] if self.config.validation_enabled else None
@@ -367,6 +345,7 @@ class TransactionInjector:
     
     def cleanup(self):
         """Clean up simulation resources"""
+        self.key_store.close()
         try:
             # Clear the transaction pool
             self.transaction_pool.clear_pool()
@@ -400,7 +379,7 @@ def main():
         num_batches=10,
         injection_interval=0.5,
         validation_enabled=True,
-        signature_enabled=False,  # Disabled for simplicity in simulation
+        signature_enabled=True,  # Real signatures with keys from the seeded key store
         duplicate_probability=0.05,
         invalid_probability=0.02,
         preserve_database=False,  # Set to True to preserve database file
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Memory footprint report for the objects the node holds in bulk.
+
+Builds count instances of each hot object the way the wallet, the pool and
+the block builder create them, measures them with Pympler's asizeof (deep
+size: the object, its attribute storage and everything it references that is
+not shared) and prints the bytes per object and how many fit in a GiB.
+
+Usage:
+    python EZ_Simulation/memory_report.py                   # 10000 of each
+    python EZ_Simulation/memory_report.py --count 50000
+    python EZ_Simulation/memory_report.py --json memory.json
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pympler import asizeof
+
+from EZ_Value.Value import Value
+from EZ_Value.AccountValueCollection import AccountValueCollection
+from EZ_Value.ColumnarValueCollection import ColumnarValueCollection
+from EZ_Transaction.SingleTransaction import Transaction
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Block_Units.MerkleTree import MerkleTree
+from EZ_Block_Units.Proof import ProofUnit
+from EZ_Tool_Box.Hash import sha256_hash
+
+GIB = 1 << 30
+TXN_TIME = "2024-01-01T00:00:00"
+SIGNATURE = b"\x30" * 71  # typical DER-encoded ECDSA signature length
+
+
+@dataclass
+class MemoryRow:
+    """Footprint of one object kind."""
+    name: str
+    count: int
+    total_bytes: int
+    bytes_per_object: float
+
+    @property
+    def objects_per_gib(self) -> int:
+        return int(GIB // self.bytes_per_object) if self.bytes_per_object else 0
+
+
+def _values(count: int) -> List[Value]:
+    return [Value(hex(0x10000 + i * 10), 10) for i in range(count)]
+
+
+def _counted(objects):
+    return objects, len(objects), None
+
+
+def _value_nodes(count: int):
+    # the nodes alone: their Values are excluded, so the row shows the per-node overhead
+    nodes = list(_collection(count)._index_map.values())
+    return nodes, len(nodes), [node.value for node in nodes]
+
+
+def _collection(count: int, collection_class=AccountValueCollection):
+    collection = collection_class("sender_00001")
+    for value in _values(count):
+        collection.add_value(value)
+    return collection
+
+
+def _transactions(count: int) -> List[Transaction]:
+    txns = []
+    for i in range(count):
+        txn = Transaction("sender_00001", f"recipient_{i % 100:05d}", i, None,
+                          [Value(hex(0x10000 + i * 10), 10)], TXN_TIME)
+        txn.signature = SIGNATURE
+        txns.append(txn)
+    return txns
+
+
+def _merkle_nodes(count: int) -> List:
+    tree = MerkleTree([sha256_hash(f"leaf_{i}") for i in range(count)])
+    nodes, stack = [], [tree.root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(child for child in (node.left, node.right) if child is not None)
+    return nodes
+
+
+def _proof_units(count: int) -> List[ProofUnit]:
+    # every unit holds its own one-transaction MultiTransactions and a Merkle proof for a 1024-leaf tree
+    units = []
+    for i in range(count):
+        txn = Transaction("sender_00001", "recipient_00001", i, SIGNATURE, [Value(hex(0x10000 + i * 10), 10)],
+                          TXN_TIME)
+        proof = [sha256_hash(f"proof_{i}_{level}") for level in range(21)]
+        units.append(ProofUnit("sender_00001", MultiTransactions("sender_00001", [txn]), proof))
+    return units
+
+
+def measure(name: str, objects, count: int, exclude=None) -> MemoryRow:
+    """Deep size of objects divided by count; exclude is referenced data not charged to them."""
+    exclude = exclude if exclude is not None else []
+    total = asizeof.asizeof(objects, exclude) - asizeof.asizeof(exclude)
+    if isinstance(objects, list):
+        total -= asizeof.flatsize(objects)  # the holding list is not part of the objects
+    return MemoryRow(name, count, total, total / count)
+
+
+def build_report(count: int = 10000, name_filter: Optional[str] = None) -> List[MemoryRow]:
+    """
+    Measure count objects of every kind.
+
+    value_node excludes the Values the nodes point at; account_value is the whole
+    AccountValueCollection (nodes, Values and indexes) per Value it holds, and
+    account_value[columnar] the same for ColumnarValueCollection;
+    merkle_tree_node is every node of a tree with count leaves (2 * count - 1 nodes).
+    """
+    builders: List[Tuple[str, Callable]] = [
+        ("value", lambda: _counted(_values(count))),
+        ("value_node", lambda: _value_nodes(count)),
+        ("account_value[collection]", lambda: (_collection(count), count, None)),
+        ("account_value[columnar]", lambda: (_collection(count, ColumnarValueCollection), count, None)),
+        ("transaction[1 value, signed]", lambda: _counted(_transactions(count))),
+        ("merkle_tree_node", lambda: _counted(_merkle_nodes(count))),
+        ("proof_unit[1 txn, 1024 leaves]", lambda: _counted(_proof_units(count))),
+    ]
+    return [measure(name, *build()) for name, build in builders if not name_filter or name_filter in name]
+
+
+def format_report(rows: List[MemoryRow]) -> str:
+    lines = [f"{'object':<30} {'count':>8} {'total bytes':>14} {'bytes/object':>13} {'per GiB':>12}"]
+    for row in rows:
+        lines.append(f"{row.name:<30} {row.count:>8} {row.total_bytes:>14} {row.bytes_per_object:>13.1f} "
+                     f"{row.objects_per_gib:>12,}")
+    return "\n".join(lines)
+
+
+def save_json(rows: List[MemoryRow], path: str) -> None:
+    data = {
+        'python': platform.python_version(),
+        'rows': [dict(asdict(row), objects_per_gib=row.objects_per_gib) for row in rows]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report the memory footprint of the EZchain hot objects")
+    parser.add_argument("--count", type=int, default=10000, help="objects of each kind to build")
+    parser.add_argument("--filter", help="only report objects whose name contains this text")
+    parser.add_argument("--json", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    rows = build_report(args.count, args.filter)
+    print(format_report(rows))
+    if args.json:
+        save_json(rows, args.json)
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
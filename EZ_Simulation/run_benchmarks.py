@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the core hot paths.
+
+Usage:
+    python EZ_Simulation/run_benchmarks.py                         # run and print
+    python EZ_Simulation/run_benchmarks.py --json bench.json       # save results
+    python EZ_Simulation/run_benchmarks.py --compare bench.json    # compare with a baseline
+    python EZ_Simulation/run_benchmarks.py --filter merkle --rounds 5
+"""
+
+import sys
+import os
+import argparse
+import itertools
+import random
+import shutil
+import tempfile
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EZ_Tool_Box.Benchmark import BenchmarkSuite, load_baseline, format_results
+from EZ_Value.Value import Value
+from EZ_Value.AccountPickValues import AccountPickValues
+from EZ_Value.AccountValueCollection import AccountValueCollection
+from EZ_Value.ColumnarValueCollection import ColumnarValueCollection
+from EZ_Transaction.SingleTransaction import Transaction
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Transaction_Pool.TransactionPool import TransactionPool
+from EZ_Block_Units.MerkleTree import MerkleTree
+from EZ_Block_Units.MerkleProof import MerkleTreeProof
+from EZ_Block_Units.Bloom import BloomFilter
+from EZ_Tool_Box.Hash import sha256_hash
+from EZ_Tool_Box.SecureSignature import secure_signature_handler
+from EZ_Tool_Box.KeyStore import shared_key_store
+from EZ_Tool_Box.Metrics import MetricsRegistry
+
+TXN_TIME = "2024-01-01T00:00:00"
+
+
+def _make_wallet_values(count: int, value_num: int = 10):
+    return [Value(hex(0x10000 + i * value_num), value_num) for i in range(count)]
+
+
+def _make_signed_multi_txn(private_key_pem: bytes, sender: str, nonce: int, txns_per_multi: int = 2):
+    txns = []
+    for i in range(txns_per_multi):
+        txn = Transaction(sender, f"recipient_{i}", nonce * txns_per_multi + i, None,
+                          [Value(hex(0x100000 + (nonce * txns_per_multi + i) * 10), 10)], TXN_TIME)
+        txn.sig_txn(private_key_pem)
+        txns.append(txn)
+    multi_txn = MultiTransactions(sender, txns)
+    multi_txn.sig_acc_txn(private_key_pem)
+    return multi_txn
+
+
+def build_suite(scale: float = 1.0, wallet_sizes=(10, 100, 1000), workdir: str = None) -> BenchmarkSuite:
+    """
+    Register the core benchmarks.
+
+    scale multiplies every round count (use < 1 for smoke runs); workdir is
+    where the transaction pool database lives (a temp dir by default).
+    """
+    rng = random.Random(42)
+    suite = BenchmarkSuite("ezchain-core")
+    rounds = lambda n: max(2, int(n * scale))
+    workdir = workdir or tempfile.mkdtemp(prefix="ez_bench_")
+    private_key_pem, public_key_pem = shared_key_store().get_key_pair("bench_signer")
+
+    # ---- Value
+    suite.add("value.construct", lambda: Value("0x1a2b3c", 1000), group="value", rounds=rounds(50),
+              iterations=200)
+    split_target = Value("0x1a2b3c", 1000)
+    suite.add("value.split", lambda: split_target.split_value(300), group="value", rounds=rounds(50),
+              iterations=200)
+
+    # ---- AccountPickValues (fresh wallet per round, picking about half the balance)
+    for wallet_size in wallet_sizes:
+        def setup_wallet(wallet_size=wallet_size):
+            picker = AccountPickValues("bench_account")
+            picker.add_values_from_list(_make_wallet_values(wallet_size))
+            return picker, wallet_size * 5 + 3
+
+        suite.add(f"account.pick_values[wallet={wallet_size}]",
+                  lambda picker, amount: picker.pick_values_for_transaction(amount, "bench_account", "bob", 1, 0),
+                  setup=setup_wallet, group="account", rounds=rounds(20), wallet_size=wallet_size)
+
+    # ---- Balance and overlap checks: linked-list collection vs columnar store
+    for backend, collection_class in (("linked", AccountValueCollection), ("columnar", ColumnarValueCollection)):
+        collection = collection_class("bench_account")
+        for value in _make_wallet_values(10000):
+            collection.add_value(value)
+        suite.add(f"account.balance[{backend},values=10000]", collection.get_balance_by_state,
+                  group="account", rounds=rounds(20), backend=backend)
+        suite.add(f"account.validate_no_overlap[{backend},values=10000]", collection.validate_no_overlap,
+                  group="account", rounds=rounds(10), backend=backend)
+
+    # ---- Transaction / MultiTransactions signatures
+    txn = Transaction("alice", "bob", 1, None, [Value("0x1000", 100)], TXN_TIME)
+    suite.add("transaction.sign", lambda: txn.sig_txn(private_key_pem), group="signature", rounds=rounds(30))
+    signed_txn = Transaction("alice", "bob", 2, None, [Value("0x2000", 100)], TXN_TIME)
+    signed_txn.sig_txn(private_key_pem)
+    suite.add("transaction.verify", lambda: signed_txn.check_txn_sig(public_key_pem), group="signature",
+              rounds=rounds(30))
+
+    multi_txn = MultiTransactions("alice", [Transaction("alice", f"r{i}", i, None, [Value(hex(0x3000 + i * 10), 10)],
+                                                        TXN_TIME) for i in range(10)])
+    suite.add("multi_transactions.sign[txns=10]", lambda: multi_txn.sig_acc_txn(private_key_pem),
+              group="signature", rounds=rounds(30))
+    signed_multi = MultiTransactions("alice", list(multi_txn.multi_txns))
+    signed_multi.sig_acc_txn(private_key_pem)
+    suite.add("multi_transactions.verify[txns=10]", lambda: signed_multi.check_acc_txn_sig(public_key_pem),
+              group="signature", rounds=rounds(30))
+
+    def sign_batch_in_session(items):
+        with secure_signature_handler.signing_session(private_key_pem) as session:
+            session.sign_batch(items)
+
+    batch_items = list(multi_txn.multi_txns) + [multi_txn]
+    suite.add("multi_transactions.sign_batch[session,txns=10]", lambda: sign_batch_in_session(batch_items),
+              group="signature", rounds=rounds(30))
+
+    # ---- TransactionPool (a fresh signed MultiTransactions per round, signed in the untimed setup)
+    pool = TransactionPool(os.path.join(workdir, "bench_pool.db"))
+    pool_nonces = itertools.count()
+    next_multi_txn = lambda: _make_signed_multi_txn(private_key_pem, "pool_sender", next(pool_nonces))
+    suite.add("pool.add_multi_transactions", lambda m: pool.add_multi_transactions(m),
+              setup=lambda: (next_multi_txn(),), group="pool", rounds=rounds(20))
+
+    def setup_remove():
+        m = next_multi_txn()
+        pool.add_multi_transactions(m)
+        return (m.digest,)
+
+    suite.add("pool.remove_multi_transactions", lambda digest: pool.remove_multi_transactions(digest),
+              setup=setup_remove, group="pool", rounds=rounds(20))
+
+    # ---- Ingest validation: every transaction signed vs one aggregate (Merkle root) signature
+    per_txn_batch = _make_signed_multi_txn(private_key_pem, "validate_sender", 0, txns_per_multi=10)
+    aggregate_batch = MultiTransactions("validate_sender", [
+        Transaction("validate_sender", f"recipient_{i}", i, None, [Value(hex(0x200000 + i * 10), 10)], TXN_TIME)
+        for i in range(10)])
+    aggregate_batch.sig_acc_txn_aggregate(private_key_pem)
+    for mode, batch in (("per_txn", per_txn_batch), ("aggregate", aggregate_batch)):
+        suite.add(f"pool.validate_multi_transactions[{mode},txns=10]",
+                  lambda batch=batch: pool.validate_multi_transactions(batch, public_key_pem),
+                  group="pool", rounds=rounds(20), mode=mode)
+
+    # ---- MerkleTree
+    for leaf_count in (64, 1024):
+        leaves = [sha256_hash(f"leaf_{leaf_count}_{i}") for i in range(leaf_count)]
+        suite.add(f"merkle.build[leaves={leaf_count}]", lambda leaves=leaves: MerkleTree(leaves), group="merkle",
+                  rounds=rounds(10 if leaf_count > 100 else 30), leaves=leaf_count)
+        tree = MerkleTree(leaves)
+        position = rng.randrange(leaf_count)
+        proof = MerkleTreeProof(tree.prf_list[position])
+        root = tree.get_root_hash()
+        suite.add(f"merkle.check_proof[leaves={leaf_count}]",
+                  lambda proof=proof, leaf=leaves[position], root=root: proof.check_prf(leaf, root),
+                  group="merkle", rounds=rounds(50), iterations=50, leaves=leaf_count)
+
+    # ---- BloomFilter
+    bloom = BloomFilter(size=1024 * 1024, hash_count=5)
+    counter = itertools.count()
+    suite.add("bloom.add", lambda: bloom.add(f"address_{next(counter)}"), group="bloom", rounds=rounds(50),
+              iterations=200)
+    for i in range(1000):
+        bloom.add(f"member_{i}")
+    suite.add("bloom.contains[hit]", lambda: "member_500" in bloom, group="bloom", rounds=rounds(50),
+              iterations=500)
+    suite.add("bloom.contains[miss]", lambda: "not_a_member" in bloom, group="bloom", rounds=rounds(50),
+              iterations=500)
+
+    # ---- Metrics instrumentation overhead (the shared registry is disabled by default)
+    for state in ("disabled", "enabled"):
+        registry = MetricsRegistry(enabled=state == "enabled")
+        timed_noop = registry.timed("bench.noop")(lambda: None)
+        suite.add(f"metrics.timed[{state}]", timed_noop, group="metrics", rounds=rounds(50), iterations=1000)
+
+    suite.workdir = workdir
+    return suite
+
+
+def print_comparison(comparison) -> int:
+    regressions = 0
+    print(f"\n{'name':<44} {'baseline (us)':>14} {'current (us)':>14} {'ratio':>7}")
+    for entry in comparison:
+        flag = "  REGRESSION" if entry["regression"] else ""
+        regressions += entry["regression"]
+        print(f"{entry['name']:<44} {entry['baseline'] * 1e6:>14.1f} {entry['current'] * 1e6:>14.1f} "
+              f"{entry['ratio']:>7.2f}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the EZchain core benchmarks")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--rounds", type=int, help="override the number of rounds of every benchmark")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply default round counts")
+    args = parser.parse_args(argv)
+
+    suite = build_suite(scale=args.scale)
+    try:
+        suite.run(name_filter=args.filter, rounds=args.rounds)
+    finally:
+        shutil.rmtree(suite.workdir, ignore_errors=True)
+    print(format_results(suite.results))
+
+    if args.json:
+        suite.save_json(args.json)
+        print(f"\nResults written to {args.json}")
+    if args.compare:
+        regressions = print_comparison(suite.compare(load_baseline(args.compare), args.threshold))
+        if regressions:
+            print(f"\n{regressions} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -716,13 +716,14 @@ class TestValueNode:
         assert node.value == value
         assert node.next is None
         assert node.prev is None
-        assert isinstance(node.node_id, str)
-        assert len(node.node_id) > 0
+        assert isinstance(node.node_id, int)
+        assert node.node_id > 0
+        assert ValueNode(value).node_id != node.node_id
         
     def test_value_node_with_custom_id(self, test_values):
         """Test ValueNode initialization with custom node_id."""
         value = test_values[0]
-        custom_id = "custom_node_id"
+        custom_id = 12345
         node = ValueNode(value, custom_id)
         
         assert node.node_id == custom_id
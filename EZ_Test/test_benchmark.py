@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline benchmark harness and the core benchmark suite.
+"""
+
+import pytest
+import sys
+import os
+import shutil
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Tool_Box.Benchmark import BenchmarkSuite, load_baseline, format_results
+    from EZ_Simulation.run_benchmarks import build_suite, main
+except ImportError as e:
+    print(f"Error importing Benchmark: {e}")
+    sys.exit(1)
+
+
+class TestBenchmarkSuite:
+    """Test the timing harness itself."""
+
+    def test_stats_per_round(self):
+        suite = BenchmarkSuite("test")
+        suite.add("sum", lambda: sum(range(100)), group="g", rounds=5, iterations=10, size=100)
+        results = suite.run()
+        assert len(results) == 1
+        stats = results[0].stats
+        assert stats.rounds == 5 and stats.iterations == 10
+        assert 0 < stats.min <= stats.median <= stats.max
+        assert stats.ops > 0
+        assert results[0].params == {"size": 100}
+
+    def test_setup_is_called_each_round_and_not_shared(self):
+        calls = []
+        suite = BenchmarkSuite("test")
+        suite.add("pop", lambda items: items.pop(), setup=lambda: (calls.append(1) or [1, 2],),
+                  rounds=4, warmup_rounds=1)
+        suite.run()
+        assert len(calls) == 5
+
+    def test_filter_and_rounds_override(self):
+        suite = BenchmarkSuite("test")
+        suite.add("a.fast", lambda: None, rounds=50)
+        suite.add("b.fast", lambda: None, rounds=50)
+        results = suite.run(name_filter="a.", rounds=3)
+        assert [r.name for r in results] == ["a.fast"]
+        assert results[0].stats.rounds == 3
+
+    def test_quiet_swallows_output(self, capsys):
+        suite = BenchmarkSuite("test")
+        suite.add("noisy", lambda: print("DEBUG noise"), rounds=2)
+        suite.run()
+        assert "DEBUG noise" not in capsys.readouterr().out
+
+    def test_json_round_trip_and_compare(self, tmp_path):
+        suite = BenchmarkSuite("test")
+        suite.add("case", lambda: None, rounds=3)
+        suite.run()
+        path = str(tmp_path / "bench.json")
+        suite.save_json(path)
+
+        baseline = load_baseline(path)
+        assert baseline["suite"] == "test"
+        assert baseline["benchmarks"][0]["name"] == "case"
+        assert "machine_info" in baseline and "commit_info" in baseline
+
+        same = suite.compare(baseline)
+        assert len(same) == 1 and not same[0]["regression"]
+
+        baseline["benchmarks"][0]["stats"]["median"] = suite.results[0].stats.median / 2
+        slower = suite.compare(baseline, threshold=0.2)
+        assert slower[0]["regression"] and slower[0]["ratio"] == pytest.approx(2.0)
+
+    def test_compare_skips_unknown_benchmarks(self):
+        suite = BenchmarkSuite("test")
+        suite.add("new_case", lambda: None, rounds=2)
+        suite.run()
+        assert suite.compare({"benchmarks": [{"name": "old_case", "stats": {"median": 1.0}}]}) == []
+
+    def test_format_results(self):
+        suite = BenchmarkSuite("test")
+        suite.add("formatted", lambda: None, rounds=2)
+        assert "formatted" in format_results(suite.run())
+
+
+class TestCoreBenchmarks:
+    """Smoke-run the registered core benchmarks."""
+
+    @pytest.fixture
+    def suite(self, tmp_path):
+        suite = build_suite(scale=0.1, wallet_sizes=(10,), workdir=str(tmp_path))
+        yield suite
+        shutil.rmtree(suite.workdir, ignore_errors=True)
+
+    def test_all_hot_paths_registered(self, suite):
+        names = [case.name for case in suite.cases]
+        for prefix in ("value.", "account.pick_values", "transaction.sign", "transaction.verify",
+                       "multi_transactions.", "pool.add", "pool.remove", "merkle.build", "merkle.check_proof",
+                       "bloom.add", "bloom.contains"):
+            assert any(name.startswith(prefix) for name in names), prefix
+
+    def test_smoke_run(self, suite):
+        results = suite.run(rounds=2)
+        assert len(results) == len(suite.cases)
+        assert all(result.stats.median > 0 for result in results)
+
+    def test_main_writes_json_and_compares(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        assert main(["--filter", "bloom", "--rounds", "2", "--json", path]) == 0
+        assert os.path.exists(path)
+        assert main(["--filter", "bloom", "--rounds", "2", "--compare", path, "--threshold", "1000"]) == 0
@@ -18,6 +18,7 @@ try:
     from EZ_Block_Units.Bloom import BloomFilter, BloomFilterEncoder
     from EZ_Block_Units.MerkleTree import MerkleTree
     from EZ_Tool_Box.temp_signature import temp_signature_system
+    from EZ_Transaction_Pool.PackTransactions import TransactionPackager, PackagedBlockData
 except ImportError as e:
     print(f"Error importing Block modules: {e}")
     sys.exit(1)
@@ -186,6 +187,40 @@ class TestBlockBloomFilter(unittest.TestCase):
         # Verify item was added
         self.assertTrue(block.is_in_bloom("test_item"))
 
+    def test_bloom_params_in_header(self):
+        """Test that the Bloom filter parameters are recorded in the block header."""
+        block = Block(
+            index=1,
+            m_tree_root=self.merkle_root,
+            miner="test_miner",
+            pre_hash="prev_hash",
+            bloom_size=2048,
+            bloom_hash_count=7
+        )
+
+        self.assertEqual(block.get_bloom_params(), (2048, 7))
+        main_data = json.loads(block.block_to_json()[0])
+        self.assertEqual(main_data["bloom_size"], 2048)
+        self.assertEqual(main_data["bloom_hash_count"], 7)
+
+    def test_packager_sizes_bloom_from_senders(self):
+        """Test that packaged blocks get a Bloom filter sized for their senders."""
+        senders = [f"sender_{i}" for i in range(20)]
+        package_data = PackagedBlockData(
+            selected_multi_txns=[],
+            merkle_root=self.merkle_root,
+            sender_addresses=senders,
+            package_time=datetime.datetime.now()
+        )
+        packager = TransactionPackager(bloom_false_positive_rate=0.001)
+        block = packager.create_block_from_package(package_data, "test_miner", "prev_hash", 1)
+
+        size, hash_count = block.get_bloom_params()
+        self.assertLess(size, 1024)
+        self.assertGreater(hash_count, 1)
+        for sender in senders:
+            self.assertTrue(block.is_in_bloom(sender))
+
 
 class TestBlockStringRepresentations(unittest.TestCase):
     """Test suite for Block string representation methods."""
@@ -595,6 +630,79 @@ class TestBlockPerformance(unittest.TestCase):
         self.assertTrue(all(h == hashes[0] for h in hashes))
 
 
+class TestBlockHeaderHash(unittest.TestCase):
+    """Test suite for the memoized binary header hash."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.block = Block(
+            index=1,
+            m_tree_root="root_hash",
+            miner="test_miner",
+            pre_hash="prev_hash",
+            time=datetime.datetime(2024, 1, 1, 12, 0, 0)
+        )
+
+    def test_header_bytes_layout(self):
+        """Test that the binary header ends with the nonce and embeds the Bloom digest."""
+        import struct
+        self.block.nonce = 7
+        header = self.block.header_to_bytes()
+        self.assertTrue(header.endswith(struct.pack(">Q", 7)))
+        self.assertEqual(header[:-8], self.block.header_prefix_bytes())
+        self.assertTrue(self.block.header_prefix_bytes().endswith(self.block.get_bloom().digest()))
+
+    def test_hash_is_memoized(self):
+        """Test that repeated get_hash calls do not re-serialise the header."""
+        from unittest import mock
+        first = self.block.get_hash()
+        with mock.patch.object(BloomFilter, "digest", side_effect=AssertionError("header rebuilt")):
+            self.assertEqual(self.block.get_hash(), first)
+
+    def test_hash_invalidated_on_nonce_change(self):
+        """Test that changing the nonce changes the hash."""
+        first = self.block.get_hash()
+        self.block.nonce = 1
+        second = self.block.get_hash()
+        self.assertNotEqual(first, second)
+        self.block.nonce = 0
+        self.assertEqual(self.block.get_hash(), first)
+
+    def test_hash_invalidated_on_bloom_change(self):
+        """Test that Bloom content is covered by the hash."""
+        first = self.block.get_hash()
+        self.block.add_item_to_bloom("sender_a")
+        second = self.block.get_hash()
+        self.assertNotEqual(first, second)
+
+        # Mutating the filter directly is detected as well
+        self.block.get_bloom().add("sender_b")
+        self.assertNotEqual(self.block.get_hash(), second)
+
+    def test_hash_invalidated_on_header_field_change(self):
+        """Test that reassigning header fields changes the hash."""
+        first = self.block.get_hash()
+        self.block.pre_hash = "other_prev_hash"
+        self.assertNotEqual(self.block.get_hash(), first)
+
+    def test_bloom_digest_independent_of_compression(self):
+        """Test that compressing the Bloom filter does not change the block hash."""
+        self.block.add_item_to_bloom("sender_a")
+        first = self.block.get_hash()
+        self.block.get_bloom().compress()
+        self.assertEqual(self.block.get_hash(), first)
+        self.assertEqual(
+            BloomFilter(1024, 3).add("x").digest(),
+            BloomFilter(1024, 3).add("x").digest()
+        )
+
+    def test_pickled_block_keeps_hash(self):
+        """Test that an unpickled block hashes identically."""
+        self.block.add_item_to_bloom("sender_a")
+        restored = pickle.loads(self.block.block_to_pickle())
+        self.assertEqual(restored.get_hash(), self.block.get_hash())
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the append-only, memory-mapped block file store.
+"""
+
+import pytest
+import sys
+import os
+import datetime
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.Block import Block
+    from EZ_Main_Chain.BlockFileStore import BlockFileStore, INDEX_FILE_NAME
+except ImportError as e:
+    print(f"Error importing BlockFileStore: {e}")
+    sys.exit(1)
+
+
+def make_chain(length):
+    blocks = [Block(index=0, m_tree_root="genesis_root", miner="genesis_miner", pre_hash="0",
+                    bloom_size=512, bloom_hash_count=3, time=datetime.datetime(2024, 1, 1))]
+    for i in range(1, length):
+        block = Block(index=i, m_tree_root=f"root_{i}", miner=f"miner_{i}", pre_hash=blocks[-1].get_hash(),
+                      nonce=i * 7, bloom_size=512, bloom_hash_count=3,
+                      time=datetime.datetime(2024, 1, 1, 0, i))
+        block.add_item_to_bloom(f"sender_{i}")
+        blocks.append(block)
+    return blocks
+
+
+@pytest.fixture
+def blocks():
+    """Fixture for a short chain of blocks."""
+    return make_chain(12)
+
+
+class TestBlockFileStore:
+    """Test suite for writing and reading blocks."""
+
+    def test_roundtrip(self, tmp_path, blocks):
+        with BlockFileStore(str(tmp_path)) as store:
+            for block in blocks:
+                store.append_block(block)
+            assert len(store) == len(blocks)
+            for block in blocks:
+                restored = store.read_block(block.get_index())
+                assert restored.get_hash() == block.get_hash()
+                assert restored.get_sig() == block.get_sig()
+                assert restored.get_time() == block.get_time()
+                assert restored.get_bloom_params() == block.get_bloom_params()
+
+    def test_read_block_does_not_sign(self, tmp_path, blocks, monkeypatch):
+        """Reading a block restores the stored signature without signing again."""
+        from EZ_Tool_Box.temp_signature import temp_signature_system
+
+        def no_signing(*args, **kwargs):
+            raise AssertionError("read_block must not sign")
+
+        with BlockFileStore(str(tmp_path)) as store:
+            for block in blocks:
+                store.append_block(block)
+            monkeypatch.setattr(temp_signature_system, "generate_signature", no_signing)
+            restored = store.read_block(7)
+            assert restored.get_sig() == blocks[7].get_sig()
+            assert restored.get_hash() == blocks[7].get_hash()
+            assert restored.get_bloom_params() == blocks[7].get_bloom_params()
+
+    def test_header_and_bloom_reads(self, tmp_path, blocks):
+        with BlockFileStore(str(tmp_path)) as store:
+            for block in blocks:
+                store.append_block(block)
+            header = store.read_header(5)
+            assert header["miner"] == "miner_5"
+            assert header["nonce"] == 35
+            assert bytes(store.get_bloom_view(5)) == blocks[5].get_bloom().bit_array.tobytes()
+            assert store.bloom_contains(5, "sender_5")
+            assert not store.bloom_contains(5, "sender_6") or blocks[5].is_in_bloom("sender_6")
+            assert store.get_block_hash(3) == blocks[3].get_hash()
+            assert store.find_height_by_hash(blocks[7].get_hash()) == 7
+            assert store.find_height_by_hash("00" * 32) is None
+
+    def test_reopen_and_segments(self, tmp_path, blocks):
+        store = BlockFileStore(str(tmp_path), max_segment_bytes=300)
+        for block in blocks[:6]:
+            store.append_block(block)
+        store.close()
+        assert len([f for f in os.listdir(tmp_path) if f.endswith(".dat")]) > 1
+
+        store = BlockFileStore(str(tmp_path), max_segment_bytes=300)
+        assert len(store) == 6
+        for block in blocks[6:]:
+            store.append_block(block)
+        for block in blocks:
+            assert store.read_block(block.get_index()).get_hash() == block.get_hash()
+        store.close()
+
+    def test_rejects_out_of_order(self, tmp_path, blocks):
+        with BlockFileStore(str(tmp_path)) as store:
+            with pytest.raises(ValueError):
+                store.append_block(blocks[1])
+            with pytest.raises(IndexError):
+                store.read_block(0)
+
+    def test_recovers_from_torn_write(self, tmp_path, blocks):
+        store = BlockFileStore(str(tmp_path))
+        for block in blocks[:4]:
+            store.append_block(block)
+        store.close()
+
+        # simulate a crash: garbage after the last record and a half-written index entry
+        with open(os.path.join(tmp_path, "blk00000.dat"), "ab") as f:
+            f.write(b"partial record")
+        with open(os.path.join(tmp_path, INDEX_FILE_NAME), "ab") as f:
+            f.write(b"\x00" * 10)
+
+        store = BlockFileStore(str(tmp_path))
+        assert len(store) == 4
+        store.append_block(blocks[4])
+        assert store.read_block(4).get_hash() == blocks[4].get_hash()
+        assert store.read_block(3).get_hash() == blocks[3].get_hash()
+        store.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the discrete-event block production simulator.
+"""
+
+import pytest
+import sys
+import os
+import csv
+import json
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Simulation.BlockProductionSimulator import (BlockSimConfig, BlockProductionSimulator,
+                                                        latency_histogram, run_block_simulation,
+                                                        NODE_STAGES, STAGE_CREATE)
+except ImportError as e:
+    print(f"Error importing BlockProductionSimulator: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture: a few simulated seconds of light load."""
+    return BlockSimConfig(num_senders=5, arrival_rate=20.0, duration=4.0, block_interval=1.0,
+                          sample_interval=0.5, key_store_path=str(tmp_path / "keys.db"),
+                          workdir=str(tmp_path))
+
+
+class TestLatencyHistogram:
+    """Test suite for latency_histogram."""
+
+    def test_buckets(self):
+        histogram = latency_histogram([0.1, 0.5, 0.6, 3.0, 100.0], (1.0, 0.5, 5.0))
+        assert histogram == [(0.5, 2), (1.0, 1), (5.0, 1), (float("inf"), 1)]
+
+
+class TestBlockProductionSimulator:
+    """Test suite for BlockProductionSimulator."""
+
+    def test_everything_admitted_is_included(self, config):
+        result = run_block_simulation(config)
+        assert result.offered > 0 and result.errors == 0 and result.rejected == 0
+        assert result.admitted == result.offered
+        assert result.included == result.admitted
+        assert sum(block.multi_txns for block in result.blocks) == result.included
+        assert result.inclusion_latency.count == result.included
+        assert sum(count for _, count in result.latency_histogram) == result.included
+        assert result.blocks[-1].pool_depth == 0
+
+    def test_blocks_form_a_chain_on_schedule(self, config):
+        config.charge_cpu_time = False
+        result = run_block_simulation(config)
+        assert [block.index for block in result.blocks] == list(range(1, len(result.blocks) + 1))
+        assert len({block.block_hash for block in result.blocks}) == len(result.blocks)
+        # without CPU charging blocks land exactly on block_interval ticks
+        assert all(block.time / config.block_interval == pytest.approx(round(block.time / config.block_interval))
+                   for block in result.blocks)
+        # and latencies can never exceed one interval when blocks have spare capacity
+        assert result.inclusion_latency.max <= config.block_interval + 1e-9
+
+    def test_block_capacity_builds_a_backlog(self, config):
+        config.max_multi_txns_per_block = 5
+        result = run_block_simulation(config)
+        assert all(block.multi_txns <= 5 for block in result.blocks)
+        assert result.included == result.admitted
+        assert result.simulated_time > config.duration
+        assert result.max_pool_depth > 5
+        assert result.inclusion_latency.p99 > config.block_interval
+
+    def test_stage_cpu_time_and_pool_depth(self, config):
+        result = run_block_simulation(config)
+        assert set(result.stages) == {STAGE_CREATE} | set(NODE_STAGES)
+        assert result.stages["admission"].count == result.offered
+        assert result.stages["create_block"].count == len(result.blocks)
+        assert all(stats.total >= 0 for stats in result.stages.values())
+        times = [sample[0] for sample in result.pool_depth]
+        assert times == sorted(times) and times[0] == 0.0
+        assert max(depth for _, depth in result.pool_depth) <= result.max_pool_depth
+
+    def test_deterministic_schedule(self, config):
+        first = BlockProductionSimulator(config)
+        second = BlockProductionSimulator(config)
+        try:
+            assert first.schedule == second.schedule
+        finally:
+            first.cleanup()
+            second.cleanup()
+
+    def test_export(self, config, tmp_path):
+        result = run_block_simulation(config)
+        json_path = str(tmp_path / "sim.json")
+        result.save_json(json_path, config)
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["result"]["included"] == result.included
+        assert data["result"]["latency_histogram"][-1][0] == "inf"
+        assert data["config"]["arrival_rate"] == config.arrival_rate
+
+        blocks_path, depth_path = result.save_csv(str(tmp_path / "sim.csv"))
+        with open(blocks_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(result.blocks)
+        assert sum(int(row["multi_txns"]) for row in rows) == result.included
+        with open(depth_path, newline="", encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == len(result.pool_depth)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-block sender -> Merkle leaf index.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.BlockTransactionIndex import BlockTransactionIndex
+    from EZ_Main_Chain.BlockFileStore import BlockFileStore
+    from EZ_Main_Chain.Block import Block
+    from EZ_Block_Units.MerkleProof import MerkleTreeProof
+    from EZ_Transaction_Pool.PackTransactions import TransactionPackager
+    from EZ_Test.test_vpb_verifier import make_multi_txn
+    from EZ_Value.Value import Value
+except ImportError as e:
+    print(f"Error importing BlockTransactionIndex: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def multi_txns():
+    """Fixture: seven MultiTransactions, alice sending twice."""
+    senders = ["alice", "bob", "carol", "alice", "dave", "erin", "frank"]
+    return [make_multi_txn(sender, [("x", [Value(hex(0x100 + i), 1)])], nonce=i) for i, sender in enumerate(senders)]
+
+
+class TestBlockTransactionIndex:
+    """Test suite for sender lookups and proofs."""
+
+    def test_lookup_and_proofs(self, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns, block_index=4)
+        assert index.get_positions("alice") == [0, 3]
+        assert index.get_digests("bob") == [multi_txns[1].digest]
+        assert index.get_positions("nobody") == []
+        assert "carol" in index and len(index) == 7
+        for digest, prf in index.get_owner_proofs("alice"):
+            assert MerkleTreeProof(prf).check_prf(digest, index.merkle_root)
+
+    def test_proof_units(self, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns)
+        units = index.build_proof_units("alice")
+        assert [u.ownerAccTxnsList for u in units] == [multi_txns[0], multi_txns[3]]
+
+    def test_serialisation_rebuilds_proofs(self, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns, block_index=4)
+        restored = BlockTransactionIndex.from_bytes(index.to_bytes())
+        assert restored.block_index == 4
+        assert restored.get_positions("alice") == [0, 3]
+        assert restored.get_owner_proofs("erin") == index.get_owner_proofs("erin")
+        with pytest.raises(ValueError):
+            restored.build_proof_units("alice")
+
+    def test_root_mismatch(self, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns)
+        restored = BlockTransactionIndex(0, "bad_root", index.leaf_digests, index.leaf_senders)
+        with pytest.raises(ValueError):
+            restored.get_merkle_proof(0)
+
+    def test_single_leaf(self, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns[:1])
+        digest, prf = index.get_owner_proofs("alice")[0]
+        assert MerkleTreeProof(prf).check_prf(digest, index.merkle_root)
+
+    def test_packager_builds_index(self, multi_txns):
+        class Pool:
+            def get_all_multi_transactions(self):
+                return multi_txns
+
+        packager = TransactionPackager()
+        package_data = packager.package_transactions(Pool())
+        block = packager.create_block_from_package(package_data, "miner", "prev", 9)
+        assert package_data.tx_index.merkle_root == block.get_m_tree_root()
+        assert package_data.tx_index.block_index == 9
+        assert package_data.tx_index.get_positions("dave") == [4]
+
+    def test_stored_with_block(self, tmp_path, multi_txns):
+        index = BlockTransactionIndex.from_multi_txns(multi_txns, block_index=0)
+        block = Block(index=0, m_tree_root=index.merkle_root, miner="miner", pre_hash="0", bloom_size=256)
+        with BlockFileStore(str(tmp_path)) as store:
+            store.append_block(block, tx_index=index)
+            store.append_block(Block(index=1, m_tree_root="r", miner="miner", pre_hash=block.get_hash(),
+                                     bloom_size=256))
+            restored = store.read_tx_index(0)
+            assert restored.get_positions("alice") == [0, 3]
+            assert restored.get_owner_proofs("bob") == index.get_owner_proofs("bob")
+            assert store.read_tx_index(1) is None
+            assert store.read_block(0).get_hash() == block.get_hash()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the indexed main-chain store.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.Block import Block
+    from EZ_Main_Chain.Blockchian import Blockchain
+except ImportError as e:
+    print(f"Error importing Blockchain: {e}")
+    sys.exit(1)
+
+
+def next_block(parent, miner="miner", senders=()):
+    block = Block(index=parent.get_index() + 1, m_tree_root=f"root_{miner}_{parent.get_index() + 1}",
+                  miner=miner, pre_hash=parent.get_hash(), bloom_size=2048, bloom_hash_count=3)
+    for sender in senders:
+        block.add_item_to_bloom(sender)
+    return block
+
+
+@pytest.fixture
+def genesis():
+    """Fixture for a genesis block."""
+    return Block(index=0, m_tree_root="genesis_root", miner="genesis_miner", pre_hash="0")
+
+
+@pytest.fixture
+def chain(genesis):
+    """Fixture for a chain of five blocks on top of genesis."""
+    blockchain = Blockchain(genesis)
+    parent = genesis
+    for i in range(5):
+        parent = next_block(parent, senders=[f"sender_{i}"])
+        success, _ = blockchain.add_block(parent)
+        assert success
+    return blockchain
+
+
+class TestBlockchainBasic:
+    """Test suite for appending and lookup."""
+
+    def test_lookup_by_height_and_hash(self, chain, genesis):
+        assert len(chain) == 6
+        assert chain.get_height() == 5
+        assert chain.get_block_by_height(0) is genesis
+        for height in range(6):
+            block = chain.get_block_by_height(height)
+            assert block.get_index() == height
+            assert chain.get_block_by_hash(block.get_hash()) is block
+        assert chain.get_block_by_height(6) is None
+        assert chain.get_block_by_hash("missing") is None
+        assert chain.validate_chain()
+
+    def test_rejects_invalid_blocks(self, chain, genesis):
+        tip = chain.get_latest_block()
+        orphan = Block(index=tip.get_index() + 1, m_tree_root="r", miner="m", pre_hash="unknown")
+        assert chain.add_block(orphan) == (False, "Unknown parent block")
+
+        wrong_index = Block(index=tip.get_index() + 2, m_tree_root="r", miner="m", pre_hash=tip.get_hash())
+        success, message = chain.add_block(wrong_index)
+        assert not success
+        assert "index" in message
+
+        assert not chain.add_block(tip)[0]  # duplicate
+        assert not chain.add_block(Block(index=0, m_tree_root="g2", miner="m", pre_hash="0"))[0]
+        assert chain.stats['blocks_rejected'] == 4
+
+    def test_first_block_must_be_genesis(self):
+        blockchain = Blockchain()
+        assert blockchain.get_latest_block() is None
+        success, _ = blockchain.add_block(Block(index=3, m_tree_root="r", miner="m", pre_hash="p"))
+        assert not success
+
+    def test_address_lookup(self, chain):
+        assert 3 in chain.find_blocks_for_address("sender_2")
+        assert chain.find_blocks_for_address("sender_2", 0, 2) == []
+
+    def test_proof_of_work_check(self, genesis):
+        blockchain = Blockchain(genesis, pow_difficulty_bits=64)
+        success, message = blockchain.add_block(next_block(genesis))
+        assert not success
+        assert "difficulty" in message
+
+
+class TestBlockchainForks:
+    """Test suite for fork handling."""
+
+    def test_side_chain_and_reorg(self, chain):
+        fork_parent = chain.get_block_by_height(3)
+        old_tip = chain.get_tip_hash()
+
+        fork_4 = next_block(fork_parent, miner="fork", senders=["fork_sender"])
+        assert chain.add_block(fork_4) == (True, "Block added to side chain")
+        assert chain.get_tip_hash() == old_tip
+        assert not chain.is_in_main_chain(fork_4.get_hash())
+        assert len(chain.get_fork_tips()) == 2
+
+        fork_5 = next_block(fork_4, miner="fork")
+        assert chain.add_block(fork_5)[0]
+        assert chain.get_tip_hash() == old_tip  # tie keeps the first-seen tip
+
+        fork_6 = next_block(fork_5, miner="fork")
+        assert chain.add_block(fork_6) == (True, "Block added; main chain reorganized")
+        assert chain.get_tip_hash() == fork_6.get_hash()
+        assert chain.get_block_by_height(4) is fork_4
+        assert not chain.is_in_main_chain(old_tip)
+        assert chain.get_block_by_hash(old_tip) is not None
+        assert chain.validate_chain()
+        assert chain.stats['reorgs'] == 1
+
+        # bloom index follows the main chain
+        assert chain.find_blocks_for_address("fork_sender") == [4]
+        assert 4 not in chain.find_blocks_for_address("sender_3")
+        assert chain.get_confirmations(fork_4.get_hash()) == 3
+        assert chain.get_confirmations(old_tip) == 0
@@ -7,12 +7,14 @@ import pytest
 import sys
 import os
 import json
+import threading
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from EZ_Block_Units.Bloom import BloomFilter, BloomFilterEncoder, bloom_decoder
+    from EZ_Block_Units.Bloom import BloomFilter, BloomFilterEncoder, bloom_decoder, BloomMemoryBudget
+    from EZ_Block_Units.Bloom import optimal_bloom_parameters
 except ImportError as e:
     print(f"Error importing Bloom: {e}")
     sys.exit(1)
@@ -230,6 +232,194 @@ class TestBloomFilterCompression:
         assert "new_item" in bloom
 
 
+class TestBloomFilterCompressedQuery:
+    """Test suite for membership probes on compressed filters."""
+
+    def test_probe_keeps_filter_compressed(self, bloom_filter_compression):
+        """Probing a compressed filter must not decompress it."""
+        small_size, test_items = bloom_filter_compression
+        bloom = BloomFilter(size=small_size * 100, hash_count=3)
+        for item in test_items:
+            bloom.add(item)
+        bloom.compress()
+
+        for item in test_items:
+            assert item in bloom
+        assert "grape" not in bloom
+        assert bloom.compressed
+        assert bloom.bit_array is None
+        assert bloom.compressed_bit_array is not None
+
+    def test_dense_filter_probe(self):
+        """Dense filters are answered from a frozen bit array view."""
+        bloom = BloomFilter(size=1000, hash_count=5)
+        items = [f"item_{i}" for i in range(300)]
+        for item in items:
+            bloom.add(item)
+        expected = {f"other_{i}": f"other_{i}" in bloom for i in range(200)}
+        bloom.compress()
+
+        for item in items:
+            assert item in bloom
+        for item, result in expected.items():
+            assert (item in bloom) == result
+        assert bloom.compressed
+
+    def test_query_view_reset_on_mutation(self):
+        """Adding to a compressed filter invalidates the previous query view."""
+        bloom = BloomFilter(size=10000, hash_count=3)
+        bloom.add("first")
+        bloom.compress()
+        assert "second" not in bloom
+
+        bloom.add("second")
+        bloom.compress()
+        assert "first" in bloom
+        assert "second" in bloom
+
+    def test_empty_compressed_filter(self):
+        """A filter created in compressed mode with no payload contains nothing."""
+        bloom = BloomFilter(size=1000, hash_count=3, compressed=True)
+        assert "anything" not in bloom
+        assert bloom.compressed
+
+    def test_memory_budget_evicts_cold_filters(self):
+        """Exceeding the budget drops the query views of the least recently probed filters."""
+        budget = BloomMemoryBudget(max_bytes=4096)
+        blooms = []
+        for i in range(4):
+            bloom = BloomFilter(size=16000, hash_count=3)
+            bloom.memory_budget = budget
+            for j in range(300):
+                bloom.add(f"sender_{i}_{j}")
+            bloom.compress()
+            assert f"sender_{i}_0" in bloom  # builds a dense view of 2000 bytes
+            blooms.append(bloom)
+
+        assert budget.used_bytes <= budget.max_bytes
+        assert blooms[0]._query_view is None
+        assert blooms[-1]._query_view is not None
+        for i, bloom in enumerate(blooms):
+            assert f"sender_{i}_299" in bloom
+            assert bloom.compressed
+
+        budget.set_max_bytes(0)
+        assert budget.tracked_count() <= 1
+        assert sum(bloom._query_view is not None for bloom in blooms) <= 1
+
+    def test_memory_budget_leaves_expanded_filters_alone(self):
+        """Decompressed filters are not tracked, so eviction never compresses one under add()."""
+        budget = BloomMemoryBudget(max_bytes=0)
+        bloom = BloomFilter(size=16000, hash_count=3)
+        bloom.memory_budget = budget
+        bloom.add("first")
+        bloom.compress()
+        assert "first" in bloom
+        bloom.decompress()
+        assert budget.tracked_count() == 0 and budget.used_bytes == 0
+
+        others = []
+        for i in range(50):
+            other = BloomFilter(size=16000, hash_count=3)
+            other.memory_budget = budget
+            other.add(f"other_{i}")
+            other.compress()
+            others.append(other)
+
+        def probe():
+            # every probe builds a view and pushes the budget to evict
+            for _ in range(20):
+                for i, other in enumerate(others):
+                    assert f"other_{i}" in other
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        for i in range(2000):
+            bloom.add(f"item_{i}")
+        prober.join()
+        assert not bloom.compressed
+        assert all(f"item_{i}" in bloom for i in range(2000))
+
+    def test_unpickle_filter_from_before_query_views(self):
+        """Filters pickled without the query view and digest caches still load and answer probes."""
+        import copyreg
+        import pickle
+
+        class LegacyBloom:
+            def __init__(self, state):
+                self.state = state
+
+            def __reduce__(self):
+                return copyreg._reconstructor, (BloomFilter, set, []), self.state
+
+        bloom = BloomFilter(size=10000, hash_count=3)
+        bloom.add("item")
+        bloom.compress()
+        state = {name: value for name, value in vars(bloom).items()
+                 if name not in ("_query_view", "_digest", "_revision")}
+        restored = pickle.loads(pickle.dumps(LegacyBloom(state)))
+        assert isinstance(restored, BloomFilter)
+        assert "item" in restored and "other" not in restored
+        assert restored.digest() == bloom.digest()
+
+    def test_pickle_drops_query_view(self):
+        """The derived query view is not serialised with the filter."""
+        import pickle
+        bloom = BloomFilter(size=10000, hash_count=3)
+        bloom.add("item")
+        bloom.compress()
+        assert "item" in bloom
+        restored = pickle.loads(pickle.dumps(bloom))
+        assert restored._query_view is None
+        assert "item" in restored
+
+
+class TestBloomFilterSizing:
+    """Test suite for capacity-based Bloom filter sizing."""
+
+    def test_optimal_parameters(self):
+        """Parameters follow the standard size/hash-count formulas."""
+        size, hash_count = optimal_bloom_parameters(20, 0.001)
+        assert size % 8 == 0
+        assert 280 <= size <= 300
+        assert hash_count == 10
+
+        small_size, _ = optimal_bloom_parameters(0, 0.01)
+        assert small_size == 64
+
+        large_size, _ = optimal_bloom_parameters(10000, 0.001)
+        assert large_size > size
+
+    def test_invalid_false_positive_rate(self):
+        """Out-of-range false-positive rates are rejected."""
+        with pytest.raises(ValueError):
+            optimal_bloom_parameters(10, 0)
+        with pytest.raises(ValueError):
+            optimal_bloom_parameters(10, 1.5)
+
+    def test_sized_filter_false_positive_rate(self):
+        """A filter sized for its contents stays close to the target rate."""
+        size, hash_count = optimal_bloom_parameters(200, 0.01)
+        bloom = BloomFilter(size=size, hash_count=hash_count)
+        for i in range(200):
+            bloom.add(f"sender_{i}")
+        false_positives = sum(1 for i in range(5000) if f"other_{i}" in bloom)
+        assert false_positives / 5000 < 0.03
+
+    def test_count_set_bits_without_decompressing(self):
+        """Popcount works in both storage modes and keeps the filter compressed."""
+        bloom = BloomFilter(size=4096, hash_count=3)
+        for i in range(10):
+            bloom.add(f"item_{i}")
+        uncompressed_count = bloom.count_set_bits()
+        assert uncompressed_count == bloom.bit_array.count()
+
+        bloom.compress()
+        assert bloom.count_set_bits() == uncompressed_count
+        assert bloom.get_statistics()['set_bits'] == uncompressed_count
+        assert bloom.compressed
+
+
 class TestBloomFilterAdvanced:
     """Test suite for advanced Bloom filter functionality."""
         
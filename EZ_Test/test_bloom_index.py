@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the chain-level Bloom filter index.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.Block import Block
+    from EZ_Main_Chain.BloomIndex import ChainBloomIndex, build_chain_bloom_index
+    from EZ_Block_Units.Bloom import BloomFilter, optimal_bloom_parameters
+except ImportError as e:
+    print(f"Error importing BloomIndex: {e}")
+    sys.exit(1)
+
+
+def make_block(index, senders, bloom_size=4096, bloom_hash_count=5):
+    block = Block(index=index, m_tree_root=f"root_{index}", miner="miner",
+                  pre_hash=f"prev_{index}", bloom_size=bloom_size, bloom_hash_count=bloom_hash_count)
+    for sender in senders:
+        block.add_item_to_bloom(sender)
+    return block
+
+
+@pytest.fixture
+def chain_blocks():
+    """Fixture for blocks with a known sender layout."""
+    blocks = []
+    for i in range(40):
+        senders = [f"sender_{i % 7}", f"sender_{(i * 3) % 11}"]
+        blocks.append(make_block(i, senders))
+    return blocks
+
+
+class TestChainBloomIndexBasic:
+    """Test suite for basic index queries."""
+
+    def test_matches_per_block_scan(self, chain_blocks):
+        """Index results equal a block-by-block is_in_bloom scan."""
+        index = build_chain_bloom_index(chain_blocks, segment_size=16)
+        assert len(index) == len(chain_blocks)
+        for sender in [f"sender_{i}" for i in range(12)] + ["unknown"]:
+            expected = [b.get_index() for b in chain_blocks if b.is_in_bloom(sender)]
+            assert index.query(sender) == expected
+
+    def test_height_range(self, chain_blocks):
+        """Queries are restricted to the requested inclusive height range."""
+        index = build_chain_bloom_index(chain_blocks, segment_size=16)
+        expected = [b.get_index() for b in chain_blocks[10:35] if b.is_in_bloom("sender_3")]
+        assert index.query("sender_3", 10, 34) == expected
+        assert index.query("sender_3", 20, 10) == []
+
+    def test_query_many(self, chain_blocks):
+        """Several addresses can be resolved in one call."""
+        index = build_chain_bloom_index(chain_blocks)
+        result = index.query_many(["sender_1", "sender_2"])
+        assert set(result) == {"sender_1", "sender_2"}
+        assert result["sender_1"] == index.query("sender_1")
+
+    def test_empty_index(self):
+        """An empty index returns no candidates."""
+        index = ChainBloomIndex()
+        assert index.query("sender_0") == []
+        assert len(index) == 0
+
+    def test_invalid_segment_size(self):
+        """Segment size must be positive."""
+        with pytest.raises(ValueError):
+            ChainBloomIndex(segment_size=0)
+
+
+class TestChainBloomIndexMaintenance:
+    """Test suite for index updates."""
+
+    def test_mixed_bloom_parameters(self):
+        """Blocks with right-sized filters of different parameters are indexed together."""
+        blocks = []
+        for i, count in enumerate([1, 5, 20, 5]):
+            senders = [f"s_{i}_{j}" for j in range(count)] + ["shared"]
+            size, hash_count = optimal_bloom_parameters(len(senders))
+            blocks.append(make_block(i, senders, size, hash_count))
+        index = build_chain_bloom_index(blocks)
+        assert index.query("shared") == [0, 1, 2, 3]
+        assert 2 in index.query("s_2_19")
+
+    def test_compressed_blooms_stay_compressed(self, chain_blocks):
+        """Indexing reads compressed filters without decompressing them."""
+        for block in chain_blocks:
+            block.get_bloom().compress()
+        index = build_chain_bloom_index(chain_blocks)
+        assert all(block.get_bloom().compressed for block in chain_blocks)
+        expected = [b.get_index() for b in chain_blocks if b.is_in_bloom("sender_4")]
+        assert index.query("sender_4") == expected
+
+    def test_remove_and_replace(self, chain_blocks):
+        """Removing or re-adding a height updates query results."""
+        index = build_chain_bloom_index(chain_blocks[:5], segment_size=4)
+        assert 2 in index.query("sender_2")
+        assert index.remove_block(2)
+        assert 2 not in index
+        assert 2 not in index.query("sender_2")
+        assert not index.remove_block(2)
+
+        index.add_block(make_block(3, ["replacement"]))
+        assert index.query("replacement") == [3]
+        assert 3 not in index.query("sender_3")
+        assert len(index) == 4
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ColumnarValueCollection, the columnar value store, and its
+parity with AccountValueCollection.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Value.ColumnarValueCollection import ColumnarValueCollection
+    from EZ_Value.AccountValueCollection import AccountValueCollection
+    from EZ_Value.AccountPickValues import AccountPickValues
+    from EZ_Value.Value import Value, ValueState
+except ImportError as e:
+    print(f"Error importing ColumnarValueCollection: {e}")
+    sys.exit(1)
+
+
+def _spans(values):
+    return [(v.begin_index, v.end_index, v.value_num, v.state) for v in values]
+
+
+@pytest.fixture(params=[AccountValueCollection, ColumnarValueCollection], ids=["linked", "columnar"])
+def collection(request):
+    """Fixture: both backends holding the same five values."""
+    collection = request.param("0x1234567890abcdef")
+    for i, state in enumerate([ValueState.UNSPENT, ValueState.SELECTED, ValueState.LOCAL_COMMITTED,
+                               ValueState.CONFIRMED, ValueState.UNSPENT]):
+        collection.add_value(Value(hex(0x1000 * (i + 1)), 100 * (i + 1), state))
+    return collection
+
+
+class TestBackendParity:
+    """Both backends give the same answers through the shared interface."""
+
+    def test_queries(self, collection):
+        assert len(collection) == 5
+        assert collection.get_balance_by_state(ValueState.UNSPENT) == 600
+        assert collection.get_balance_by_state(ValueState.CONFIRMED) == 400
+        assert collection.get_total_balance() == 1500
+        assert collection.count_by_state(ValueState.UNSPENT) == 2
+        assert sorted(v.begin_index for v in collection.find_by_state(ValueState.UNSPENT)) == ["0x1000", "0x5000"]
+        assert [v.begin_index for v in collection.find_by_range(0x2000, 0x3000)] == ["0x2000", "0x3000"]
+        assert [v.begin_index for v in collection.find_intersecting_values(Value("0x4100", 0x1000))] == [
+            "0x4000", "0x5000"]
+        assert Value("0x3000", 300) in collection and Value("0x3000", 299) not in collection
+        assert collection.validate_no_overlap()
+
+    def test_split_keeps_order(self, collection):
+        collection.add_value(Value("0x10", 5), position="beginning")
+        node_id = collection.find_node_id(Value("0x2000", 200))
+        v1, v2 = collection.split_value(node_id, 50)
+        assert (v1.begin_index, v1.value_num, v2.begin_index, v2.value_num) == ("0x2000", 150, "0x2096", 50)
+        assert v2.state == ValueState.SELECTED
+        assert [v.begin_index for v in collection] == ["0x10", "0x1000", "0x2000", "0x2096", "0x3000",
+                                                        "0x4000", "0x5000"]
+        assert collection.get_total_balance() == 1505 and collection.validate_no_overlap()
+        assert collection.split_value(node_id, 0) == (None, None)
+        assert collection.split_value(node_id, 150) == (None, None)
+        assert collection.split_value(10 ** 9, 1) == (None, None)
+
+    def test_state_updates_and_cleanup(self, collection):
+        node_id = collection.find_node_id(Value("0x1000", 100))
+        assert collection.update_value_state(node_id, ValueState.CONFIRMED)
+        assert collection.get_value(node_id).state == ValueState.CONFIRMED
+        collection.clear_spent_values()
+        assert len(collection) == 3 and collection.count_by_state(ValueState.CONFIRMED) == 0
+        assert [v.begin_index for v in collection.get_all_values()] == ["0x2000", "0x3000", "0x5000"]
+        assert not collection.remove_value(node_id)
+        assert collection.get_value(node_id) is None
+
+    def test_overlap_detection(self, collection):
+        collection.add_value(Value("0x1050", 2))
+        assert not collection.validate_no_overlap()
+        assert _spans(collection.get_values_sorted_by_begin_index())[:2] == [
+            ("0x1000", "0x1063", 100, ValueState.UNSPENT), ("0x1050", "0x1051", 2, ValueState.UNSPENT)]
+
+    def test_remove_head_and_tail(self, collection):
+        all_values = collection.get_all_values()
+        for value in (all_values[0], all_values[-1]):
+            assert collection.remove_value(collection.find_node_id(value))
+        assert [v.begin_index for v in collection] == ["0x2000", "0x3000", "0x4000"]
+        collection.add_value(Value("0x9000", 1))
+        assert [v.begin_index for v in collection][-1] == "0x9000"
+
+    def test_invalid_position(self, collection):
+        with pytest.raises(ValueError):
+            collection.add_value(Value("0x9000", 1), position="middle")
+
+
+class TestColumnarValueCollection:
+    """Columnar-specific behaviour: slots, growth and wide indexes."""
+
+    def test_free_slots_are_reused(self):
+        collection = ColumnarValueCollection("alice", capacity=2)
+        for i in range(5):
+            collection.add_value(Value(hex(0x100 + i * 0x10), 10))
+        assert len(collection._state) >= 5
+        node_id = collection.find_node_id(Value("0x120", 10))
+        collection.remove_value(node_id)
+        collection.add_value(Value("0x900", 10))
+        assert collection.find_node_id(Value("0x900", 10)) == node_id
+        assert collection._used == 5 and len(collection) == 5
+
+    def test_returned_values_are_copies(self):
+        collection = ColumnarValueCollection("alice")
+        collection.add_value(Value("0x100", 10))
+        collection.find_by_state(ValueState.UNSPENT)[0].set_state(ValueState.CONFIRMED)
+        assert collection.get_balance_by_state(ValueState.UNSPENT) == 10
+
+    def test_large_balances_do_not_overflow(self):
+        collection = ColumnarValueCollection("alice")
+        num = 1 << 61
+        # overlapping copies: every index fits in int64 but the sum does not
+        for _ in range(40):
+            collection.add_value(Value("0x0", num))
+        assert collection._begin.dtype != object
+        assert collection.get_total_balance() == 40 * num
+        assert not collection.validate_no_overlap()
+
+    def test_indexes_beyond_int64(self):
+        collection = ColumnarValueCollection("alice")
+        collection.add_value(Value("0x100", 10))
+        big = 1 << 259
+        collection.add_value(Value(hex(big), 1000))
+        assert collection._begin.dtype == object
+        assert collection.get_total_balance() == 1010
+        v1, v2 = collection.split_value(collection.find_node_id(Value(hex(big), 1000)), 1)
+        assert v2.begin_index == hex(big + 999)
+        assert collection.validate_no_overlap()
+        collection.add_value(Value(hex(big + 500), 1))
+        assert not collection.validate_no_overlap()
+
+
+class TestAccountPickValuesColumnar:
+    """AccountPickValues runs unchanged on the columnar backend."""
+
+    def test_pick_commit_confirm(self):
+        picker = AccountPickValues("alice", collection_class=ColumnarValueCollection)
+        picker.add_values_from_list([Value(hex(0x1000 * (i + 1)), 100) for i in range(3)])
+        selected, change, change_txn, main_txn = picker.pick_values_for_transaction(150, "alice", "bob", 1, 0)
+        assert sum(v.value_num for v in selected) == 150 and change.value_num == 50
+        assert all(v.state == ValueState.SELECTED for v in selected)
+        assert picker.get_account_balance(ValueState.SELECTED) == 200
+        assert picker.get_account_balance(ValueState.UNSPENT) == 100
+
+        picker.commit_transaction_values(selected)
+        picker.confirm_transaction_values(selected)
+        assert picker.cleanup_confirmed_values() == 2
+        picker.rollback_transaction_selection([change])
+        assert picker.get_total_account_balance() == 150
+        assert picker.validate_account_integrity()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
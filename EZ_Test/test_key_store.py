@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the deterministic simulation/test key store.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Tool_Box.KeyStore import KeyStore, derive_key_pair, shared_key_store
+    from EZ_Transaction.SingleTransaction import Transaction
+    from EZ_Value.Value import Value
+except ImportError as e:
+    print(f"Error importing KeyStore: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture: path of a fresh key store file."""
+    return str(tmp_path / "keys.db")
+
+
+class TestKeyStore:
+    """Test suite for KeyStore."""
+
+    def test_deterministic_derivation(self):
+        assert derive_key_pair("seed", "alice") == derive_key_pair("seed", "alice")
+        assert derive_key_pair("seed", "alice") != derive_key_pair("seed", "bob")
+        assert derive_key_pair("seed", "alice") != derive_key_pair("other", "alice")
+
+    def test_keys_sign_and_verify(self):
+        private_key_pem, public_key_pem = KeyStore().get_key_pair("alice")
+        txn = Transaction("alice", "bob", 1, None, [Value("0x100", 10)], "2024-01-01T00:00:00")
+        txn.sig_txn(private_key_pem)
+        assert txn.check_txn_sig(public_key_pem)
+
+    def test_persisted_and_reloaded(self, db_path):
+        store = KeyStore(db_path, seed="seed")
+        pairs = store.get_key_pairs([f"sender_{i}" for i in range(20)])
+        assert store.stats['generated'] == 20
+        assert store.count() == 20
+        store.close()
+
+        reopened = KeyStore(db_path, seed="seed")
+        assert reopened.get_key_pairs(pairs.keys()) == pairs
+        assert reopened.stats['loaded'] == 20
+        assert reopened.stats['generated'] == 0
+        assert "sender_3" in reopened and "nobody" not in reopened
+
+        reopened.get_key_pair("sender_3")
+        assert reopened.stats['cache_hits'] == 1
+        reopened.close()
+
+    def test_seed_mismatch_rejected(self, db_path):
+        KeyStore(db_path, seed="seed").close()
+        with pytest.raises(ValueError):
+            KeyStore(db_path, seed="another seed")
+
+    def test_in_memory_store(self):
+        store = KeyStore(seed="seed")
+        assert store.get_public_key("alice") == derive_key_pair("seed", "alice")[1]
+        assert store.count() == 1
+
+    def test_shared_key_store(self):
+        assert shared_key_store() is shared_key_store()
+        assert shared_key_store("other") is not shared_key_store()
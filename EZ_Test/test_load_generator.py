@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the open-loop load generator.
+"""
+
+import pytest
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Simulation.LoadGenerator import (LoadConfig, LoadGenerator, LatencySummary, SenderWallet,
+                                             build_schedule, run_load, sender_address)
+    from EZ_Tool_Box.KeyStore import KeyStore
+except ImportError as e:
+    print(f"Error importing LoadGenerator: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture: a short, small load run."""
+    return LoadConfig(num_senders=4, target_rate=40.0, duration=0.5, block_interval=0.2,
+                      key_store_path=str(tmp_path / "keys.db"), workdir=str(tmp_path))
+
+
+class TestSchedule:
+    """Test suite for the arrival schedule."""
+
+    def test_schedule_is_deterministic_and_in_range(self, config):
+        schedule = build_schedule(config)
+        assert schedule == build_schedule(config)
+        offsets = [arrival[0] for arrival in schedule]
+        assert offsets == sorted(offsets) and 0 < offsets[0] and offsets[-1] < config.duration
+        assert [arrival[1] for arrival in schedule] == list(range(len(schedule)))
+        for _, _, sender, requests in schedule:
+            assert 0 <= sender < config.num_senders
+            assert len(requests) == config.recipients_per_batch
+            assert all(1 <= amount <= config.max_amount for _, amount in requests)
+
+    def test_poisson_rate(self):
+        schedule = build_schedule(LoadConfig(target_rate=200.0, duration=20.0))
+        assert 3600 < len(schedule) < 4400
+
+    def test_sender_skew(self):
+        def share_of_first(skew):
+            schedule = build_schedule(LoadConfig(num_senders=50, target_rate=100.0, duration=20.0, sender_skew=skew))
+            return sum(1 for arrival in schedule if arrival[2] == 0) / len(schedule)
+
+        assert share_of_first(0.0) < 0.05
+        assert share_of_first(1.5) > 0.3
+
+
+class TestLatencySummary:
+    """Test suite for LatencySummary."""
+
+    def test_from_samples(self):
+        summary = LatencySummary.from_samples([i / 100 for i in range(1, 101)])
+        assert summary.count == 100
+        assert summary.p50 == pytest.approx(0.51)
+        assert summary.p99 == pytest.approx(1.0)
+        assert summary.max == pytest.approx(1.0)
+
+    def test_empty(self):
+        assert LatencySummary.from_samples([]).count == 0
+
+
+class TestSenderWallet:
+    """Test suite for SenderWallet."""
+
+    def test_wallets_sign_and_never_overlap(self, config):
+        key_store = KeyStore()
+        wallets = [SenderWallet(i, key_store.get_private_key(sender_address(i)), config) for i in range(2)]
+        spent = []
+        for _ in range(20):
+            for i, wallet in enumerate(wallets):
+                multi_txn = wallet.create([("r1", 30), ("r2", 45)])
+                assert multi_txn.check_acc_txn_sig(key_store.get_public_key(sender_address(i)))
+                for txn in multi_txn:
+                    if txn.recipient != txn.sender:
+                        spent.extend((int(v.begin_index, 16), int(v.end_index, 16)) for v in txn.value)
+        spent.sort()
+        assert all(prev[1] < cur[0] for prev, cur in zip(spent, spent[1:]))
+        # settled wallets stay small: spent values are dropped, change is reusable
+        assert all(len(wallet.creator.get_account_values()) < 10 for wallet in wallets)
+
+
+class TestLoadGenerator:
+    """Test suite for LoadGenerator runs."""
+
+    def test_inline_run(self, config):
+        result = run_load(config)
+        assert result.offered > 0
+        assert result.accepted == result.offered
+        assert result.rejected == 0 and result.errors == 0
+        assert result.packaged == result.accepted
+        assert result.ingest_latency.count == result.accepted
+        assert result.package_latency.count == result.packaged
+        assert result.package_latency.p50 >= result.ingest_latency.p50
+        assert result.to_dict()["throughput"] > 0
+
+    def test_aggregate_run(self, config):
+        config.aggregate_signatures = True
+        result = run_load(config)
+        assert result.accepted == result.offered and result.packaged == result.accepted
+
+    def test_worker_run(self, config):
+        config.workers = 2
+        result = run_load(config)
+        assert result.errors == 0
+        assert result.accepted == result.offered
+        assert result.packaged == result.accepted
+
+    def test_invalid_signatures_are_rejected(self, config):
+        generator = LoadGenerator(config)
+        try:
+            generator.public_keys = {address: KeyStore(seed="other").get_public_key(address)
+                                     for address in generator.public_keys}
+            result = generator.run()
+        finally:
+            generator.cleanup()
+        assert result.accepted == 0 and result.rejected == result.offered
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the slotted object layouts and the memory report.
+"""
+
+import pytest
+import sys
+import os
+import copy
+import copyreg
+import pickle
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Value.Value import Value, ValueState
+    from EZ_Value.AccountValueCollection import AccountValueCollection, ValueNode
+    from EZ_Transaction.SingleTransaction import Transaction
+    from EZ_Block_Units.MerkleTree import MerkleTree, MerkleTreeNode
+    from EZ_Block_Units.Proof import ProofUnit
+    from EZ_Simulation.memory_report import build_report, format_report
+except ImportError as e:
+    print(f"Error importing slotted classes: {e}")
+    sys.exit(1)
+
+
+class _LegacyPickle:
+    """Pickles like an instance of cls did while it still had a __dict__ (protocol 0/1 layout)."""
+
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce_ex__(self, protocol):
+        return copyreg._reconstructor, (self.cls, object, None), self.state
+
+
+class TestSlottedLayout:
+    """Test suite for the __slots__ layouts."""
+
+    @pytest.mark.parametrize("obj", [
+        Value("0x100", 10),
+        ValueNode(Value("0x100", 10)),
+        Transaction("alice", "bob", 1, None, [Value("0x100", 10)], "2024-01-01T00:00:00"),
+        MerkleTreeNode(None, None, "hash"),
+        ProofUnit("alice", [], []),
+    ])
+    def test_no_instance_dict(self, obj):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected_attribute = 1
+
+    def test_pickle_and_copy_round_trip(self):
+        txn = Transaction("alice", "bob", 1, b"sig", [Value("0x100", 10, ValueState.SELECTED)],
+                          "2024-01-01T00:00:00")
+        for restored in (pickle.loads(pickle.dumps(txn)), copy.deepcopy(txn), Transaction.decode(txn.encode())):
+            assert restored.tx_hash == txn.tx_hash and restored.signature == b"sig"
+            assert restored.value[0].is_same_value(txn.value[0])
+            assert restored.value[0].state == ValueState.SELECTED
+
+        tree = MerkleTree(["a", "b", "c"])
+        assert pickle.loads(pickle.dumps(tree)).get_root_hash() == tree.get_root_hash()
+
+    def test_legacy_dict_pickles_load(self):
+        value_state = {"begin_index": "0x100", "value_num": 10, "state": ValueState.UNSPENT,
+                       "end_index": "0x109"}
+        value = pickle.loads(pickle.dumps(_LegacyPickle(Value, value_state)))
+        assert isinstance(value, Value) and value.check_value()
+
+        txn = Transaction("alice", "bob", 1, b"sig", [value], "2024-01-01T00:00:00")
+        txn_state = {name: getattr(txn, name) for name in Transaction.__slots__}
+        txn_state["removed_attribute"] = "dropped"
+        restored = pickle.loads(pickle.dumps(_LegacyPickle(Transaction, txn_state)))
+        assert restored.tx_hash == txn.tx_hash
+        assert not hasattr(restored, "removed_attribute")
+
+        unit = pickle.loads(pickle.dumps(_LegacyPickle(ProofUnit, {
+            "owner": "alice", "ownerAccTxnsList": [txn], "ownerMTreePrfList": ["h"]})))
+        assert unit.owner == "alice" and unit.ownerMTreePrfList == ["h"]
+
+
+class TestIntegerNodeIds:
+    """Test suite for integer node ids in AccountValueCollection."""
+
+    def test_ids_are_unique_integers(self):
+        collection = AccountValueCollection("alice")
+        for i in range(5):
+            collection.add_value(Value(hex(0x100 + i * 10), 10))
+        node_id = collection.head.node_id
+        collection.split_value(node_id, 4)
+        node_ids = list(collection._index_map)
+        assert all(isinstance(n, int) and n > 0 for n in node_ids)
+        assert len(set(node_ids)) == collection.size == 6
+        assert collection.remove_value(node_id) and node_id not in collection._index_map
+
+
+class TestMemoryReport:
+    """Test suite for the memory report tool."""
+
+    def test_report(self):
+        rows = {row.name: row for row in build_report(count=50)}
+        assert set(rows) >= {"value", "value_node", "merkle_tree_node"}
+        assert rows["merkle_tree_node"].count == 99
+        for row in rows.values():
+            assert row.bytes_per_object > 0 and row.objects_per_gib > 0
+        # the collection charges each Value plus its node and index entries
+        assert rows["account_value[collection]"].bytes_per_object > (
+            rows["value"].bytes_per_object + rows["value_node"].bytes_per_object)
+        assert "value_node" in format_report(list(rows.values()))
+
+    def test_filter(self):
+        assert [row.name for row in build_report(count=10, name_filter="transaction")] == [
+            "transaction[1 value, signed]"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the metrics registry and the pipeline instrumentation.
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Tool_Box.Metrics import MetricsRegistry, metrics
+    from EZ_Tool_Box.SecureSignature import secure_signature_handler
+    from EZ_Block_Units.Bloom import BloomFilter
+    from EZ_Block_Units.MerkleTree import MerkleTree
+    from EZ_Transaction.CreateMultiTransactions import CreateMultiTransactions
+    from EZ_Transaction_Pool.TransactionPool import TransactionPool
+    from EZ_Value.Value import Value
+except ImportError as e:
+    print(f"Error importing Metrics: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def registry():
+    """Fixture: an enabled, private registry."""
+    return MetricsRegistry(enabled=True)
+
+
+@pytest.fixture
+def shared_metrics():
+    """Fixture: the shared registry, enabled and zeroed for one test."""
+    was_enabled = metrics.enabled
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.enabled = was_enabled
+    metrics.reset()
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    def test_counter(self, registry):
+        counter = registry.counter("a.count")
+        counter.inc()
+        counter.inc(4)
+        assert registry.counter("a.count") is counter
+        assert registry.snapshot()["a.count"] == {'type': 'counter', 'value': 5}
+
+    def test_histogram(self, registry):
+        histogram = registry.histogram("a.sizes")
+        for value in range(1, 101):
+            histogram.observe(value)
+        data = registry.snapshot()["a.sizes"]
+        assert data['count'] == 100 and data['sum'] == 5050
+        assert data['min'] == 1 and data['max'] == 100
+        # bucket estimates are within a factor of two
+        assert 50 <= data['p50'] <= 64
+        assert 99 <= data['p99'] <= 100
+        assert sum(count for _, count in data['buckets']) == 100
+
+    def test_bucket_bounds(self, registry):
+        histogram = registry.histogram("a.bounds")
+        for value, bucket in ((0.5, 0), (1, 0), (1.5, 1), (2, 1), (2.5, 2), (4, 2), (5, 3), (2 ** 60, 48)):
+            assert histogram._bucket(value) == bucket
+
+    def test_timer_and_decorator(self, registry):
+        timer = registry.timer("a.timer")
+        with timer.time():
+            pass
+
+        @registry.timed("a.timer")
+        def work(x):
+            return x * 2
+
+        assert work(21) == 42
+        data = registry.snapshot()["a.timer"]
+        assert data['type'] == 'timer' and data['count'] == 2
+        assert work.__name__ == "work"
+
+    def test_disabled_records_nothing(self):
+        registry = MetricsRegistry()
+        counter, timer = registry.counter("c"), registry.timer("t")
+
+        @registry.timed("t")
+        def work():
+            return "done"
+
+        counter.inc()
+        with timer.time():
+            pass
+        assert work() == "done"
+        assert registry.snapshot() == {}
+        assert set(registry.snapshot(include_empty=True)) == {"c", "t"}
+
+    def test_exceptions_are_still_timed(self, registry):
+        @registry.timed("a.failing")
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fail()
+        assert registry.timer("a.failing").count == 1
+
+    def test_kind_mismatch(self, registry):
+        registry.counter("a.metric")
+        with pytest.raises(ValueError):
+            registry.timer("a.metric")
+
+    def test_reset_prefix_and_export(self, registry, tmp_path):
+        registry.counter("pool.x").inc()
+        registry.timer("merkle.y").observe(0.002)
+        assert set(registry.snapshot(prefix="pool.")) == {"pool.x"}
+        assert "merkle.y" in registry.format_snapshot()
+
+        path = str(tmp_path / "metrics.json")
+        registry.export_json(path)
+        with open(path, encoding="utf-8") as f:
+            assert set(json.load(f)["metrics"]) == {"pool.x", "merkle.y"}
+
+        registry.reset()
+        assert registry.snapshot() == {}
+
+
+class TestPipelineInstrumentation:
+    """The hot paths report into the shared registry when it is enabled."""
+
+    def test_value_merkle_bloom(self, shared_metrics):
+        Value("0x100", 10).split_value(3)
+        MerkleTree(["a", "b", "c"])
+        BloomFilter(1024, 3).add("alice")
+        snapshot = shared_metrics.snapshot()
+        assert snapshot["value.split"]["count"] == 1
+        assert snapshot["merkle.build"]["count"] == 1
+        assert snapshot["merkle.leaves"]["max"] == 3
+        assert snapshot["bloom.insert"]["count"] == 1
+
+    def test_selection_signing_and_pool(self, shared_metrics, tmp_path):
+        private_key_pem, public_key_pem = secure_signature_handler.signer.generate_key_pair()
+        creator = CreateMultiTransactions("alice")
+        creator.value_selector.add_values_from_list([Value("0x1000", 100)])
+        result = creator.create_multi_transactions([{"recipient": "bob", "amount": 30}], private_key_pem)
+
+        pool = TransactionPool(str(tmp_path / "pool.db"))
+        assert pool.add_multi_transactions(result["multi_transactions"], public_key_pem)[0]
+        assert not pool.add_multi_transactions(result["multi_transactions"], public_key_pem)[0]
+        assert pool.remove_multi_transactions(result["multi_transactions"].digest)
+
+        snapshot = shared_metrics.snapshot()
+        assert snapshot["account.pick_values"]["count"] == 1
+        assert snapshot["account.pick_values.selected"]["max"] == 1
+        assert snapshot["signature.sign"]["count"] >= 3
+        assert snapshot["signature.verify"]["count"] >= 1
+        assert snapshot["pool.admission"]["count"] == 2
+        assert snapshot["pool.admitted"]["value"] == 1
+        assert snapshot["pool.duplicates"]["value"] == 1
+        assert snapshot["pool.sqlite.persist"]["count"] == 1
+        assert snapshot["pool.remove"]["count"] == 1
+        assert snapshot["pool.sqlite.mark_processed"]["count"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the proof-of-work block miner.
+"""
+
+import pytest
+import sys
+import os
+import threading
+import datetime
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.Block import Block
+    from EZ_Main_Chain import Miner
+    from EZ_Main_Chain.Miner import BlockMiner, mine_block, meets_difficulty, difficulty_target
+except ImportError as e:
+    print(f"Error importing Miner: {e}")
+    sys.exit(1)
+
+
+def _crashing_worker(*args):
+    os._exit(3)
+
+
+@pytest.fixture
+def block():
+    """Fixture for a block to mine."""
+    blk = Block(index=1, m_tree_root="root_hash", miner="miner_1", pre_hash="prev_hash",
+                bloom_size=1024, bloom_hash_count=3, time=datetime.datetime(2024, 1, 1))
+    blk.add_item_to_bloom("sender_1")
+    return blk
+
+
+class TestDifficulty:
+    """Test suite for difficulty helpers."""
+
+    def test_target(self):
+        assert difficulty_target(0) == 1 << 256
+        assert difficulty_target(8) == 1 << 248
+        with pytest.raises(ValueError):
+            difficulty_target(257)
+
+    def test_meets_difficulty(self):
+        assert meets_difficulty("00" + "f" * 62, 8)
+        assert not meets_difficulty("01" + "0" * 62, 8)
+
+
+class TestBlockMiner:
+    """Test suite for nonce search."""
+
+    def test_inline_mining_matches_block_hash(self, block):
+        """The midstate search finds a nonce whose Block.get_hash meets the target."""
+        result = BlockMiner(difficulty_bits=10).mine(block)
+        assert result.found
+        assert block.nonce == result.nonce
+        assert block.get_hash() == result.block_hash
+        assert meets_difficulty(block.get_hash(), 10)
+        assert result.attempts == result.nonce + 1
+
+    def test_parallel_mining(self, block):
+        """Worker processes find a valid nonce and stop early."""
+        result = mine_block(block, difficulty_bits=10, workers=2)
+        assert result.found
+        assert block.get_hash() == result.block_hash
+        assert meets_difficulty(block.get_hash(), 10)
+        assert result.hash_rate > 0
+
+    def test_exhausted_range(self, block):
+        """An impossible difficulty over a small range reports no solution."""
+        result = BlockMiner(difficulty_bits=64).mine(block, start_nonce=0, max_nonce=999)
+        assert not result.found
+        assert result.attempts == 1000
+        assert block.nonce == 0
+
+    def test_timeout(self, block):
+        """The search stops when the timeout expires."""
+        result = BlockMiner(difficulty_bits=64, check_interval=256).mine(block, timeout=0.2)
+        assert not result.found
+        assert result.elapsed < 5
+
+    def test_cancel_from_other_thread(self, block):
+        """cancel() terminates a running parallel search."""
+        miner = BlockMiner(difficulty_bits=64, workers=2, check_interval=256)
+        timer = threading.Timer(0.3, miner.cancel)
+        timer.start()
+        result = miner.mine(block)
+        timer.join()
+        assert not result.found
+        assert result.cancelled
+        assert result.attempts > 0
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_cancel_while_idle_is_ignored(self, block, workers):
+        """A cancel() issued while no search runs does not abort the next mine() call."""
+        miner = BlockMiner(difficulty_bits=64, workers=workers, check_interval=256)
+        miner.cancel()
+        result = miner.mine(block, max_nonce=999)
+        assert not result.cancelled and result.attempts == 1000
+
+    def test_dead_worker_is_detected(self, block, monkeypatch):
+        """A worker that dies without reporting fails the search instead of hanging it."""
+        monkeypatch.setattr(Miner, "_mining_worker", _crashing_worker)
+        miner = BlockMiner(difficulty_bits=64, workers=2)
+        with pytest.raises(RuntimeError):
+            miner.mine(block, timeout=30)
+
+    def test_invalid_range(self, block):
+        with pytest.raises(ValueError):
+            BlockMiner().mine(block, start_nonce=10, max_nonce=5)
@@ -9,8 +9,6 @@ import os
 import datetime
 import tempfile
 from unittest.mock import patch, MagicMock
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(__file__) + '/..')
@@ -20,10 +18,14 @@ try:
     from EZ_Transaction.MultiTransactions import MultiTransactions
     from EZ_Value.Value import Value
     from EZ_Transaction.SingleTransaction import Transaction
+    from EZ_Tool_Box.KeyStore import KeyStore
 except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
 
+# Seeded, in-memory key store: the same keys every run, derived once per address
+TEST_KEYS = KeyStore()
+
 class TestMultiTransactionsInitialization:
     """Test suite for MultiTransactions class initialization and basic properties."""
     
@@ -251,21 +253,8 @@ class TestMultiTransactionsSignature:
     @pytest.fixture
     def setup_signature(self):
         """Set up test fixtures before each test method."""
-        # Generate test keys
-        self.private_key = ec.generate_private_key(ec.SECP256R1())
-        self.public_key = self.private_key.public_key()
-        
-        # Serialize keys for testing
-        self.private_key_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        
-        self.public_key_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # Seeded test keys from the key store
+        self.private_key_pem, self.public_key_pem = TEST_KEYS.get_key_pair("signer")
         
         self.sender = "0xSender123"
         self.value = [Value("0x1000", 100)]
@@ -311,12 +300,8 @@ class TestMultiTransactionsSignature:
         
     def test_basic_signature_wrong_key(self, setup_signature):
         """Test signature verification with wrong public key."""
-        # Generate a different key
-        wrong_private_key = ec.generate_private_key(ec.SECP256R1())
-        wrong_public_key_pem = wrong_private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # A different key
+        wrong_public_key_pem = TEST_KEYS.get_public_key("other_signer")
         
         # Sign with original key
         self.multi_tx.sig_acc_txn(self.private_key_pem)
@@ -516,16 +501,8 @@ class TestMultiTransactionsPropertyAccess:
         # Initially None
         assert self.multi_tx.signature is None
         
-        # Generate test key for signing
-        from cryptography.hazmat.primitives.asymmetric import ec
-        from cryptography.hazmat.primitives import serialization
-        
-        private_key = ec.generate_private_key(ec.SECP256R1())
-        private_key_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        # Seeded test key for signing
+        private_key_pem = TEST_KEYS.get_private_key("signer")
         
         # After signing
         self.multi_tx.sig_acc_txn(private_key_pem)
@@ -537,21 +514,8 @@ class TestMultiTransactionsSecureSignature:
     @pytest.fixture
     def setup_secure_signature(self):
         """Set up test fixtures for secure signature testing."""
-        # Generate test keys
-        self.private_key = ec.generate_private_key(ec.SECP256R1())
-        self.public_key = self.private_key.public_key()
-        
-        # Serialize keys for testing
-        self.private_key_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        
-        self.public_key_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # Seeded test keys from the key store
+        self.private_key_pem, self.public_key_pem = TEST_KEYS.get_key_pair("signer")
         
         self.sender = "0xSender123"
         self.value = [Value("0x1000", 100)]
@@ -617,12 +581,8 @@ class TestMultiTransactionsSecureSignature:
             
     def test_secure_signature_different_keys(self, setup_secure_signature):
         """Test secure signature with different key pairs."""
-        # Generate a different key pair
-        different_private_key = ec.generate_private_key(ec.SECP256R1())
-        different_public_key_pem = different_private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # A different key pair
+        different_public_key_pem = TEST_KEYS.get_public_key("other_signer")
         
         # Sign with original key
         self.multi_tx.sig_acc_txn(self.private_key_pem)
@@ -701,4 +661,58 @@ class TestMultiTransactionsSecureSignature:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+class TestMultiTransactionsAggregateSignature:
+    """Test suite for aggregate (Merkle root) signing of MultiTransactions."""
+    
+    @pytest.fixture
+    def setup_aggregate(self):
+        """Set up test fixtures for aggregate signature testing."""
+        self.private_key_pem, self.public_key_pem = TEST_KEYS.get_key_pair("signer")
+        self.sender = "0xSender123"
+        self.multi_tx = MultiTransactions(
+            sender=self.sender,
+            multi_txns=[Transaction.new_transaction(self.sender, f"0xRecipient{i}", [Value(hex(0x1000 + i * 100), 100)], i)
+                        for i in range(5)]
+        )
+    
+    def test_aggregate_sign_and_verify(self, setup_aggregate):
+        """Test that one signature covers every unsigned inner transaction."""
+        self.multi_tx.sig_acc_txn_aggregate(self.private_key_pem)
+        
+        assert self.multi_tx.is_aggregate
+        assert all(txn.signature is None for txn in self.multi_tx.multi_txns)
+        assert self.multi_tx.check_acc_txn_sig(self.public_key_pem) is True
+    
+    def test_tampered_inner_transaction_fails(self, setup_aggregate):
+        """Test that changing an inner transaction breaks the aggregate signature."""
+        self.multi_tx.sig_acc_txn_aggregate(self.private_key_pem)
+        self.multi_tx.multi_txns[2].recipient = "0xMallory"
+        
+        assert self.multi_tx.check_txns_root() is False
+        assert self.multi_tx.check_acc_txn_sig(self.public_key_pem) is False
+    
+    def test_inclusion_proof(self, setup_aggregate):
+        """Test that an inner transaction is proven by inclusion in txns_root."""
+        self.multi_tx.sig_acc_txn_aggregate(self.private_key_pem)
+        proof = self.multi_tx.get_txn_inclusion_proof(3)
+        
+        assert MultiTransactions.check_txn_inclusion(self.multi_tx.multi_txns[3], proof, self.multi_tx.txns_root)
+        assert not MultiTransactions.check_txn_inclusion(self.multi_tx.multi_txns[1], proof, self.multi_tx.txns_root)
+    
+    def test_encode_decode_keeps_root(self, setup_aggregate):
+        """Test that encoding preserves the aggregate root."""
+        self.multi_tx.sig_acc_txn_aggregate(self.private_key_pem)
+        decoded = MultiTransactions.decode(self.multi_tx.encode())
+        
+        assert decoded.txns_root == self.multi_tx.txns_root
+        assert decoded.check_acc_txn_sig(self.public_key_pem) is True
+    
+    def test_resign_per_transaction_clears_root(self, setup_aggregate):
+        """Test that a regular signature replaces an aggregate one."""
+        self.multi_tx.sig_acc_txn_aggregate(self.private_key_pem)
+        self.multi_tx.sig_acc_txn(self.private_key_pem)
+        
+        assert not self.multi_tx.is_aggregate
+        assert self.multi_tx.check_acc_txn_sig(self.public_key_pem) is True
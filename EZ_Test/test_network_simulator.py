@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-process multi-node network simulator.
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Simulation.NetworkSimulator import (NetworkConfig, NetworkSimulator, InMemoryTransport,
+                                                build_topology, run_network_simulation,
+                                                MSG_BLOCK, MSG_PROOF, MSG_TXN, MSG_VPB)
+except ImportError as e:
+    print(f"Error importing NetworkSimulator: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Fixture: a small network with a few blocks of traffic."""
+    return NetworkConfig(num_nodes=12, num_miners=3, peer_degree=4, tx_rate=10.0, duration=3.0,
+                         block_interval=1.0, key_store_path=str(tmp_path / "keys.db"), workdir=str(tmp_path))
+
+
+class TestTopology:
+    """Test suite for build_topology."""
+
+    @pytest.mark.parametrize("num_nodes", [1, 2, 3, 10, 200])
+    def test_connected_and_symmetric(self, num_nodes):
+        peers = build_topology(num_nodes, 8, seed=1)
+        assert len(peers) == num_nodes
+        for node, node_peers in enumerate(peers):
+            assert node not in node_peers
+            assert all(node in peers[peer] for peer in node_peers)
+        reached, frontier = {0}, [0]
+        while frontier:
+            frontier = [peer for node in frontier for peer in peers[node] if peer not in reached]
+            reached.update(frontier)
+        assert len(reached) == num_nodes
+
+    def test_deterministic(self):
+        assert build_topology(50, 6, seed=3) == build_topology(50, 6, seed=3)
+        assert build_topology(50, 6, seed=3) != build_topology(50, 6, seed=4)
+
+
+class TestInMemoryTransport:
+    """Test suite for InMemoryTransport."""
+
+    def test_latency_and_bandwidth(self):
+        delivered = []
+        config = NetworkConfig(num_nodes=3, latency=0.1, latency_jitter=0.0, bandwidth=1000.0)
+        transport = InMemoryTransport(config, lambda at, dst, src, kind, payload: delivered.append((at, dst)))
+        assert transport.send(0.0, 0, 1, MSG_BLOCK, None, 500) == pytest.approx(0.6)
+        # the second message waits for the uplink
+        assert transport.send(0.0, 0, 2, MSG_BLOCK, None, 500) == pytest.approx(1.1)
+        # another node's uplink is independent
+        assert transport.send(0.0, 1, 2, MSG_BLOCK, None, 100) == pytest.approx(0.2)
+        assert transport.send(0.5, 2, 2, MSG_VPB, None, 100) == 0.5
+        assert transport.stats[MSG_BLOCK] == {'messages': 3, 'bytes': 1100}
+        assert MSG_VPB not in transport.stats
+        assert len(delivered) == 4
+
+    def test_link_latency_is_symmetric_and_bounded(self):
+        config = NetworkConfig(num_nodes=10, latency=0.1, latency_jitter=0.5)
+        transport = InMemoryTransport(config, lambda *args: None)
+        for src in range(10):
+            for dst in range(10):
+                if src != dst:
+                    assert transport.link_latency(src, dst) == transport.link_latency(dst, src)
+                    assert 0.1 <= transport.link_latency(src, dst) <= 0.15
+
+
+class TestNetworkSimulator:
+    """Test suite for NetworkSimulator runs."""
+
+    def test_everything_is_confirmed(self, config):
+        simulator = NetworkSimulator(config)
+        try:
+            result = simulator.run()
+            assert result.offered > 0 and result.errors == 0 and result.rejections == 0
+            assert result.admitted == result.offered
+            assert result.included == result.admitted
+            assert result.confirmed == result.included
+            assert result.duplicate_inclusions == 0
+            # every node holds the same main chain and miners' pools drained
+            tips = {node.chain.get_tip_hash() for node in simulator.nodes}
+            assert len(tips) == 1
+            assert simulator.nodes[0].chain.get_height() == result.blocks
+            assert all(not node.pool.pool for node in simulator.nodes if node.has_pool)
+            assert not any(node.has_pool for node in simulator.nodes if not node.is_miner)
+        finally:
+            simulator.cleanup()
+
+    def test_propagation_and_sizes(self, config):
+        simulator = NetworkSimulator(config)
+        try:
+            result = simulator.run()
+            senders = [arrival[2] for arrival in simulator.schedule]
+        finally:
+            simulator.cleanup()
+        assert result.block_full_propagation.count == result.blocks
+        assert 0 < result.block_half_propagation.max <= result.block_full_propagation.max
+        assert result.block_receipt_delay.count == result.blocks * config.num_nodes
+        assert result.confirmation_latency.p50 >= result.inclusion_latency.p50
+        assert result.vpb_transfers > 0 and result.vpb_size.count == result.vpb_transfers
+        # a miner's own transactions, proofs and VPBs to itself never touch the network
+        assert result.vpb_bytes >= result.network[MSG_VPB]['bytes'] > 0
+        assert result.network[MSG_TXN]['messages'] == sum(
+            config.num_miners - (sender < config.num_miners) for sender in senders)
+        assert result.network[MSG_PROOF]['messages'] <= result.included
+
+    def test_rerun_is_deterministic(self, config):
+        first = run_network_simulation(config)
+        second = run_network_simulation(config)
+        for name in ("offered", "admitted", "included", "blocks", "confirmed", "vpb_transfers"):
+            assert getattr(first, name) == getattr(second, name)
+        assert first.network[MSG_BLOCK]['messages'] == second.network[MSG_BLOCK]['messages']
+        assert first.inclusion_latency.p50 == pytest.approx(second.inclusion_latency.p50, abs=1e-3)
+
+    def test_slow_links_fork_but_converge(self, config):
+        config.latency = 0.8
+        config.block_interval = 0.5
+        result = run_network_simulation(config)
+        assert result.errors == 0
+        # miners build on stale tips, so the same MultiTransactions lands in competing blocks
+        assert result.duplicate_inclusions > 0
+        assert result.included == result.admitted
+        assert result.confirmed == result.included
+
+    def test_export(self, config, tmp_path):
+        result = run_network_simulation(config)
+        path = str(tmp_path / "net.json")
+        result.save_json(path, config)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["result"]["confirmed"] == result.confirmed
+        assert data["config"]["num_nodes"] == config.num_nodes
+
+    def test_invalid_miner_count(self, config):
+        config.num_miners = 0
+        with pytest.raises(ValueError):
+            NetworkSimulator(config)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the binary VPB proof bundle encoding.
+"""
+
+import pytest
+import sys
+import os
+import io
+import pickle
+import builtins
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Block_Units.ProofBundle import (ProofBundleWriter, iter_proof_bundle,
+                                            encode_vpb_bundle, decode_vpb_bundle, BUNDLE_MAGIC)
+    from EZ_Block_Units.VPBVerifier import VPBVerifier
+    from EZ_Block_Units.Proof import Proof, ProofUnit
+    from EZ_Block_Units.MerkleProof import MerkleTreeProof
+    from EZ_Value.Value import Value, ValueState
+    from EZ_Test.test_vpb_verifier import ChainBuilder, make_multi_txn, VALUE
+except ImportError as e:
+    print(f"Error importing ProofBundle: {e}")
+    sys.exit(1)
+
+
+@pytest.fixture
+def shared_history():
+    """Fixture: several values moved together alice -> bob -> carol, sharing proof units."""
+    builder = ChainBuilder()
+    values = [Value(hex(0x1000 + i * 100), 100) for i in range(8)]
+    a_to_b = make_multi_txn("alice", [("bob", values)])
+    b_to_c = make_multi_txn("bob", [("carol", values)])
+    builder.add_block([a_to_b] + [make_multi_txn(f"noise_{i}", [("x", [Value("0x1", 1)])]) for i in range(7)])
+    builder.add_block([b_to_c, make_multi_txn("noise_9", [("x", [Value("0x2", 1)])])])
+    vpbs = []
+    for value in values:
+        unit_a, h_a = builder.unit(a_to_b)
+        unit_b, h_b = builder.unit(b_to_c)
+        vpbs.append((value, Proof([unit_a, unit_b]), [h_a, h_b]))
+    return builder, vpbs
+
+
+class _UnpickleProbe:
+    """Records that it was unpickled; a bundle reader must never get that far."""
+
+    def __reduce__(self):
+        return exec, ("import builtins; builtins._ez_bundle_unpickled = True",)
+
+
+def unit_summary(unit):
+    prf = unit.ownerMTreePrfList
+    prf = prf.mt_prf_list if isinstance(prf, MerkleTreeProof) else prf
+    return unit.owner, unit.ownerAccTxnsList.digest, list(prf)
+
+
+class TestProofBundle:
+    """Test suite for encoding and decoding VPB bundles."""
+
+    def test_roundtrip(self, shared_history):
+        _, vpbs = shared_history
+        decoded = decode_vpb_bundle(encode_vpb_bundle(vpbs))
+        assert len(decoded) == len(vpbs)
+        for (value, proof, heights), (d_value, d_proof, d_heights) in zip(vpbs, decoded):
+            assert d_value.is_same_value(value)
+            assert d_value.state == value.state
+            assert d_heights == heights
+            assert [unit_summary(u) for u in d_proof.prfList] == [unit_summary(u) for u in proof.prfList]
+
+    def test_units_are_shared(self, shared_history):
+        """Units written once decode to one shared object."""
+        _, vpbs = shared_history
+        decoded = decode_vpb_bundle(encode_vpb_bundle(vpbs))
+        assert all(d[1].prfList[0] is decoded[0][1].prfList[0] for d in decoded)
+
+    def test_smaller_than_pickle(self, shared_history):
+        """The bundle is far smaller than pickling each VPB, and smaller than one shared pickle."""
+        _, vpbs = shared_history
+        encoded_size = len(encode_vpb_bundle(vpbs))
+        assert encoded_size * 5 < sum(len(pickle.dumps(vpb)) for vpb in vpbs)
+        assert encoded_size < len(pickle.dumps(vpbs))
+
+    def test_transactions_roundtrip(self, shared_history):
+        """Decoded MultiTransactions keep digest, time and transaction hashes."""
+        _, vpbs = shared_history
+        original = vpbs[0][1].prfList[0].ownerAccTxnsList
+        decoded = decode_vpb_bundle(encode_vpb_bundle(vpbs))[0][1].prfList[0].ownerAccTxnsList
+        assert decoded.digest == original.digest
+        assert decoded.time == original.time
+        assert decoded.sender == original.sender
+        assert [t.tx_hash for t in decoded] == [t.tx_hash for t in original]
+
+    def test_decoded_bundle_verifies(self, shared_history):
+        builder, vpbs = shared_history
+        verifier = VPBVerifier(builder.chain)
+        for vpb in decode_vpb_bundle(encode_vpb_bundle(vpbs)):
+            result = verifier.verify_vpb(vpb, recipient="carol")
+            assert result.is_valid, result.error_message
+
+    def test_streaming(self, shared_history):
+        """VPBs can be written and read incrementally."""
+        _, vpbs = shared_history
+        stream = io.BytesIO()
+        writer = ProofBundleWriter(stream)
+        for vpb in vpbs[:3]:
+            writer.write_vpb(vpb)
+        writer.close()
+        stream.seek(0)
+        iterator = iter_proof_bundle(stream)
+        assert next(iterator)[0].is_same_value(vpbs[0][0])
+        assert len(list(iterator)) == 2
+
+    def test_non_hash_items_and_states(self):
+        multi_txn = make_multi_txn("owner", [("bob", [Value("0xff", 3)])])
+        unit = ProofUnit("owner", multi_txn, ["not-a-hash", "f" * 64])
+        vpb = (Value("0xff", 3, ValueState.CONFIRMED), Proof([unit]), [5])
+        value, proof, heights = decode_vpb_bundle(encode_vpb_bundle([vpb]))[0]
+        assert value.state == ValueState.CONFIRMED
+        assert proof.prfList[0].ownerMTreePrfList == ["not-a-hash", "f" * 64]
+        assert heights == [5]
+
+    def test_rejects_unencodable_transactions(self):
+        """Units whose transactions have no compact encoding are refused instead of pickled."""
+        unit = ProofUnit("owner", ["raw"], ["f" * 64])
+        with pytest.raises(ValueError):
+            encode_vpb_bundle([(Value("0xff", 3), Proof([unit]), [5])])
+
+    def test_rejects_pickled_transactions(self):
+        """The retired pickle kind is refused without unpickling the payload."""
+        payload = pickle.dumps(_UnpickleProbe())
+        assert len(payload) < 0x80
+        data = BUNDLE_MAGIC + bytes((3, 1, len(payload))) + payload
+        with pytest.raises(ValueError):
+            decode_vpb_bundle(data)
+        assert not hasattr(builtins, "_ez_bundle_unpickled")
+
+    def test_digest_derived_from_transactions(self, shared_history):
+        """A digest is never read from the bundle, so edited transactions cannot keep the old one."""
+        builder, vpbs = shared_history
+        original = vpbs[0][1].prfList[0].ownerAccTxnsList
+        original.digest = "0" * 64  # a stale digest is not written either
+        data = encode_vpb_bundle(vpbs)
+        decoded = decode_vpb_bundle(data)[0][1].prfList[0].ownerAccTxnsList
+        assert decoded.digest == decoded.compute_digest() == original.compute_digest()
+
+        tampered = decode_vpb_bundle(data.replace(b"\x03bob", b"\x03eve"))
+        assert tampered[0][1].prfList[0].ownerAccTxnsList.multi_txns[0].recipient == "eve"
+        result = VPBVerifier(builder.chain).verify_vpb(tampered[0], recipient="carol")
+        assert not result.is_valid
+
+    def test_anchor_roundtrip(self, shared_history):
+        """Pruned proofs keep their anchor through the bundle."""
+        _, vpbs = shared_history
+        value, proof, heights = vpbs[0]
+        proof.prune_prefix(1, heights[1])
+        del heights[:1]
+        decoded = decode_vpb_bundle(encode_vpb_bundle([vpbs[0], vpbs[1]]))
+        assert decoded[0][1].anchor == proof.anchor
+        assert decoded[0][2] == heights
+        assert decoded[1][1].anchor is None
+
+    def test_aggregate_root_roundtrip(self):
+        """An aggregate-signed MultiTransactions decodes with its txns_root and aggregate digest."""
+        multi_txn = make_multi_txn("alice", [("bob", [Value("0x100", 10)]), ("carol", [Value("0x200", 10)])])
+        multi_txn.txns_root = multi_txn.compute_txns_root()
+        multi_txn.set_digest()
+        vpb = (Value("0x100", 10), Proof([ProofUnit("alice", multi_txn, ["a" * 64])]), [1])
+        decoded = decode_vpb_bundle(encode_vpb_bundle([vpb]))[0][1].prfList[0].ownerAccTxnsList
+        assert decoded.txns_root == multi_txn.txns_root
+        assert decoded.check_txns_root()
+        assert decoded.digest == multi_txn.digest
+
+    def test_rejects_bad_input(self, shared_history):
+        _, vpbs = shared_history
+        data = encode_vpb_bundle(vpbs)
+        with pytest.raises(ValueError):
+            decode_vpb_bundle(data[:-10])
+        with pytest.raises(ValueError):
+            decode_vpb_bundle(b"XXXX" + data[4:])
@@ -21,8 +21,15 @@ from EZ_Tool_Box.SecureSignature import (
     SecureTransactionSignature,
     secure_signature_handler
 )
+import EZ_Tool_Box.SecureSignature as secure_signature_module
+from EZ_Transaction.SingleTransaction import Transaction
+from EZ_Transaction.MultiTransactions import MultiTransactions
+from EZ_Value.Value import Value
+from EZ_Tool_Box.KeyStore import KeyStore
 from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization
+
+# Seeded, in-memory key store: the same keys every run, derived once per address
+TEST_KEYS = KeyStore()
 
 
 class TestSecureMemoryHandler:
@@ -60,13 +67,8 @@ class TestSecureMemoryHandler:
     
     def test_secure_load_private_key_context_manager(self):
         """Test the secure private key context manager."""
-        # Generate a test key pair
-        private_key = ec.generate_private_key(ec.SECP256R1())
-        private_key_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        # A seeded test key pair
+        private_key_pem = TEST_KEYS.get_private_key("signer")
         
         # Test the context manager
         with SecureMemoryHandler.secure_load_private_key(private_key_pem) as key_obj:
@@ -361,6 +363,145 @@ class TestSecureTransactionSignature:
         assert self.secure_signer._security_warnings_enabled is True
 
 
+class TestSigningSession:
+    """Test suite for TransactionSigner.signing_session."""
+    
+    TXN_TIME = "2024-01-01T00:00:00"
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.signer = TransactionSigner()
+        self.private_key_pem, self.public_key_pem = self.signer.generate_key_pair()
+    
+    def _make_transactions(self, count):
+        return [Transaction("alice", f"recipient_{i}", i, None, [Value(hex(0x1000 + i * 10), 10)], self.TXN_TIME)
+                for i in range(count)]
+    
+    def test_key_loaded_once_for_batch(self, monkeypatch):
+        """Test that a batch of signatures parses the private key only once."""
+        loads = []
+        original_load = secure_signature_module.load_pem_private_key
+        
+        def counting_load(*args, **kwargs):
+            loads.append(1)
+            return original_load(*args, **kwargs)
+        
+        monkeypatch.setattr(secure_signature_module, "load_pem_private_key", counting_load)
+        transactions = self._make_transactions(5)
+        multi_txn = MultiTransactions("alice", transactions)
+        
+        with self.signer.signing_session(self.private_key_pem) as session:
+            assert session.sign_batch(transactions + [multi_txn]) == 6
+            assert session.signatures == 6
+        
+        assert len(loads) == 1
+        assert session.closed
+    
+    def test_session_signatures_verify(self):
+        """Test that session signatures verify like per-call signatures."""
+        transactions = self._make_transactions(3)
+        multi_txn = MultiTransactions("alice", transactions)
+        
+        with self.signer.signing_session(self.private_key_pem) as session:
+            for txn in transactions:
+                session.sign_transaction(txn)
+            session.sign_multi_transactions(multi_txn)
+        
+        assert all(txn.check_txn_sig(self.public_key_pem) for txn in transactions)
+        assert multi_txn.check_acc_txn_sig(self.public_key_pem)
+        
+        # Same digest as the per-call signing path
+        reference = MultiTransactions("alice", transactions)
+        reference.time = multi_txn.time
+        reference.sig_acc_txn(self.private_key_pem)
+        assert reference.digest == multi_txn.digest
+    
+    def test_session_closed_after_exit(self):
+        """Test that a closed session refuses to sign."""
+        with self.signer.signing_session(self.private_key_pem) as session:
+            pass
+        with pytest.raises(RuntimeError):
+            session.sign_digest(bytes(32))
+    
+    def test_session_closed_on_error(self):
+        """Test that the session is closed when the block raises."""
+        with pytest.raises(KeyError):
+            with self.signer.signing_session(self.private_key_pem) as session:
+                raise KeyError("boom")
+        assert session.closed
+    
+    def test_invalid_inputs(self):
+        """Test session input validation."""
+        with pytest.raises(ValueError):
+            with self.signer.signing_session(b""):
+                pass
+        with self.signer.signing_session(self.private_key_pem) as session:
+            with pytest.raises(ValueError):
+                session.sign_digest(b"not a digest")
+            with pytest.raises(ValueError):
+                session.sign_multi_transactions(MultiTransactions("alice", []))
+            with pytest.raises(ValueError):
+                session.sign_transaction(Transaction("alice", "bob", 1, None, [Value("0x10", 1)], None))
+    
+    def test_handler_session_warns_once(self):
+        """Test that the high-level handler warns once per session."""
+        transactions = self._make_transactions(3)
+        with pytest.warns(UserWarning) as record:
+            with secure_signature_handler.signing_session(self.private_key_pem) as session:
+                session.sign_batch(transactions)
+        assert len(record) == 1
+
+
+class TestPrehashedSigning:
+    """Test suite for prehashed signing over transaction digests."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.signer = TransactionSigner()
+        self.private_key_pem, self.public_key_pem = self.signer.generate_key_pair()
+        self.txn = Transaction("alice", "bob", 7, None, [Value("0x1000", 100)], "2024-01-01T00:00:00")
+    
+    def test_sign_and_verify_digest(self):
+        """Test that a digest is signed without being hashed again."""
+        digest = hashlib.sha256(b"payload").digest()
+        signature = self.signer.sign_digest(digest, self.private_key_pem)
+        
+        assert self.signer.verify_digest(digest, signature, self.public_key_pem) is True
+        # The same signature is not valid under ECDSA(SHA256) over the digest (a second hash pass)
+        assert self.signer.verify_signature(digest, signature, self.public_key_pem) is False
+        assert self.signer.verify_digest(hashlib.sha256(b"other").digest(), signature, self.public_key_pem) is False
+    
+    def test_invalid_digest(self):
+        """Test that non SHA-256 sized digests are rejected."""
+        with pytest.raises(ValueError):
+            self.signer.sign_digest(b"short", self.private_key_pem)
+        assert self.signer.verify_digest(b"short", b"sig", self.public_key_pem) is False
+    
+    def test_tx_hash_is_signing_digest(self):
+        """Test that Transaction.tx_hash is the digest the handler signs."""
+        result = secure_signature_handler.sign_transaction(
+            sender=self.txn.sender,
+            recipient=self.txn.recipient,
+            nonce=self.txn.nonce,
+            value_data=self.txn._serialize_values_for_signing(),
+            private_key_pem=self.private_key_pem,
+            timestamp=self.txn.time
+        )
+        assert result["transaction_hash"] == self.txn.tx_hash.hex()
+        
+        # Signatures from either path verify against the transaction
+        self.txn.signature = bytes.fromhex(result["signature"])
+        assert self.txn.check_txn_sig(self.public_key_pem) is True
+    
+    def test_tampered_transaction_fails(self):
+        """Test that verification recomputes the digest instead of trusting tx_hash."""
+        self.txn.sig_txn(self.private_key_pem)
+        assert self.txn.check_txn_sig(self.public_key_pem) is True
+        
+        self.txn.recipient = "mallory"
+        assert self.txn.check_txn_sig(self.public_key_pem) is False
+
+
 class TestIntegration:
     """Integration tests for the complete secure signature system."""
     
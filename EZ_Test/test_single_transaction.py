@@ -9,8 +9,6 @@ import os
 import datetime
 import tempfile
 from unittest.mock import patch, MagicMock
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,10 +16,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from EZ_Transaction.SingleTransaction import Transaction
     from EZ_Value.Value import Value, ValueState
+    from EZ_Tool_Box.KeyStore import KeyStore
 except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
 
+# Seeded, in-memory key store: the same keys every run, derived once per address
+TEST_KEYS = KeyStore()
+
 
 class TestTransactionInitialization(unittest.TestCase):
     """Test suite for Transaction class initialization and basic properties."""
@@ -264,24 +266,8 @@ class TestTransactionSignature(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures before each test method."""
-        # Generate test keys (in real scenario, these would be from key management)
-        from cryptography.hazmat.primitives.asymmetric import ec
-        from cryptography.hazmat.primitives import serialization
-        
-        self.private_key = ec.generate_private_key(ec.SECP256R1())
-        self.public_key = self.private_key.public_key()
-        
-        # Serialize keys for testing
-        self.private_key_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        
-        self.public_key_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # Seeded test keys from the key store
+        self.private_key_pem, self.public_key_pem = TEST_KEYS.get_key_pair("signer")
         
         self.sender = "0xSender123"
         self.recipient = "0xRecipient456"
@@ -314,12 +300,8 @@ class TestTransactionSignature(unittest.TestCase):
         
     def test_signature_verification_wrong_key(self):
         """Test signature verification with wrong public key."""
-        # Generate a different key
-        wrong_private_key = ec.generate_private_key(ec.SECP256R1())
-        wrong_public_key_pem = wrong_private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # A different key
+        wrong_public_key_pem = TEST_KEYS.get_public_key("other_signer")
         
         # Sign with original key
         self.tx.sig_txn(self.private_key_pem)
@@ -121,6 +121,28 @@ class TestTransactionInjector(unittest.TestCase):
         senders = [tx.sender for tx in invalid_multi_txn.multi_txns]
         self.assertEqual(len(set(senders)), 2)  # Should have 2 different senders
     
+    def test_sender_keys_are_deterministic(self):
+        """Test that sender keys come from the seeded key store"""
+        private_key_pem, public_key_pem = self.injector.key_store.get_key_pair("sender_000")
+        self.assertEqual(self.injector.sender_keys["sender_000"], public_key_pem)
+        self.assertEqual(self.injector._generate_sender_keys(), self.injector.sender_keys)
+    
+    def test_inject_signed_transactions(self):
+        """Test that signed batches pass real signature verification"""
+        self.injector.config.signature_enabled = True
+        self.injector.config.validation_enabled = True
+        sender = list(self.injector.sender_keys.keys())[0]
+        
+        success, message = self.injector.inject_single_transaction(sender)
+        self.assertTrue(success, message)
+        results = self.injector.inject_batch_transactions(sender, 3)
+        self.assertTrue(results[0][0], results[0][1])
+        
+        multi_txn = self.injector.transaction_pool.get_multi_transactions_by_digest(
+            self.injector.injected_transactions[-1])
+        self.assertTrue(multi_txn.check_acc_txn_sig(self.injector.sender_keys[sender]))
+        self.assertTrue(all(txn.check_txn_sig(self.injector.sender_keys[sender]) for txn in multi_txn.multi_txns))
+    
     def test_inject_single_transaction(self):
         """Test single transaction injection"""
         sender = list(self.injector.sender_keys.keys())[0]
@@ -12,8 +12,10 @@ from EZ_Transaction.MultiTransactions import MultiTransactions
 from EZ_Transaction.SingleTransaction import Transaction
 from EZ_Value.Value import Value
 from EZ_Transaction_Pool.TransactionPool import TransactionPool, ValidationResult
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import serialization
+from EZ_Tool_Box.KeyStore import KeyStore
+
+# Seeded, in-memory key store: the same keys every run, derived once per address
+TEST_KEYS = KeyStore()
 
 
 class TestTxnsPool(unittest.TestCase):
@@ -27,20 +29,8 @@ class TestTxnsPool(unittest.TestCase):
         # Create pool instance with temporary database
         self.pool = TransactionPool(self.temp_db.name)
         
-        # Generate test keys
-        self.private_key = ec.generate_private_key(ec.SECP256R1())
-        self.public_key = self.private_key.public_key()
-        
-        # Serialize keys
-        self.private_key_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        self.public_key_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        # Seeded test keys from the key store
+        self.private_key_pem, self.public_key_pem = TEST_KEYS.get_key_pair("signer")
         
         # Create test sender and recipient
         self.test_sender = "sender_test"
@@ -196,13 +186,8 @@ class TestTxnsPool(unittest.TestCase):
     
     def test_validate_multi_transactions_invalid_signature(self):
         """Test validation of MultiTransactions with invalid signature."""
-        # Create MultiTransactions with wrong key
-        wrong_key = ec.generate_private_key(ec.SECP256R1())
-        wrong_key_pem = wrong_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        # Create MultiTransactions with another account's key
+        wrong_key_pem = TEST_KEYS.get_private_key("other_signer")
         
         wrong_multi_txn = MultiTransactions(
             sender=self.test_sender,
@@ -219,12 +204,7 @@ class TestTxnsPool(unittest.TestCase):
     def test_validate_multi_transactions_invalid_transaction_signature(self):
         """Test validation with invalid transaction signature."""
         # Create transaction with wrong key
-        wrong_key = ec.generate_private_key(ec.SECP256R1())
-        wrong_key_pem = wrong_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        wrong_key_pem = TEST_KEYS.get_private_key("other_signer")
         
         invalid_txn = Transaction.new_transaction(
             sender=self.test_sender,
@@ -661,6 +641,49 @@ class TestTxnsPool(unittest.TestCase):
         corrupted_result = self.pool.get_multi_transactions_by_digest("corrupted_digest")
         self.assertIsNone(corrupted_result)
 
+    def _make_aggregate_multi_txn(self, count=4):
+        txns = [Transaction.new_transaction(self.test_sender, f"{self.test_recipient}_{i}",
+                                            [Value(hex(0x5000 + i * 100), 100)], 10 + i) for i in range(count)]
+        multi_txn = MultiTransactions(sender=self.test_sender, multi_txns=txns)
+        multi_txn.sig_acc_txn_aggregate(self.private_key_pem)
+        return multi_txn
+
+    def test_validate_aggregate_signed_multi_transactions(self):
+        """An aggregate-signed batch is valid without inner transaction signatures"""
+        multi_txn = self._make_aggregate_multi_txn()
+        with patch.object(Transaction, 'check_txn_sig') as check_txn_sig:
+            result = self.pool.validate_multi_transactions(multi_txn, self.public_key_pem)
+        self.assertTrue(result.is_valid, result.error_message)
+        self.assertTrue(result.signature_valid)
+        check_txn_sig.assert_not_called()
+
+        success, _ = self.pool.add_multi_transactions(multi_txn, self.public_key_pem)
+        self.assertTrue(success)
+
+    def test_validate_aggregate_root_mismatch(self):
+        """Changing an inner transaction of an aggregate-signed batch is rejected, with or without a key"""
+        multi_txn = self._make_aggregate_multi_txn()
+        multi_txn.multi_txns[1].recipient = "mallory"
+
+        result = self.pool.validate_multi_transactions(multi_txn, self.public_key_pem)
+        self.assertFalse(result.is_valid)
+        self.assertFalse(result.signature_valid)
+
+        result = self.pool.validate_multi_transactions(multi_txn)
+        self.assertFalse(result.is_valid)
+        self.assertIn("root mismatch", result.error_message)
+
+    def test_validate_forged_digest(self):
+        """A validly signed batch carrying a digest that is not its own is rejected"""
+        other = self._make_aggregate_multi_txn(count=2)
+        for multi_txn in (self._make_aggregate_multi_txn(), self.multi_txn):
+            multi_txn.digest = other.digest  # would shadow other in the pool and be committed as its leaf
+            result = self.pool.validate_multi_transactions(multi_txn, self.public_key_pem)
+            self.assertFalse(result.is_valid)
+            self.assertIn("digest does not match", result.error_message)
+            success, _ = self.pool.add_multi_transactions(multi_txn, self.public_key_pem)
+            self.assertFalse(success)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
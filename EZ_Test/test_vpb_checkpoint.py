@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the sorted VPB checkpoint list and its SQLite store.
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Block_Units.VPBCheckPoint import CheckedVPBList
+    from EZ_Block_Units.VPBCheckPointStore import VPBCheckPointStore
+    from EZ_Block_Units.Proof import Proof, ProofUnit
+    from EZ_Value.Value import Value
+except ImportError as e:
+    print(f"Error importing VPBCheckPoint: {e}")
+    sys.exit(1)
+
+
+def make_vpb(begin, num, owner, block_index):
+    return (Value(hex(begin), num), Proof([ProofUnit(owner, [], [])]), block_index)
+
+
+def ranges(ck_list):
+    return [(ck[0].get_decimal_begin_index(), ck[0].get_decimal_end_index(), ck[1], ck[2])
+            for ck in ck_list.VPBCheckPoints]
+
+
+@pytest.fixture
+def ck_list():
+    """Fixture for a checkpoint list with two disjoint ranges."""
+    cks = CheckedVPBList()
+    cks.fresh_local_vpb_check_point_dst([make_vpb(100, 100, "alice", 5), make_vpb(0, 50, "bob", 3)])
+    return cks
+
+
+class TestCheckedVPBList:
+    """Test suite for checkpoint lookup and update."""
+
+    def test_sorted_after_insert(self, ck_list):
+        assert ranges(ck_list) == [(0, 49, "bob", 3), (100, 199, "alice", 5)]
+
+    def test_find_inclusion(self, ck_list):
+        assert ck_list.findCKviaVPB(make_vpb(120, 10, "x", 0)) == [("alice", 5)]
+        assert ck_list.findCKviaVPB(make_vpb(0, 50, "x", 0)) == [("bob", 3)]
+        # partially covered or uncovered values have no checkpoint
+        assert ck_list.findCKviaVPB(make_vpb(40, 20, "x", 0)) == []
+        assert ck_list.findCKviaVPB(make_vpb(60, 10, "x", 0)) == []
+        assert CheckedVPBList().findCKviaVPB(make_vpb(0, 1, "x", 0)) == []
+
+    def test_split_inside(self, ck_list):
+        ck_list.addAndFreshCheckPoint([make_vpb(120, 10, "carol", 9)])
+        assert ranges(ck_list) == [(0, 49, "bob", 3), (100, 119, "alice", 5),
+                                   (120, 129, "carol", 9), (130, 199, "alice", 5)]
+        assert ck_list.findCKviaVPB(make_vpb(125, 1, "x", 0)) == [("carol", 9)]
+
+    def test_replace_across_several(self, ck_list):
+        ck_list.fresh_local_vpb_check_point_dst([make_vpb(40, 80, "dave", 11)])
+        assert ranges(ck_list) == [(0, 39, "bob", 3), (40, 119, "dave", 11), (120, 199, "alice", 5)]
+
+    def test_exact_replace(self, ck_list):
+        ck_list.fresh_local_vpb_check_point_dst([make_vpb(100, 100, "erin", 12)])
+        assert ranges(ck_list) == [(0, 49, "bob", 3), (100, 199, "erin", 12)]
+        assert len(ck_list) == 2
+
+    def test_matches_bitmap_model(self):
+        """Random updates agree with a per-unit reference model and keep ranges disjoint."""
+        rng = random.Random(7)
+        cks = CheckedVPBList()
+        model = {}
+        for step in range(300):
+            begin, num = rng.randrange(0, 500), rng.randrange(1, 40)
+            cks.fresh_local_vpb_check_point_dst([make_vpb(begin, num, f"o{step % 5}", step)])
+            for unit in range(begin, begin + num):
+                model[unit] = (f"o{step % 5}", step)
+
+        spans = ranges(cks)
+        for (_, end, _, _), (next_begin, _, _, _) in zip(spans, spans[1:]):
+            assert end < next_begin
+        for unit in range(0, 560):
+            found = cks.findCKviaVPB(make_vpb(unit, 1, "x", 0))
+            assert found == ([model[unit]] if unit in model else [])
+
+
+class TestVPBCheckPointStore:
+    """Test suite for persisted checkpoints."""
+
+    def test_survives_restart(self, tmp_path):
+        db_path = str(tmp_path / "ck.db")
+        cks = CheckedVPBList(store=VPBCheckPointStore(db_path))
+        cks.fresh_local_vpb_check_point_dst([make_vpb(100, 100, "alice", 5), make_vpb(0, 50, "bob", 3)])
+        cks.fresh_local_vpb_check_point_dst([make_vpb(120, 10, "carol", 9)])
+
+        reopened = CheckedVPBList(store=VPBCheckPointStore(db_path))
+        assert ranges(reopened) == ranges(cks)
+        assert reopened.findCKviaVPB(make_vpb(125, 2, "x", 0)) == [("carol", 9)]
+
+    def test_store_matches_memory(self, tmp_path):
+        """Random batches leave store and in-memory list identical."""
+        store = VPBCheckPointStore(str(tmp_path / "ck.db"))
+        cks = CheckedVPBList(store=store)
+        rng = random.Random(11)
+        for step in range(40):
+            batch = [make_vpb(rng.randrange(0, 400), rng.randrange(1, 60), f"o{i}", step) for i in range(3)]
+            cks.fresh_local_vpb_check_point_dst(batch)
+        stored = [(v.get_decimal_begin_index(), v.get_decimal_end_index(), owner, b)
+                  for v, owner, b in store.load_check_points()]
+        assert stored == ranges(cks)
+        assert store.count() == len(cks)
+        assert store.find_check_point(cks.VPBCheckPoints[0][0]) == cks.VPBCheckPoints[0][1:]
+
+    def test_block_index_lists(self, tmp_path):
+        """VPBs carry block index lists; their height is what memory and the store keep."""
+        db_path = str(tmp_path / "ck.db")
+        cks = CheckedVPBList(store=VPBCheckPointStore(db_path))
+        cks.fresh_local_vpb_check_point_dst([make_vpb(100, 100, "alice", [2, 5]), make_vpb(0, 50, "bob", [3])])
+        cks.fresh_local_vpb_check_point_dst([make_vpb(120, 10, "carol", [5, 7, 9])])
+        assert ranges(cks) == [(0, 49, "bob", 3), (100, 119, "alice", 5),
+                               (120, 129, "carol", 9), (130, 199, "alice", 5)]
+        assert ranges(CheckedVPBList(store=VPBCheckPointStore(db_path))) == ranges(cks)
+
+    def test_large_value_indices(self, tmp_path):
+        """Indices beyond 64 bits are stored and ordered correctly."""
+        store = VPBCheckPointStore(str(tmp_path / "ck.db"))
+        big = 2 ** 250
+        store.upsert_check_points([(Value(hex(big), 1000), "alice", 1), (Value(hex(5), 10), "bob", 2)])
+        store.upsert_check_points([(Value(hex(big + 10), 5), "carol", 3)])
+        loaded = store.load_check_points()
+        assert [v.get_decimal_begin_index() for v, _, _ in loaded] == [5, big, big + 10, big + 15]
+        assert store.find_check_point(Value(hex(big + 12), 2)) == ("carol", 3)
+        assert store.find_check_point(Value(hex(big + 12), 10)) is None
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental VPB verifier.
+"""
+
+import pytest
+import sys
+import os
+import copy
+import datetime
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from EZ_Main_Chain.Block import Block
+    from EZ_Main_Chain.Blockchian import Blockchain
+    from EZ_Block_Units.MerkleTree import MerkleTree
+    from EZ_Block_Units.Proof import Proof, ProofUnit
+    from EZ_Block_Units.VPBCheckPoint import CheckedVPBList
+    from EZ_Block_Units.VPBVerifier import VPBVerifier
+    from EZ_Transaction.SingleTransaction import Transaction
+    from EZ_Transaction.MultiTransactions import MultiTransactions
+    from EZ_Value.Value import Value
+except ImportError as e:
+    print(f"Error importing VPBVerifier: {e}")
+    sys.exit(1)
+
+
+VALUE = Value("0x1000", 100)
+
+
+def make_multi_txn(sender, transfers, nonce=0):
+    txns = [Transaction(sender, recipient, nonce + i, None, values, "2024-01-01T00:00:00")
+            for i, (recipient, values) in enumerate(transfers)]
+    multi_txn = MultiTransactions(sender, txns)
+    multi_txn.set_digest()
+    return multi_txn
+
+
+class ChainBuilder:
+    """Builds a chain where each block packs the given MultiTransactions."""
+
+    def __init__(self):
+        genesis = Block(index=0, m_tree_root="genesis", miner="miner", pre_hash="0",
+                        bloom_size=2048, bloom_hash_count=3, time=datetime.datetime(2024, 1, 1))
+        self.chain = Blockchain(genesis)
+        self.proofs = {}  # digest -> (height, merkle proof)
+
+    def add_block(self, multi_txns):
+        digests = [m.digest for m in multi_txns]
+        tree = MerkleTree(digests)
+        parent = self.chain.get_latest_block()
+        block = Block(index=parent.get_index() + 1, m_tree_root=tree.get_root_hash(), miner="miner",
+                      pre_hash=parent.get_hash(), bloom_size=2048, bloom_hash_count=3,
+                      time=datetime.datetime(2024, 1, 1, 0, parent.get_index() + 1))
+        for m in multi_txns:
+            block.add_item_to_bloom(m.sender)
+        assert self.chain.add_block(block)[0]
+        for i, m in enumerate(multi_txns):
+            self.proofs[m.digest] = (block.get_index(), tree.prf_list[i])
+
+    def unit(self, multi_txn):
+        height, prf = self.proofs[multi_txn.digest]
+        return ProofUnit(multi_txn.sender, multi_txn, prf), height
+
+
+def build_vpb(builder, multi_txns):
+    units = [builder.unit(m) for m in multi_txns]
+    return (VALUE, Proof([u for u, _ in units]), [h for _, h in units])
+
+
+@pytest.fixture
+def scenario():
+    """Fixture: alice -> bob at block 1, bob -> carol at block 3, noise elsewhere."""
+    builder = ChainBuilder()
+    a_to_b = make_multi_txn("alice", [("bob", [VALUE])])
+    b_to_c = make_multi_txn("bob", [("carol", [VALUE])])
+    c_to_d = make_multi_txn("carol", [("dave", [VALUE])])
+    builder.add_block([a_to_b, make_multi_txn("xavier", [("yan", [Value("0x1", 5)])])])
+    builder.add_block([make_multi_txn("xavier", [("yan", [Value("0x10", 5)])], nonce=1)])
+    builder.add_block([b_to_c])
+    builder.add_block([make_multi_txn("yan", [("zoe", [Value("0x20", 5)])])])
+    builder.add_block([c_to_d])
+    return builder, a_to_b, b_to_c, c_to_d
+
+
+class TestVPBVerifier:
+    """Test suite for VPB verification."""
+
+    def test_valid_history(self, scenario):
+        builder, a_to_b, b_to_c, _ = scenario
+        verifier = VPBVerifier(builder.chain)
+        result = verifier.verify_vpb(build_vpb(builder, [a_to_b, b_to_c]), recipient="carol")
+        assert result.is_valid, result.error_message
+        assert result.verified_units == 2
+        assert result.start_height == -1
+
+    def test_wrong_recipient(self, scenario):
+        builder, a_to_b, b_to_c, _ = scenario
+        result = VPBVerifier(builder.chain).verify_vpb(build_vpb(builder, [a_to_b, b_to_c]), recipient="mallory")
+        assert not result.is_valid
+
+    def test_bad_merkle_proof(self, scenario):
+        builder, a_to_b, b_to_c, _ = scenario
+        vpb = build_vpb(builder, [a_to_b, b_to_c])
+        vpb[1].prfList[1].ownerMTreePrfList = builder.proofs[a_to_b.digest][1]
+        result = VPBVerifier(builder.chain).verify_vpb(vpb)
+        assert not result.is_valid
+        assert "Merkle" in result.error_message
+
+    @pytest.mark.parametrize("aggregate", [False, True], ids=["per_txn", "aggregate"])
+    @pytest.mark.parametrize("refresh_digest", [False, True], ids=["original_digest", "new_digest"])
+    def test_tampered_recipient_rejected(self, aggregate, refresh_digest):
+        """Transactions edited after packing are rejected whatever digest they carry."""
+        builder = ChainBuilder()
+        a_to_b = make_multi_txn("alice", [("bob", [VALUE])])
+        if aggregate:
+            a_to_b.txns_root = a_to_b.compute_txns_root()
+            a_to_b.set_digest()
+        builder.add_block([a_to_b])
+        vpb = build_vpb(builder, [a_to_b])
+
+        tampered = copy.deepcopy(a_to_b)
+        tampered.multi_txns[0].recipient = "mallory"
+        assert tampered.digest == a_to_b.digest and not tampered.check_digest()
+        if refresh_digest:
+            tampered.set_digest()
+        vpb[1].prfList[0] = ProofUnit("alice", tampered, vpb[1].prfList[0].ownerMTreePrfList)
+
+        verifier = VPBVerifier(builder.chain)
+        result = verifier.verify_vpb(vpb, recipient="mallory")
+        assert not result.is_valid
+        assert ("Merkle" if refresh_digest else "does not match its transactions") in result.error_message
+        assert not verifier.verify_bundle([vpb], recipient="mallory").is_valid
+
+    def test_broken_ownership(self, scenario):
+        builder, a_to_b, _, c_to_d = scenario
+        # carol's unit follows alice's although alice handed the value to bob
+        result = VPBVerifier(builder.chain).verify_vpb(build_vpb(builder, [a_to_b, c_to_d]))
+        assert not result.is_valid
+        assert "expected bob" in result.error_message
+
+    def test_hidden_block_detected(self):
+        """A holder appearing in a block Bloom filter without a proof unit is rejected."""
+        builder = ChainBuilder()
+        a_to_b = make_multi_txn("alice", [("bob", [VALUE])])
+        b_other = make_multi_txn("bob", [("erin", [Value("0x9000", 1)])])
+        b_to_c = make_multi_txn("bob", [("carol", [VALUE])], nonce=1)
+        builder.add_block([a_to_b])
+        builder.add_block([b_other])
+        builder.add_block([b_to_c])
+
+        verifier = VPBVerifier(builder.chain)
+        result = verifier.verify_vpb(build_vpb(builder, [a_to_b, b_to_c]))
+        assert not result.is_valid
+        assert "block 2" in result.error_message
+        assert verifier.verify_vpb(build_vpb(builder, [a_to_b, b_other, b_to_c]), recipient="carol").is_valid
+
+    def test_checkpoint_and_cache(self, scenario):
+        builder, a_to_b, b_to_c, c_to_d = scenario
+        checked = CheckedVPBList()
+        checked.add_check_point(VALUE, "bob", 3)
+        verifier = VPBVerifier(builder.chain, checked_vpb_list=checked)
+
+        vpb = build_vpb(builder, [a_to_b, b_to_c, c_to_d])
+        result = verifier.verify_vpb(vpb, recipient="dave")
+        assert result.is_valid, result.error_message
+        assert result.start_height == 3
+        assert result.skipped_units == 2
+        assert result.verified_units == 1
+
+        again = verifier.verify_vpb(vpb, recipient="dave")
+        assert again.is_valid
+        assert again.cache_hits == 1 and again.verified_units == 0
+        assert verifier.stats['vpbs_verified'] == 2
+
+    def test_mismatching_checkpoint_falls_back(self, scenario):
+        builder, a_to_b, b_to_c, _ = scenario
+        checked = CheckedVPBList()
+        checked.add_check_point(VALUE, "mallory", 3)
+        result = VPBVerifier(builder.chain, checked_vpb_list=checked).verify_vpb(build_vpb(builder, [a_to_b, b_to_c]))
+        assert result.is_valid
+        assert result.start_height == -1
+        assert result.verified_units == 2
+
+
+class TestProofPruning:
+    """Test suite for pruning proofs behind checkpoints."""
+
+    def test_compact_and_verify(self, scenario):
+        builder, a_to_b, b_to_c, c_to_d = scenario
+        checked = CheckedVPBList()
+        checked.add_check_point(VALUE, "bob", 3)
+        vpb = build_vpb(builder, [a_to_b, b_to_c, c_to_d])
+
+        assert checked.compact_vpb(vpb) == 1
+        assert vpb[2] == [3, 5]
+        assert [u.owner for u in vpb[1].prfList] == ["bob", "carol"]
+        assert vpb[1].anchor.blockIndex == 3 and vpb[1].anchor.prunedUnits == 1
+        # nothing more to drop at the same checkpoint
+        assert checked.compact_vpb(vpb) == 0
+
+        result = VPBVerifier(builder.chain, checked_vpb_list=checked).verify_vpb(vpb, recipient="dave")
+        assert result.is_valid, result.error_message
+        assert result.skipped_units == 1
+
+    def test_pruned_proof_needs_checkpoint(self, scenario):
+        builder, a_to_b, b_to_c, c_to_d = scenario
+        checked = CheckedVPBList()
+        checked.add_check_point(VALUE, "bob", 3)
+        vpb = build_vpb(builder, [a_to_b, b_to_c, c_to_d])
+        checked.compact_vpb(vpb)
+
+        result = VPBVerifier(builder.chain).verify_vpb(vpb, recipient="dave")
+        assert not result.is_valid
+        assert "pruned" in result.error_message
+
+    def test_mismatching_checkpoint_keeps_proof(self, scenario):
+        builder, a_to_b, b_to_c, _ = scenario
+        checked = CheckedVPBList()
+        checked.add_check_point(VALUE, "mallory", 3)
+        vpb = build_vpb(builder, [a_to_b, b_to_c])
+        assert checked.compact_vpbs([vpb]) == 0
+        assert vpb[1].anchor is None and len(vpb[1].prfList) == 2
+
+    def test_repeated_pruning_accumulates(self, scenario):
+        builder, a_to_b, b_to_c, c_to_d = scenario
+        checked = CheckedVPBList()
+        vpb = build_vpb(builder, [a_to_b, b_to_c, c_to_d])
+        checked.add_check_point(VALUE, "bob", 3)
+        checked.compact_vpb(vpb)
+        checked.add_check_point(VALUE, "carol", 5)
+        assert checked.compact_vpb(vpb) == 1
+        assert vpb[1].anchor.prunedUnits == 2
+        assert vpb[2] == [5]
+
+
+@pytest.fixture
+def payment():
+    """Fixture: eight values moved together alice -> bob -> carol."""
+    builder = ChainBuilder()
+    values = [Value(hex(0x1000 + i * 100), 100) for i in range(8)]
+    a_to_b = make_multi_txn("alice", [("bob", values)])
+    b_to_c = make_multi_txn("bob", [("carol", values)])
+    builder.add_block([a_to_b] + [make_multi_txn(f"noise_{i}", [("x", [Value("0x1", 1)])]) for i in range(5)])
+    builder.add_block([b_to_c, make_multi_txn("noise_9", [("x", [Value("0x2", 1)])])])
+    vpbs = []
+    for value in values:
+        units = [builder.unit(a_to_b), builder.unit(b_to_c)]
+        vpbs.append((value, Proof([u for u, _ in units]), [h for _, h in units]))
+    return builder, vpbs
+
+
+class TestBundleVerification:
+    """Test suite for verifying several VPBs together."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_valid_bundle_deduplicates(self, payment, workers):
+        builder, vpbs = payment
+        with VPBVerifier(builder.chain, workers=workers, parallel_threshold=1) as verifier:
+            bundle = verifier.verify_bundle(vpbs, recipient="carol")
+        assert bundle.is_valid, bundle.error_message
+        assert bundle.unit_checks == 2
+        assert bundle.deduplicated_checks == 14
+        assert len(bundle.results) == 8 and all(r.is_valid for r in bundle.results)
+        assert verifier.stats['vpbs_verified'] == 8
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_short_circuit_on_bad_proof(self, payment, workers):
+        builder, vpbs = payment
+        good = vpbs[5][1].prfList[1]
+        # transactions that were never packed, presented with the real unit's proof
+        forged = make_multi_txn("bob", [("carol", [vpbs[5][0]])], nonce=7)
+        vpbs[5][1].prfList[1] = ProofUnit(good.owner, forged, good.ownerMTreePrfList)
+        with VPBVerifier(builder.chain, workers=workers, parallel_threshold=1) as verifier:
+            bundle = verifier.verify_bundle(vpbs, recipient="carol")
+        assert not bundle.is_valid
+        assert bundle.failed_index == 5
+        assert "Merkle" in bundle.error_message
+        assert len(bundle.results) == 6
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_reports_first_invalid_vpb(self, payment, workers):
+        """The earliest invalid VPB is reported whichever chunk or check fails first."""
+        builder, vpbs = payment
+        for position in (6, 2):
+            good = vpbs[position][1].prfList[1]
+            forged = make_multi_txn("bob", [("carol", [vpbs[position][0]])], nonce=position)
+            vpbs[position][1].prfList[1] = ProofUnit(good.owner, forged, good.ownerMTreePrfList)
+        vpbs[7][2][1] = 99  # no such block
+        with VPBVerifier(builder.chain, workers=workers, parallel_threshold=1) as verifier:
+            bundle = verifier.verify_bundle(vpbs, recipient="carol")
+        assert bundle.failed_index == 2
+        assert "Merkle" in bundle.error_message
+        assert len(bundle.results) == 3
+
+    def test_cached_units_recheck_digest(self, payment):
+        """A cache hit still recomputes the digest, so transactions edited afterwards are caught."""
+        builder, vpbs = payment
+        verifier = VPBVerifier(builder.chain)
+        assert verifier.verify_bundle(vpbs, recipient="carol").is_valid
+        vpbs[3][1].prfList[1].ownerAccTxnsList.multi_txns[0].recipient = "mallory"
+        bundle = verifier.verify_bundle(vpbs, recipient="mallory")
+        assert bundle.failed_index == 0
+        assert "does not match its transactions" in bundle.error_message
+
+    def test_history_failure_and_cache(self, payment):
+        builder, vpbs = payment
+        verifier = VPBVerifier(builder.chain)
+        bundle = verifier.verify_bundle(vpbs, recipient="dave")
+        assert not bundle.is_valid and bundle.failed_index == 0
+        # the Merkle checks already passed and are reused
+        again = verifier.verify_bundle(vpbs, recipient="carol")
+        assert again.is_valid
+        assert again.unit_checks == 0
+        assert sum(r.cache_hits for r in again.results) == 16
@@ -0,0 +1,201 @@
+import os
+import io
+import gc
+import json
+import time
+import platform
+import datetime
+import statistics
+import subprocess
+import contextlib
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkStats:
+    """Timing statistics of one benchmark, per call in seconds"""
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    rounds: int
+    iterations: int
+
+    @property
+    def ops(self) -> float:
+        return 1.0 / self.mean if self.mean > 0 else 0.0
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    group: str
+    stats: BenchmarkStats
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        stats = asdict(self.stats)
+        stats["ops"] = self.stats.ops
+        return {"name": self.name, "group": self.group, "params": self.params, "stats": stats}
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    func: Callable
+    setup: Optional[Callable] = None  # returns the argument tuple for one round (not timed)
+    group: str = ""
+    rounds: int = 20
+    iterations: int = 1
+    warmup_rounds: int = 1
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def _time_round(case: BenchmarkCase) -> float:
+    args = case.setup() if case.setup is not None else ()
+    func = case.func
+    iterations = case.iterations
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - started) / iterations
+
+
+def machine_info() -> dict:
+    return {
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def commit_info(repo_dir: Optional[str] = None) -> dict:
+    """Current git commit, if available (never needs the network)."""
+    repo_dir = repo_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit_id = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True,
+                                   text=True, timeout=10).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo_dir,
+                                    capture_output=True, text=True, timeout=10).stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    return {"id": commit_id, "dirty": dirty} if commit_id else {}
+
+
+class BenchmarkSuite:
+    """
+    Minimal offline benchmark runner in the spirit of pytest-benchmark.
+
+    Cases are registered with add(); run() times each case for a number of
+    rounds (optionally calling an untimed setup per round) and the results
+    are saved as JSON so that a later run can be compared against a
+    baseline with compare().
+    """
+
+    def __init__(self, name: str = "benchmarks", quiet: bool = True):
+        self.name = name
+        self.quiet = quiet  # swallow prints of the code under test
+        self.cases: List[BenchmarkCase] = []
+        self.results: List[BenchmarkResult] = []
+
+    def add(self, name: str, func: Callable, setup: Optional[Callable] = None, group: str = "",
+            rounds: int = 20, iterations: int = 1, warmup_rounds: int = 1, **params) -> BenchmarkCase:
+        case = BenchmarkCase(name, func, setup, group, rounds, iterations, warmup_rounds, params)
+        self.cases.append(case)
+        return case
+
+    def run_case(self, case: BenchmarkCase, rounds: Optional[int] = None) -> BenchmarkResult:
+        rounds = max(1, rounds if rounds is not None else case.rounds)
+        output = contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+        gc_was_enabled = gc.isenabled()
+        with output:
+            for _ in range(case.warmup_rounds):
+                _time_round(case)
+            timings = []
+            gc.disable()
+            try:
+                for _ in range(rounds):
+                    timings.append(_time_round(case))
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+
+        stats = BenchmarkStats(
+            min=min(timings),
+            max=max(timings),
+            mean=statistics.mean(timings),
+            median=statistics.median(timings),
+            stddev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            rounds=rounds,
+            iterations=case.iterations
+        )
+        return BenchmarkResult(case.name, case.group, stats, dict(case.params))
+
+    def run(self, name_filter: Optional[str] = None, rounds: Optional[int] = None,
+            progress: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+        """Run all cases whose name contains name_filter; rounds overrides every case's round count."""
+        self.results = []
+        for case in self.cases:
+            if name_filter and name_filter not in case.name:
+                continue
+            result = self.run_case(case, rounds)
+            self.results.append(result)
+            if progress is not None:
+                progress(result)
+        return self.results
+
+    def to_dict(self) -> dict:
+        return {
+            "suite": self.name,
+            "datetime": datetime.datetime.now().isoformat(),
+            "machine_info": machine_info(),
+            "commit_info": commit_info(),
+            "benchmarks": [result.to_dict() for result in self.results]
+        }
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def compare(self, baseline: dict, threshold: float = 0.2, stat: str = "median") -> List[dict]:
+        """
+        Compare the last run with a baseline (as produced by to_dict/save_json).
+
+        Returns one entry per benchmark present in both, with ratio = current / baseline;
+        entries slower than (1 + threshold) are flagged as regressions.
+        """
+        baseline_stats = {bench["name"]: bench["stats"] for bench in baseline.get("benchmarks", [])}
+        comparison = []
+        for result in self.results:
+            base = baseline_stats.get(result.name)
+            if base is None or not base.get(stat):
+                continue
+            current = getattr(result.stats, stat)
+            ratio = current / base[stat]
+            comparison.append({
+                "name": result.name,
+                "baseline": base[stat],
+                "current": current,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold
+            })
+        return comparison
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'name':<44} {'median (us)':>12} {'mean (us)':>12} {'stddev (us)':>12} {'ops/s':>12} {'rounds':>7}"]
+    for result in results:
+        s = result.stats
+        lines.append(f"{result.name:<44} {s.median * 1e6:>12.1f} {s.mean * 1e6:>12.1f} "
+                     f"{s.stddev * 1e6:>12.1f} {s.ops:>12.1f} {s.rounds:>7}")
+    return "\n".join(lines)
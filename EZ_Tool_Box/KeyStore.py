@@ -0,0 +1,168 @@
+"""
+Deterministic key store for simulations and tests.
+
+Key pairs are derived from (seed, address), so the same seed always yields
+the same keys, and are cached in a small SQLite file so that later runs load
+them instead of deriving them again. The private keys are stored unencrypted:
+this is for simulations and tests only, never for real wallets.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives import serialization
+
+from EZ_Tool_Box.Hash import sha256_hash
+
+DEFAULT_SEED = "ezchain-simulation"
+# SECP256R1 group order
+_CURVE_ORDER = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+
+
+def default_key_store_path(seed: str = DEFAULT_SEED) -> str:
+    """Shared cache file for a seed (in the temp dir, reused across runs)."""
+    return os.path.join(tempfile.gettempdir(), f"ezchain_keys_{sha256_hash(seed)[:16]}.db")
+
+
+def derive_key_pair(seed: str, address: str) -> Tuple[bytes, bytes]:
+    """Deterministic SECP256R1 key pair of address under seed, as (private_key_pem, public_key_pem)."""
+    scalar = int(sha256_hash(f"{seed}:{address}"), 16) % (_CURVE_ORDER - 1) + 1
+    private_key = ec.derive_private_key(scalar, ec.SECP256R1())
+    private_key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    public_key_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_key_pem, public_key_pem
+
+
+class KeyStore:
+    """
+    Seeded, persistent key pairs by address.
+
+    get_key_pair() serves from memory, then from the SQLite cache, and only
+    derives (and stores) a key pair the first time an address is seen.
+    With db_path=None nothing is persisted.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, seed: str = DEFAULT_SEED):
+        self.db_path = db_path
+        self.seed = seed
+        self.lock = threading.RLock()
+        self._key_pairs: Dict[str, Tuple[bytes, bytes]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {
+            'cache_hits': 0,
+            'loaded': 0,
+            'generated': 0
+        }
+        if db_path:
+            self._init_database()
+
+    def _init_database(self):
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS key_pairs (
+                address TEXT PRIMARY KEY,
+                private_key BLOB NOT NULL,
+                public_key BLOB NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'seed'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('seed', ?)", (self.seed,))
+        elif row[0] != self.seed:
+            self._conn.close()
+            self._conn = None
+            raise ValueError(f"Key store {self.db_path} was created with a different seed")
+        self._conn.commit()
+
+    def get_key_pairs(self, addresses: Iterable[str]) -> Dict[str, Tuple[bytes, bytes]]:
+        """(private_key_pem, public_key_pem) for every address; missing ones are derived and stored in one batch."""
+        addresses = list(dict.fromkeys(addresses))
+        with self.lock:
+            missing = [address for address in addresses if address not in self._key_pairs]
+            self.stats['cache_hits'] += len(addresses) - len(missing)
+
+            if missing and self._conn is not None:
+                missing = self._load(missing)
+
+            if missing:
+                generated = [(address,) + derive_key_pair(self.seed, address) for address in missing]
+                for address, private_key_pem, public_key_pem in generated:
+                    self._key_pairs[address] = (private_key_pem, public_key_pem)
+                self.stats['generated'] += len(generated)
+                if self._conn is not None:
+                    with self._conn:
+                        self._conn.executemany(
+                            'INSERT OR REPLACE INTO key_pairs (address, private_key, public_key) VALUES (?, ?, ?)',
+                            generated)
+
+            return {address: self._key_pairs[address] for address in addresses}
+
+    def _load(self, addresses: List[str]) -> List[str]:
+        # SQLite limits the number of bound parameters, so query in chunks
+        for start in range(0, len(addresses), 500):
+            chunk = addresses[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT address, private_key, public_key FROM key_pairs WHERE address IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+            for address, private_key_pem, public_key_pem in rows:
+                self._key_pairs[address] = (bytes(private_key_pem), bytes(public_key_pem))
+            self.stats['loaded'] += len(rows)
+        return [address for address in addresses if address not in self._key_pairs]
+
+    def get_key_pair(self, address: str) -> Tuple[bytes, bytes]:
+        return self.get_key_pairs([address])[address]
+
+    def get_private_key(self, address: str) -> bytes:
+        return self.get_key_pair(address)[0]
+
+    def get_public_key(self, address: str) -> bytes:
+        return self.get_key_pair(address)[1]
+
+    def __contains__(self, address: str) -> bool:
+        with self.lock:
+            if address in self._key_pairs:
+                return True
+            if self._conn is None:
+                return False
+            return self._conn.execute('SELECT 1 FROM key_pairs WHERE address = ?', (address,)).fetchone() is not None
+
+    def count(self) -> int:
+        """Number of stored key pairs (held in memory when not persisted)."""
+        with self.lock:
+            if self._conn is None:
+                return len(self._key_pairs)
+            return self._conn.execute('SELECT COUNT(*) FROM key_pairs').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared_key_stores: Dict[str, KeyStore] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_key_store(seed: str = DEFAULT_SEED) -> KeyStore:
+    """Process-wide key store of a seed, persisted at default_key_store_path(seed)."""
+    with _shared_lock:
+        key_store = _shared_key_stores.get(seed)
+        if key_store is None:
+            key_store = KeyStore(default_key_store_path(seed), seed)
+            _shared_key_stores[seed] = key_store
+        return key_store
@@ -0,0 +1,264 @@
+"""
+Lightweight in-process metrics: counters, histograms and timers.
+
+Instrumented modules create their metrics once at import time (by name, from
+the shared registry) and use them on the hot path. While the registry is
+disabled, which is the default, every update returns after a single flag
+check and @timed functions are called straight through, so the
+instrumentation can stay in production code. Enable it with
+metrics.enable() or by setting EZ_METRICS=1 in the environment, then read
+the numbers back with snapshot(), format_snapshot() or export_json().
+
+Histograms use fixed power-of-two buckets, so memory stays constant however
+many observations are recorded; percentiles are estimated from the buckets.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+_BUCKET_COUNT = 48  # base * 2**0 .. base * 2**47, then an overflow bucket
+
+
+class Counter:
+    """Monotonic count."""
+
+    __slots__ = ('name', 'value', '_registry')
+    kind = 'counter'
+
+    def __init__(self, name: str, registry: 'MetricsRegistry'):
+        self.name = name
+        self.value = 0
+        self._registry = registry
+
+    def inc(self, amount: int = 1) -> None:
+        registry = self._registry
+        if registry.enabled:
+            with registry.lock:
+                self.value += amount
+
+    def reset(self) -> None:
+        self.value = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'type': self.kind, 'value': self.value}
+
+
+class Histogram:
+    """Distribution of observed values in power-of-two buckets (upper bounds base * 2**i)."""
+
+    __slots__ = ('name', 'base', 'count', 'total', 'min', 'max', 'buckets', '_registry')
+    kind = 'histogram'
+
+    def __init__(self, name: str, registry: 'MetricsRegistry', base: float = 1.0):
+        self.name = name
+        self.base = base
+        self._registry = registry
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (_BUCKET_COUNT + 1)
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.base:
+            return 0
+        # ceil(log2(value / base)) without floating-point log
+        index = (int(value / self.base) - 1).bit_length()
+        if self.base * (1 << index) < value:
+            index += 1
+        return min(index, _BUCKET_COUNT)
+
+    def observe(self, value: float) -> None:
+        registry = self._registry
+        if registry.enabled:
+            with registry.lock:
+                self._record(value)
+
+    def _record(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.buckets[self._bucket(value)] += 1
+
+    def upper_bound(self, index: int) -> float:
+        return self.base * (1 << index) if index < _BUCKET_COUNT else float('inf')
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Estimate of the p-quantile (0 < p <= 1), interpolated inside its bucket and clamped to [min, max]."""
+        if not self.count:
+            return None
+        rank = p * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                upper = self.upper_bound(index)
+                lower = 0.0 if index == 0 else self.upper_bound(index - 1)
+                estimate = lower + (min(upper, self.max) - lower) * (rank - seen) / bucket_count
+                return max(self.min, min(self.max, estimate))
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'type': self.kind,
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': [[self.upper_bound(i) if i < _BUCKET_COUNT else 'inf', n]
+                        for i, n in enumerate(self.buckets) if n]
+        }
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class Timer(Histogram):
+    """Histogram of durations in seconds (buckets from one microsecond)."""
+
+    __slots__ = ()
+    kind = 'timer'
+
+    def __init__(self, name: str, registry: 'MetricsRegistry'):
+        super().__init__(name, registry, base=1e-6)
+
+    def time(self):
+        """Context manager timing its body (a shared no-op while disabled)."""
+        if not self._registry.enabled:
+            return _NULL_CONTEXT
+        return self._timing()
+
+    @contextmanager
+    def _timing(self):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class MetricsRegistry:
+    """Named counters, histograms and timers; get-or-create by name."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.lock = threading.RLock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _get(self, name: str, factory: Callable[[], Any], kind: str):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self.lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = factory()
+                    self._metrics[name] = metric
+        if metric.kind != kind:
+            raise ValueError(f"Metric {name} is a {metric.kind}, not a {kind}")
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, lambda: Counter(name, self), Counter.kind)
+
+    def histogram(self, name: str, base: float = 1.0) -> Histogram:
+        return self._get(name, lambda: Histogram(name, self, base), Histogram.kind)
+
+    def timer(self, name: str) -> Timer:
+        return self._get(name, lambda: Timer(name, self), Timer.kind)
+
+    def timed(self, name: str):
+        """Decorator recording every call of the function in timer name."""
+        timer = self.timer(name)
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timer.observe(time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Zero every metric (the metrics themselves stay registered)."""
+        with self.lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+    def names(self) -> List[str]:
+        return sorted(self._metrics)
+
+    def snapshot(self, prefix: str = '', include_empty: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Current values by metric name; metrics never updated are left out unless include_empty."""
+        with self.lock:
+            result = {}
+            for name in sorted(self._metrics):
+                if not name.startswith(prefix):
+                    continue
+                metric = self._metrics[name]
+                empty = metric.value == 0 if metric.kind == Counter.kind else metric.count == 0
+                if include_empty or not empty:
+                    result[name] = metric.snapshot()
+            return result
+
+    def export_json(self, path: str, prefix: str = '') -> None:
+        data = {'timestamp': time.time(), 'metrics': self.snapshot(prefix)}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def format_snapshot(self, prefix: str = '') -> str:
+        """Text table of the snapshot: counters, then histograms and timers (timers in milliseconds)."""
+        lines = []
+        for name, data in self.snapshot(prefix).items():
+            if data['type'] == Counter.kind:
+                lines.append(f"{name:<36} {data['value']:>12}")
+                continue
+            scale, unit = (1000.0, 'ms') if data['type'] == Timer.kind else (1.0, '')
+            lines.append(f"{name:<36} {data['count']:>12}  mean {data['mean'] * scale:.4g}{unit}  "
+                         f"p50 {data['p50'] * scale:.4g}{unit}  p99 {data['p99'] * scale:.4g}{unit}  "
+                         f"max {data['max'] * scale:.4g}{unit}  total {data['sum'] * scale:.4g}{unit}")
+        return "\n".join(lines)
+
+
+# Shared registry used by the instrumented modules
+metrics = MetricsRegistry(enabled=os.environ.get('EZ_METRICS', '') not in ('', '0'))
+
+
+def timed(name: str):
+    """Decorator timing a function in the shared registry (see MetricsRegistry.timed)."""
+    return metrics.timed(name)
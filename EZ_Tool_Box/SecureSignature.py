@@ -7,16 +7,20 @@ private keys are handled safely in memory and properly cleaned up after use.
 """
 
 import os
+import json
 import secrets
 import hashlib
-from typing import Optional, Union, Tuple
+from datetime import datetime
+from typing import Iterable, Optional, Union, Tuple
 from contextlib import contextmanager
-from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import ec, utils
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 from cryptography.exceptions import InvalidSignature
 import warnings
 
+from EZ_Tool_Box.Metrics import timed
+
 
 class SecureMemoryHandler:
     """
@@ -72,6 +76,123 @@ class SecureMemoryHandler:
                 key_obj = None
 
 
+# ECDSA over an already computed SHA-256 digest (the digest is not hashed a second time)
+PREHASHED_ECDSA = ec.ECDSA(utils.Prehashed(hashes.SHA256()))
+DIGEST_SIZE = 32
+
+
+def signable_hash(signable_data: dict) -> Tuple[str, bytes]:
+    """Deterministic JSON of signable data and its SHA-256 hash (the bytes actually signed)."""
+    signable_json = json.dumps(signable_data, sort_keys=True, separators=(',', ':'))
+    return signable_json, hashlib.sha256(signable_json.encode('utf-8')).digest()
+
+
+def transaction_signable_data(sender: str, recipient: str, nonce: int, value_data: list, timestamp: str) -> dict:
+    return {
+        "sender": sender,
+        "recipient": recipient,
+        "nonce": nonce,
+        "timestamp": timestamp,
+        "value": value_data
+    }
+
+
+def multi_transaction_signable_data(sender: str, transactions: list, timestamp: str) -> dict:
+    return {
+        "sender": sender,
+        "timestamp": timestamp,
+        "transactions": transactions,
+        "type": "multi_transaction"
+    }
+
+
+def aggregate_multi_transaction_signable_data(sender: str, txns_root: str, timestamp: str) -> dict:
+    """Signable data of an aggregate-signed MultiTransactions: it commits to the Merkle root of the inner tx_hashes."""
+    return {
+        "sender": sender,
+        "timestamp": timestamp,
+        "txns_root": txns_root,
+        "type": "aggregate_multi_transaction"
+    }
+
+
+class SigningSession:
+    """
+    A private key loaded once for signing a batch of payloads.
+
+    Obtained from TransactionSigner.signing_session(); the key is parsed when
+    the session opens and wiped once when it closes, so signing a batch of
+    Transaction/MultiTransactions costs one key load instead of one per
+    signature. Produces the same signatures as SecureTransactionSignature.
+    """
+
+    def __init__(self, private_key: ec.EllipticCurvePrivateKey):
+        self._private_key = private_key
+        self.signatures = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._private_key is None
+
+    def close(self) -> None:
+        self._private_key = None
+
+    @timed("signature.sign")
+    def sign_digest(self, digest: bytes) -> bytes:
+        """Sign a SHA-256 digest without hashing it again (prehashed ECDSA)."""
+        if self._private_key is None:
+            raise RuntimeError("Signing session is closed")
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError("Digest must be a SHA-256 digest")
+        signature = self._private_key.sign(digest, PREHASHED_ECDSA)
+        self.signatures += 1
+        return signature
+
+    def sign_transaction(self, txn) -> bytes:
+        """Sign a Transaction in place over its tx_hash (same as Transaction.sig_txn)."""
+        if txn.time is None:
+            raise ValueError("Transaction time must be set before signing")
+        txn.signature = self.sign_digest(txn.tx_hash)
+        return txn.signature
+
+    def sign_multi_transactions(self, multi_txn) -> bytes:
+        """Sign a MultiTransactions in place and set its digest (same payload as sig_acc_txn)."""
+        if not multi_txn.multi_txns:
+            raise ValueError("Cannot sign empty transaction list")
+        if multi_txn.time is None:
+            raise ValueError("MultiTransactions time must be set before signing")
+        _, transaction_hash = signable_hash(multi_transaction_signable_data(
+            multi_txn.sender, multi_txn._transactions_data_for_signing(), multi_txn.time))
+        multi_txn.signature = self.sign_digest(transaction_hash)
+        multi_txn.digest = transaction_hash.hex()
+        multi_txn.txns_root = None
+        return multi_txn.signature
+
+    def sign_aggregate_multi_transactions(self, multi_txn) -> bytes:
+        """Aggregate-sign a MultiTransactions in place (same as sig_acc_txn_aggregate); inner transactions stay unsigned."""
+        if not multi_txn.multi_txns:
+            raise ValueError("Cannot sign empty transaction list")
+        if multi_txn.time is None:
+            raise ValueError("MultiTransactions time must be set before signing")
+        multi_txn.txns_root = multi_txn.compute_txns_root(trusted=True)
+        _, transaction_hash = signable_hash(aggregate_multi_transaction_signable_data(
+            multi_txn.sender, multi_txn.txns_root, multi_txn.time))
+        multi_txn.signature = self.sign_digest(transaction_hash)
+        multi_txn.digest = transaction_hash.hex()
+        return multi_txn.signature
+
+    def sign_batch(self, items: Iterable) -> int:
+        """Sign every Transaction/MultiTransactions in items; returns how many were signed."""
+        count = 0
+        for item in items:
+            if hasattr(item, 'multi_txns'):
+                self.sign_multi_transactions(item)
+            else:
+                self.sign_transaction(item)
+            count += 1
+        return count
+
+
 class TransactionSigner:
     """
     Secure transaction signing implementation.
@@ -83,6 +204,7 @@ class TransactionSigner:
         self._private_key_cache = None
         self._key_loaded = False
     
+    @timed("signature.sign")
     def sign_transaction_data(
         self, 
         transaction_data: bytes, 
@@ -120,7 +242,56 @@ class TransactionSigner:
             )
             
             return signature
+
+    @timed("signature.sign")
+    def sign_digest(self, digest: bytes, private_key_pem: bytes) -> bytes:
+        """
+        Sign a SHA-256 digest directly (prehashed ECDSA).
+
+        Used for transaction signatures: the canonical transaction digest is
+        signed as is instead of being hashed again by ECDSA(SHA256).
+        """
+        if not digest or len(digest) != DIGEST_SIZE:
+            raise ValueError("Digest must be a SHA-256 digest")
+        if not private_key_pem:
+            raise ValueError("Private key cannot be empty")
+
+        with SecureMemoryHandler.secure_load_private_key(private_key_pem) as private_key:
+            return private_key.sign(digest, PREHASHED_ECDSA)
+
+    @timed("signature.verify")
+    def verify_digest(self, digest: bytes, signature: bytes, public_key_pem: bytes) -> bool:
+        """Verify a prehashed signature over a SHA-256 digest."""
+        if not digest or len(digest) != DIGEST_SIZE or not signature or not public_key_pem:
+            return False
+        try:
+            public_key = load_pem_public_key(public_key_pem)
+            if not isinstance(public_key, ec.EllipticCurvePublicKey):
+                return False
+            public_key.verify(signature, digest, PREHASHED_ECDSA)
+            return True
+        except (InvalidSignature, ValueError, Exception):
+            return False
+
+    @contextmanager
+    def signing_session(self, private_key_pem: bytes):
+        """
+        Load private_key_pem once and yield a SigningSession for a batch of signatures.
+
+        The key is wiped when the with-block exits; the session can not be
+        used afterwards.
+        """
+        if not private_key_pem:
+            raise ValueError("Private key cannot be empty")
+
+        with SecureMemoryHandler.secure_load_private_key(private_key_pem) as private_key:
+            session = SigningSession(private_key)
+            try:
+                yield session
+            finally:
+                session.close()
     
+    @timed("signature.verify")
     def verify_signature(
         self,
         transaction_data: bytes,
@@ -226,36 +397,16 @@ class SecureTransactionSignature:
             )
         
         # Create deterministic transaction data for signing
-        import json
-        from datetime import datetime
-        
         if timestamp is None:
             timestamp = datetime.now().isoformat()
         
-        transaction_data = {
-            "sender": sender,
-            "recipient": recipient,
-            "nonce": nonce,
-            "timestamp": timestamp,
-            "value": value_data
-        }
-        
-        # Create deterministic JSON representation
-        transaction_json = json.dumps(transaction_data, sort_keys=True, separators=(',', ':'))
-        transaction_bytes = transaction_json.encode('utf-8')
-        
-        # Calculate transaction hash
-        transaction_hash = hashlib.sha256(transaction_bytes).digest()
+        transaction_data = transaction_signable_data(sender, recipient, nonce, value_data, timestamp)
         
-        # Debug: Print the transaction data being used for signing
-        print(f"DEBUG - Transaction data for signing: {transaction_data}")
-        print(f"DEBUG - Transaction JSON: {transaction_json}")
-        print(f"DEBUG - Transaction hash: {transaction_hash.hex()}")
+        # Deterministic JSON representation and its hash
+        _, transaction_hash = signable_hash(transaction_data)
         
-        # Sign the transaction hash
-        signature = self.signer.sign_transaction_data(transaction_hash, private_key_pem)
-        
-        print(f"DEBUG - Generated signature: {signature.hex()}")
+        # Sign the transaction hash (prehashed: the digest is not hashed again)
+        signature = self.signer.sign_digest(transaction_hash, private_key_pem)
         
         return {
             "transaction_data": transaction_data,
@@ -282,37 +433,23 @@ class SecureTransactionSignature:
             True if signature is valid, False otherwise
         """
         try:
-            # Recreate the transaction hash
-            import json
-            
-            # Create deterministic JSON (exclude signature-related fields)
-            signable_data = {
-                "sender": transaction_data["sender"],
-                "recipient": transaction_data["recipient"],
-                "nonce": transaction_data["nonce"],
-                "timestamp": transaction_data["timestamp"],
-                "value": transaction_data["value"]
-            }
-            
-            transaction_json = json.dumps(signable_data, sort_keys=True, separators=(',', ':'))
-            transaction_bytes = transaction_json.encode('utf-8')
-            transaction_hash = hashlib.sha256(transaction_bytes).digest()
-            
-            # Debug: Print the transaction data being used for verification
-            print(f"DEBUG - Signable data for verification: {signable_data}")
-            print(f"DEBUG - Transaction JSON: {transaction_json}")
-            print(f"DEBUG - Transaction hash: {transaction_hash.hex()}")
+            # Recreate the transaction hash (exclude signature-related fields)
+            signable_data = transaction_signable_data(
+                transaction_data["sender"],
+                transaction_data["recipient"],
+                transaction_data["nonce"],
+                transaction_data["value"],
+                transaction_data["timestamp"]
+            )
+            _, transaction_hash = signable_hash(signable_data)
             
             # Convert hex signature to bytes
             signature = bytes.fromhex(signature_hex)
             
             # Verify signature
-            result = self.signer.verify_signature(transaction_hash, signature, public_key_pem)
-            print(f"DEBUG - Signature verification result: {result}")
-            return result
+            return self.signer.verify_digest(transaction_hash, signature, public_key_pem)
             
-        except (KeyError, ValueError, Exception) as e:
-            print(f"DEBUG - Exception during verification: {e}")
+        except (KeyError, ValueError, Exception):
             return False
     
     def sign_multi_transaction(
@@ -342,28 +479,16 @@ class SecureTransactionSignature:
             )
         
         # Create deterministic multi-transaction data for signing
-        import json
-        from datetime import datetime
-        
         if timestamp is None:
             timestamp = datetime.now().isoformat()
         
-        multi_transaction_data = {
-            "sender": sender,
-            "timestamp": timestamp,
-            "transactions": transactions,
-            "type": "multi_transaction"
-        }
-        
-        # Create deterministic JSON representation
-        transaction_json = json.dumps(multi_transaction_data, sort_keys=True, separators=(',', ':'))
-        transaction_bytes = transaction_json.encode('utf-8')
+        multi_transaction_data = multi_transaction_signable_data(sender, transactions, timestamp)
         
         # Calculate multi-transaction hash
-        transaction_hash = hashlib.sha256(transaction_bytes).digest()
+        _, transaction_hash = signable_hash(multi_transaction_data)
         
-        # Sign the multi-transaction hash
-        signature = self.signer.sign_transaction_data(transaction_hash, private_key_pem)
+        # Sign the multi-transaction hash (prehashed)
+        signature = self.signer.sign_digest(transaction_hash, private_key_pem)
         
         return {
             "multi_transaction_data": multi_transaction_data,
@@ -390,30 +515,58 @@ class SecureTransactionSignature:
             True if signature is valid, False otherwise
         """
         try:
-            # Recreate the multi-transaction hash
-            import json
-            
-            # Create deterministic JSON (exclude signature-related fields)
-            signable_data = {
-                "sender": multi_transaction_data["sender"],
-                "timestamp": multi_transaction_data["timestamp"],
-                "transactions": multi_transaction_data["transactions"],
-                "type": "multi_transaction"
-            }
-            
-            transaction_json = json.dumps(signable_data, sort_keys=True, separators=(',', ':'))
-            transaction_bytes = transaction_json.encode('utf-8')
-            transaction_hash = hashlib.sha256(transaction_bytes).digest()
+            # Recreate the multi-transaction hash (exclude signature-related fields)
+            signable_data = multi_transaction_signable_data(
+                multi_transaction_data["sender"],
+                multi_transaction_data["transactions"],
+                multi_transaction_data["timestamp"]
+            )
+            _, transaction_hash = signable_hash(signable_data)
             
             # Convert hex signature to bytes
             signature = bytes.fromhex(signature_hex)
             
             # Verify signature
-            return self.signer.verify_signature(transaction_hash, signature, public_key_pem)
+            return self.signer.verify_digest(transaction_hash, signature, public_key_pem)
             
         except (KeyError, ValueError, Exception):
             return False
     
+    def sign_digest(self, digest: bytes, private_key_pem: bytes) -> bytes:
+        """
+        Sign an already computed transaction digest (e.g. Transaction.tx_hash).
+
+        Returns:
+            Signature bytes
+        """
+        if self._security_warnings_enabled:
+            warnings.warn(
+                "Private key is being loaded into memory. "
+                "Ensure this is called in a secure environment.",
+                UserWarning
+            )
+        return self.signer.sign_digest(digest, private_key_pem)
+
+    def verify_digest(self, digest: bytes, signature: bytes, public_key_pem: bytes) -> bool:
+        """Verify a signature over an already computed transaction digest."""
+        return self.signer.verify_digest(digest, signature, public_key_pem)
+
+    @contextmanager
+    def signing_session(self, private_key_pem: bytes):
+        """
+        Signing session for a batch of transactions (see TransactionSigner.signing_session).
+
+        The security warning is issued once per session instead of once per signature.
+        """
+        if self._security_warnings_enabled:
+            warnings.warn(
+                "Private key is being loaded into memory. "
+                "Ensure this is called in a secure environment.",
+                UserWarning
+            )
+        with self.signer.signing_session(private_key_pem) as session:
+            yield session
+    
     def disable_security_warnings(self) -> None:
         """Disable security warnings (use with caution)."""
         self._security_warnings_enabled = False
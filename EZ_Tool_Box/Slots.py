@@ -0,0 +1,45 @@
+"""
+Pickle support for classes that store their attributes in __slots__.
+
+The hot objects (Value, ValueNode, Transaction, MerkleTreeNode, ProofUnit)
+used to keep a per-instance __dict__ and are pickled into the transaction
+pool database, VPB checkpoints and bundles. A slotted class cannot load
+those older pickles by default, because pickle hands it a plain dict as the
+state. SlottedPickleMixin.__setstate__ accepts that legacy dict as well as
+the (dict_state, slot_state) pair that new pickles carry.
+"""
+
+from typing import Dict, FrozenSet
+
+_slot_names: Dict[type, FrozenSet[str]] = {}
+
+
+def slot_names(cls: type) -> FrozenSet[str]:
+    """Every slot declared by cls and its bases."""
+    names = _slot_names.get(cls)
+    if names is None:
+        names = set()
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get('__slots__', ())
+            names.update((slots,) if isinstance(slots, str) else slots)
+        names = frozenset(names)
+        _slot_names[cls] = names
+    return names
+
+
+class SlottedPickleMixin:
+    """Restores slotted instances from both slot state and legacy __dict__ state."""
+
+    __slots__ = ()
+
+    def __setstate__(self, state) -> None:
+        if isinstance(state, tuple) and len(state) == 2:
+            dict_state, slot_state = state
+        else:
+            dict_state, slot_state = state, None
+        names = slot_names(type(self))
+        for source in (dict_state, slot_state):
+            for name, value in (source or {}).items():
+                # attributes an older version had but the class no longer declares are dropped
+                if name in names:
+                    object.__setattr__(self, name, value)
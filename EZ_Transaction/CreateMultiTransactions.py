@@ -42,7 +42,8 @@ class CreateMultiTransactions:
         self,
         transaction_requests: List[Dict[str, Any]],
         private_key_pem: bytes,
-        base_nonce: Optional[int] = None
+        base_nonce: Optional[int] = None,
+        aggregate: bool = False
     ) -> Dict[str, Any]:
         """
         Create multiple transactions as a single MultiTransactions batch.
@@ -51,6 +52,8 @@ class CreateMultiTransactions:
             transaction_requests: List of transaction requests with 'recipient' and 'amount'
             private_key_pem: Private key in PEM format for signing
             base_nonce: Base nonce for transactions (auto-generated if None)
+            aggregate: Sign only the MultiTransactions, over the Merkle root of the inner
+                transaction hashes (one signature per batch instead of 2N+1)
             
         Returns:
             Dictionary containing MultiTransactions data and metadata
@@ -99,9 +102,6 @@ class CreateMultiTransactions:
                 time=timestamp
             )
             
-            # Sign the main transaction
-            main_transaction.sig_txn(private_key_pem)
-            
             # Handle change transaction if needed
             change_txn_obj = None
             if change_value:
@@ -113,9 +113,6 @@ class CreateMultiTransactions:
                     value=[change_value],
                     time=timestamp
                 )
-                
-                # Sign the change transaction
-                change_transaction.sig_txn(private_key_pem)
                 change_txn_obj = change_transaction
                 change_values_list.append(change_value)
             
@@ -135,8 +132,12 @@ class CreateMultiTransactions:
         # Set the timestamp
         multi_txn.time = timestamp
         
-        # Sign the MultiTransactions
-        multi_txn.sig_acc_txn(private_key_pem)
+        # Sign every transaction and the MultiTransactions in one session (the key is loaded once)
+        with secure_signature_handler.signing_session(private_key_pem) as session:
+            if aggregate:
+                session.sign_aggregate_multi_transactions(multi_txn)
+            else:
+                session.sign_batch(transactions + [multi_txn])
         
         # Commit all selected values
         self.value_selector.commit_transaction_values(selected_values_list)
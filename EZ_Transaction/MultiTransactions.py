@@ -15,7 +15,11 @@ import os
 sys.path.insert(0, os.path.dirname(__file__) + '/..')
 
 from EZ_Tool_Box.Hash import sha256_hash
-from EZ_Tool_Box.SecureSignature import secure_signature_handler
+from EZ_Tool_Box.SecureSignature import (secure_signature_handler, signable_hash,
+                                         multi_transaction_signable_data,
+                                         aggregate_multi_transaction_signable_data)
+from EZ_Block_Units.MerkleTree import MerkleTree
+from EZ_Block_Units.MerkleProof import MerkleTreeProof
 from .SingleTransaction import Transaction
 
 class MultiTransactions:
@@ -37,6 +41,8 @@ class MultiTransactions:
         self.time = datetime.datetime.now().isoformat()  # Record timestamp in ISO format
         self.signature: Optional[bytes] = None
         self.digest: Optional[str] = None
+        # Merkle root of the inner tx_hashes when aggregate-signed (None: every transaction is signed)
+        self.txns_root: Optional[str] = None
 
     def encode(self) -> bytes:
         """
@@ -51,7 +57,8 @@ class MultiTransactions:
             'multi_txns': self.multi_txns,
             'time': self.time,
             'signature': self.signature,
-            'digest': self.digest
+            'digest': self.digest,
+            'txns_root': self.txns_root
         })
         return encoded_data
 
@@ -76,6 +83,7 @@ class MultiTransactions:
         multi_txn.time = decoded_data.get('time')
         multi_txn.signature = decoded_data.get('signature')
         multi_txn.digest = decoded_data.get('digest')
+        multi_txn.txns_root = decoded_data.get('txns_root')
         
         return multi_txn
 
@@ -83,36 +91,53 @@ class MultiTransactions:
         """
         Calculate and set the digest for the multi-transaction.
         """
-        digest = sha256_hash(self.encode())
-        self.digest = digest
+        self.digest = self.compute_digest()
 
-    def sig_acc_txn(self, load_private_key: bytes) -> None:
+    def compute_digest(self) -> str:
         """
-        Sign the multi-transaction with the provided private key using secure signature handler.
-        
-        Args:
-            load_private_key: Private key in PEM format for signing
+        Recompute the digest from the contents: the hash the signature covers,
+        which is also the Merkle leaf of this MultiTransactions in a block.
+        An aggregate digest commits to the recomputed root of the inner transactions.
         """
-        # Check if multi_txns is empty
-        if not self.multi_txns:
-            raise ValueError("Cannot sign empty transaction list")
-        
-        # Prepare multi-transaction data for signing
-        transactions_data = [
+        if self.is_aggregate:
+            signable_data = aggregate_multi_transaction_signable_data(self.sender, self.compute_txns_root(), self.time)
+        else:
+            signable_data = multi_transaction_signable_data(self.sender, self._transactions_data_for_signing(),
+                                                            self.time)
+        return signable_hash(signable_data)[1].hex()
+
+    def check_digest(self) -> bool:
+        """Check that digest matches the transactions it claims to cover."""
+        return self.digest is not None and self.digest == self.compute_digest()
+
+    def _transactions_data_for_signing(self) -> list:
+        """Per-transaction data covered by the multi-transaction signature (value state excluded)."""
+        return [
             {
                 "sender": txn.sender,
                 "recipient": txn.recipient,
                 "nonce": txn.nonce,
                 "timestamp": txn.time,
-                "value": txn._serialize_values() if hasattr(txn, '_serialize_values') else []
+                "value": txn._serialize_values_for_signing() if hasattr(txn, '_serialize_values_for_signing') else []
             }
             for txn in self.multi_txns
         ]
+
+    def sig_acc_txn(self, load_private_key: bytes) -> None:
+        """
+        Sign the multi-transaction with the provided private key using secure signature handler.
+        
+        Args:
+            load_private_key: Private key in PEM format for signing
+        """
+        # Check if multi_txns is empty
+        if not self.multi_txns:
+            raise ValueError("Cannot sign empty transaction list")
         
         # Use secure signature handler for multi-transaction signing
         signature_result = secure_signature_handler.sign_multi_transaction(
             sender=self.sender,
-            transactions=transactions_data,
+            transactions=self._transactions_data_for_signing(),
             private_key_pem=load_private_key,
             timestamp=self.time
         )
@@ -120,6 +145,51 @@ class MultiTransactions:
         # Set the signature and digest from the secure handler result
         self.signature = bytes.fromhex(signature_result["signature"])
         self.digest = signature_result["transaction_hash"]
+        self.txns_root = None
+
+    @property
+    def is_aggregate(self) -> bool:
+        """True when the signature covers the Merkle root of the inner transactions instead of each of them."""
+        return getattr(self, 'txns_root', None) is not None
+
+    def _txn_leaves(self, trusted: bool = False) -> List[str]:
+        # trusted: use the cached tx_hash (signer side); otherwise recompute it from the fields
+        return [(txn.tx_hash if trusted else txn._calculate_hash()).hex() for txn in self.multi_txns]
+
+    def compute_txns_root(self, trusted: bool = False) -> str:
+        """Merkle root over the tx_hash of every inner transaction, in order."""
+        return MerkleTree(self._txn_leaves(trusted)).get_root_hash()
+
+    def check_txns_root(self) -> bool:
+        """Recompute the inner transaction Merkle root and compare it with txns_root."""
+        return bool(self.multi_txns) and self.txns_root == self.compute_txns_root()
+
+    def get_txn_inclusion_proof(self, index: int) -> List[str]:
+        """Merkle proof (MerkleTreeProof list format) that transaction index is committed by txns_root."""
+        if not self.is_aggregate:
+            raise ValueError("MultiTransactions is not aggregate-signed")
+        return MerkleTree(self._txn_leaves()).prf_list[index]
+
+    @staticmethod
+    def check_txn_inclusion(txn: Transaction, proof: List[str], txns_root: str) -> bool:
+        """Check that txn is committed by an aggregate signature's txns_root."""
+        return MerkleTreeProof(proof).check_prf(txn._calculate_hash().hex(), txns_root)
+
+    def sig_acc_txn_aggregate(self, load_private_key: bytes) -> None:
+        """
+        Aggregate-sign the multi-transaction: one signature over the Merkle root of the
+        inner transaction hashes, so the inner transactions need no signatures of their own.
+        
+        Args:
+            load_private_key: Private key in PEM format for signing
+        """
+        if not self.multi_txns:
+            raise ValueError("Cannot sign empty transaction list")
+        
+        self.txns_root = self.compute_txns_root(trusted=True)
+        _, digest = signable_hash(aggregate_multi_transaction_signable_data(self.sender, self.txns_root, self.time))
+        self.signature = secure_signature_handler.sign_digest(digest, load_private_key)
+        self.digest = digest.hex()
 
     def check_acc_txn_sig(self, load_public_key: bytes) -> bool:
         """
@@ -134,20 +204,18 @@ class MultiTransactions:
         if self.signature is None or self.digest is None:
             return False
         
+        if self.is_aggregate:
+            # One signature check; the inner transactions are authenticated by the recomputed root
+            if not self.check_txns_root():
+                return False
+            _, digest = signable_hash(aggregate_multi_transaction_signable_data(self.sender, self.txns_root, self.time))
+            return secure_signature_handler.verify_digest(digest, self.signature, load_public_key)
+        
         # Prepare multi-transaction data for verification
         multi_transaction_data = {
             "sender": self.sender,
             "timestamp": self.time,
-            "transactions": [
-                {
-                    "sender": txn.sender,
-                    "recipient": txn.recipient,
-                    "nonce": txn.nonce,
-                    "timestamp": txn.time,
-                    "value": txn._serialize_values() if hasattr(txn, '_serialize_values') else []
-                }
-                for txn in self.multi_txns
-            ],
+            "transactions": self._transactions_data_for_signing(),
             "type": "multi_transaction"
         }
         
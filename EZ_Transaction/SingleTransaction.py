@@ -13,10 +13,13 @@ from cryptography.exceptions import InvalidSignature
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from EZ_Tool_Box.Hash import sha256_hash
-from EZ_Tool_Box.SecureSignature import secure_signature_handler
+from EZ_Tool_Box.SecureSignature import secure_signature_handler, signable_hash, transaction_signable_data
+from EZ_Tool_Box.Slots import SlottedPickleMixin
 from EZ_Value import Value
 
-class Transaction:
+class Transaction(SlottedPickleMixin):
+    __slots__ = ('sender', 'recipient', 'nonce', 'signature', 'value', 'time', 'tx_hash')
+
     def __init__(self, sender: str, recipient: str, nonce: int, signature: Optional[bytes], value: List[Value], time: Optional[str]):
         self.sender = sender
         self.recipient = recipient
@@ -28,24 +31,16 @@ class Transaction:
         self.tx_hash = self._calculate_hash()
 
     def _calculate_hash(self) -> bytes:
-        """Calculate hash of the transaction using deterministic JSON serialization."""
-        import json
-        
-        # Create a deterministic representation for hashing
+        """
+        Calculate the canonical transaction digest.
+
+        This is the same digest the signature covers (deterministic JSON of the
+        signable fields, Value state excluded), so tx_hash is signed directly.
+        """
         # Exclude signature and tx_hash as they are results of this hash
-        txn_data = {
-            "sender": self.sender,
-            "recipient": self.recipient,
-            "nonce": self.nonce,
-            "time": self.time,
-            "value": self._serialize_values()
-        }
-        
-        # Use sorted keys and ensure consistent serialization
-        txn_json = json.dumps(txn_data, sort_keys=True, separators=(',', ':'))
-        
-        # Calculate SHA256 hash
-        return hashlib.sha256(txn_json.encode('utf-8')).digest()
+        _, digest = signable_hash(transaction_signable_data(
+            self.sender, self.recipient, self.nonce, self._serialize_values_for_signing(), self.time))
+        return digest
     
     def _serialize_values(self) -> list:
         """Serialize Value objects for deterministic hashing."""
@@ -97,18 +92,8 @@ class Transaction:
 
     def sig_txn(self, load_private_key: bytes) -> None:
         """Sign the transaction with the provided private key using secure signature handler."""
-        # Use secure signature handler with signature-safe serialization
-        signature_result = secure_signature_handler.sign_transaction(
-            sender=self.sender,
-            recipient=self.recipient,
-            nonce=self.nonce,
-            value_data=self._serialize_values_for_signing(),
-            private_key_pem=load_private_key,
-            timestamp=self.time
-        )
-        
-        # Set the signature from the secure handler result
-        self.signature = bytes.fromhex(signature_result["signature"])
+        # tx_hash is the canonical signing digest, so it is signed as is (prehashed)
+        self.signature = secure_signature_handler.sign_digest(self.tx_hash, load_private_key)
 
     def is_sent_to_self(self) -> bool:
         """Check if the transaction is sent to the same sender."""
@@ -119,28 +104,8 @@ class Transaction:
         if self.signature is None:
             return False
         
-        # Prepare transaction data for verification - must match the structure used during signing
-        transaction_data = {
-            "sender": self.sender,
-            "recipient": self.recipient,
-            "nonce": self.nonce,
-            "timestamp": self.time,
-            "value": self._serialize_values_for_signing()
-        }
-        
-        # Debug: Print the transaction data being used for verification
-        print(f"DEBUG - Transaction data for verification: {transaction_data}")
-        print(f"DEBUG - Signature: {self.signature.hex()}")
-        
-        # Use secure signature handler for verification
-        result = secure_signature_handler.verify_transaction_signature(
-            transaction_data=transaction_data,
-            signature_hex=self.signature.hex(),
-            public_key_pem=load_public_key
-        )
-        
-        print(f"DEBUG - Verification result: {result}")
-        return result
+        # Recompute the digest from the fields: a received tx_hash is not trusted
+        return secure_signature_handler.verify_digest(self._calculate_hash(), self.signature, load_public_key)
 
     def get_values(self) -> List[Value]:
         """Get the list of values in this transaction."""
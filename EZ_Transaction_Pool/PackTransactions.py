@@ -20,7 +20,9 @@ from EZ_Transaction_Pool.TransactionPool import TransactionPool
 from EZ_Transaction.MultiTransactions import MultiTransactions
 from EZ_Transaction.SingleTransaction import Transaction
 from EZ_Main_Chain.Block import Block
+from EZ_Main_Chain.BlockTransactionIndex import BlockTransactionIndex, leaf_digest
 from EZ_Block_Units.MerkleTree import MerkleTree
+from EZ_Block_Units.Bloom import optimal_bloom_parameters
 from EZ_Tool_Box.Hash import sha256_hash
 
 
@@ -31,6 +33,7 @@ class PackagedBlockData:
     merkle_root: str  # 默克尔根（由MultiTransactions的digest构成）
     sender_addresses: List[str]  # 发送者地址列表（用于布隆过滤器）
     package_time: datetime.datetime  # 打包时间
+    tx_index: Optional[BlockTransactionIndex] = None  # 发送者 -> 默克尔叶子位置索引，随区块保存
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -45,14 +48,16 @@ class PackagedBlockData:
 class TransactionPackager:
     """交易打包器，专为Block.py设计"""
     
-    def __init__(self, max_multi_txns_per_block: int = 100):
+    def __init__(self, max_multi_txns_per_block: int = 100, bloom_false_positive_rate: float = 0.001):
         """
         初始化交易打包器
         
         Args:
             max_multi_txns_per_block: 每个区块最大多重交易数量
+            bloom_false_positive_rate: 区块布隆过滤器的目标误判率（过滤器大小按实际发送者数量计算）
         """
         self.max_multi_txns_per_block = max_multi_txns_per_block
+        self.bloom_false_positive_rate = bloom_false_positive_rate
     
     def package_transactions(self, transaction_pool: TransactionPool, 
                            selection_strategy: str = "fifo") -> PackagedBlockData:
@@ -87,14 +92,15 @@ class TransactionPackager:
             # 提取发送者地址（用于布隆过滤器）
             sender_addresses = self._extract_sender_addresses(selected_multi_txns)
             
-            # 构建默克尔树（使用MultiTransactions的digest）
-            merkle_root = self._build_merkle_tree(selected_multi_txns)
+            # 构建默克尔树（使用MultiTransactions的digest），同时建立发送者索引
+            tx_index = BlockTransactionIndex.from_multi_txns(selected_multi_txns)
             
             return PackagedBlockData(
                 selected_multi_txns=selected_multi_txns,
-                merkle_root=merkle_root,
+                merkle_root=tx_index.merkle_root,
                 sender_addresses=sender_addresses,
-                package_time=datetime.datetime.now()
+                package_time=datetime.datetime.now(),
+                tx_index=tx_index
             )
             
         except Exception as e:
@@ -152,13 +158,8 @@ class TransactionPackager:
             return ""
         
         # 使用多重交易的digest作为默克尔树的叶子节点
-        leaf_hashes = []
-        for multi_txn in multi_txns:
-            if multi_txn.digest:
-                leaf_hashes.append(multi_txn.digest)
-            else:
-                # 如果没有digest，使用编码后的数据哈希
-                leaf_hashes.append(sha256_hash(multi_txn.encode()))
+        # 如果没有digest，使用编码后的数据哈希
+        leaf_hashes = [leaf_digest(multi_txn) for multi_txn in multi_txns]
         
         # 构建默克尔树
         merkle_tree = MerkleTree(leaf_hashes)
@@ -180,12 +181,19 @@ class TransactionPackager:
         Returns:
             Block: 创建的区块对象
         """
+        # 按发送者数量和目标误判率确定布隆过滤器参数，避免固定分配1Mbit
+        bloom_size, bloom_hash_count = optimal_bloom_parameters(
+            len(package_data.sender_addresses), self.bloom_false_positive_rate
+        )
+        
         # 创建区块
         block = Block(
             index=block_index,
             m_tree_root=package_data.merkle_root,
             miner=miner_address,
             pre_hash=previous_hash,
+            bloom_size=bloom_size,
+            bloom_hash_count=bloom_hash_count,
             time=package_data.package_time
         )
         
@@ -193,6 +201,9 @@ class TransactionPackager:
         for sender in package_data.sender_addresses:
             block.add_item_to_bloom(sender)
         
+        if package_data.tx_index is not None:
+            package_data.tx_index.block_index = block_index
+        
         return block
     
     def remove_packaged_transactions(self, transaction_pool: TransactionPool, 
@@ -20,6 +20,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from EZ_Transaction.MultiTransactions import MultiTransactions
 from EZ_Transaction.SingleTransaction import Transaction
 from EZ_Tool_Box.Hash import sha256_hash
+from EZ_Tool_Box.Metrics import metrics, timed
+
+_admitted_counter = metrics.counter("pool.admitted")
+_rejected_counter = metrics.counter("pool.rejected")
+_duplicates_counter = metrics.counter("pool.duplicates")
+_mark_processed_timer = metrics.timer("pool.sqlite.mark_processed")
 
 
 @dataclass
@@ -267,6 +273,7 @@ class TransactionPool:
             self.sender_index[multi_txn.sender].append(i)
             self.digest_index[multi_txn.digest] = i
 
+    @timed("pool.sqlite.persist")
     def _persist_to_database(self, multi_txn: MultiTransactions, validation_result: ValidationResult):
         """Persist MultiTransactions and validation result to database"""
         try:
@@ -315,7 +322,12 @@ class TransactionPool:
         Perform formal validation of MultiTransactions:
         1) All transactions in the MultiTransactions must come from the same Sender
         2) All transaction signatures must be correct (Sender signature)
-        3) Other data structural correctness
+        3) The digest must be the one computed from the transactions
+        4) Other data structural correctness
+
+        An aggregate-signed MultiTransactions (txns_root set) is checked with a single
+        signature over the Merkle root of its inner transaction hashes; the inner
+        transactions then need no signatures of their own.
         """
         validation_result = ValidationResult(is_valid=True)
         
@@ -379,11 +391,18 @@ class TransactionPool:
                     validation_result.error_message = f"Signature verification error: {str(e)}"
                     validation_result.signature_valid = False
                     return validation_result
+            elif multi_txn.is_aggregate and not multi_txn.check_txns_root():
+                # Without a key at least the inner transactions must match the signed root
+                # (check_acc_txn_sig recomputes it otherwise)
+                validation_result.is_valid = False
+                validation_result.error_message = "MultiTransactions transaction root mismatch"
+                validation_result.signature_valid = False
+                return validation_result
             
             validation_result.signature_valid = True
             
-            # 5. Validate individual transaction signatures
-            for i, txn in enumerate(multi_txn.multi_txns):
+            # 5. Validate individual transaction signatures (covered by the root when aggregate-signed)
+            for i, txn in enumerate([] if multi_txn.is_aggregate else multi_txn.multi_txns):
                 if txn.signature is None:
                     validation_result.is_valid = False
                     validation_result.error_message = f"Transaction {i} signature is missing"
@@ -401,7 +420,15 @@ class TransactionPool:
                         validation_result.error_message = f"Transaction {i} signature verification error: {str(e)}"
                         return validation_result
             
-            # 6. Check for duplicates in current pool
+            # 6. The pool indexes entries by digest and blocks commit it as the Merkle leaf, but an
+            # aggregate signature covers (sender, txns_root, time) only: recompute the digest
+            if not multi_txn.check_digest():
+                validation_result.is_valid = False
+                validation_result.error_message = "MultiTransactions digest does not match its transactions"
+                validation_result.structural_valid = False
+                return validation_result
+            
+            # 7. Check for duplicates in current pool
             if multi_txn.digest in self.digest_index:
                 validation_result.is_valid = False
                 validation_result.error_message = "Duplicate MultiTransactions found"
@@ -417,6 +444,7 @@ class TransactionPool:
         
         return validation_result
 
+    @timed("pool.admission")
     def add_multi_transactions(self, multi_txn: MultiTransactions, public_key_pem: bytes = None) -> Tuple[bool, str]:
         """
         Add MultiTransactions to the pool after validation
@@ -432,8 +460,10 @@ class TransactionPool:
                 # Check if it's a duplicate
                 if validation_result.duplicates_found:
                     self.stats['duplicates'] += 1
+                    _duplicates_counter.inc()
                 else:
                     self.stats['invalid_received'] += 1
+                    _rejected_counter.inc()
                 return False, validation_result.error_message
             
             # Add to pool
@@ -451,6 +481,7 @@ class TransactionPool:
                 self._persist_to_database(multi_txn, validation_result)
             
             self.stats['valid_received'] += 1
+            _admitted_counter.inc()
             return True, "MultiTransactions added successfully"
             
         except Exception as e:
@@ -472,6 +503,7 @@ class TransactionPool:
             
             return self.pool[self.digest_index[digest]]
 
+    @timed("pool.remove")
     def remove_multi_transactions(self, digest: str) -> bool:
         """Remove MultiTransactions from pool by digest"""
         try:
@@ -499,13 +531,14 @@ class TransactionPool:
                 # Mark as processed in database
                 try:
                     import sqlite3
-                    conn = sqlite3.connect(self.db_path)
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        UPDATE multi_transactions SET processed = TRUE WHERE digest = ?
-                    ''', (digest,))
-                    conn.commit()
-                    conn.close()
+                    with _mark_processed_timer.time():
+                        conn = sqlite3.connect(self.db_path)
+                        cursor = conn.cursor()
+                        cursor.execute('''
+                            UPDATE multi_transactions SET processed = TRUE WHERE digest = ?
+                        ''', (digest,))
+                        conn.commit()
+                        conn.close()
                 except Exception as e:
                     print(f"Database update error: {e}")
                 
@@ -8,12 +8,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from EZ_Value.Value import Value, ValueState
 from EZ_Value.AccountValueCollection import AccountValueCollection
 from EZ_Transaction.SingleTransaction import Transaction
+from EZ_Tool_Box.Metrics import metrics, timed
+
+_selected_values_histogram = metrics.histogram("account.pick_values.selected")
 
 class AccountPickValues:
     """增强版Value选择器，基于AccountValueCollection实现高效调度"""
     
-    def __init__(self, account_address: str):
-        self.account_collection = AccountValueCollection(account_address)
+    def __init__(self, account_address: str, collection_class=AccountValueCollection):
+        # collection_class可替换为ColumnarValueCollection（列式存储，适合超大账户）
+        self.account_collection = collection_class(account_address)
         
     def add_values_from_list(self, values: List[Value]) -> int:
         """从Value列表批量添加Value"""
@@ -23,6 +27,7 @@ class AccountPickValues:
                 added_count += 1
         return added_count
     
+    @timed("account.pick_values")
     def pick_values_for_transaction(self, required_amount: int, sender: str, recipient: str, 
                                  nonce: int, time: int) -> Tuple[List[Value], Optional[Value], Optional[Transaction], Optional[Transaction]]:
         """为交易选择Value，返回选中的值、找零、找零交易、主交易"""
@@ -63,7 +68,7 @@ class AccountPickValues:
             
             # 在AccountValueCollection中找到对应的节点并分裂
             node_id = self._find_node_by_value(last_value)
-            if node_id:
+            if node_id is not None:
                 v1, v2 = self.account_collection.split_value(node_id, change_amount)
                 
                 if v1 and v2:
@@ -107,6 +112,7 @@ class AccountPickValues:
         # 将选中的Value状态更新为SELECTED
         for value in selected_values:
             self._update_value_state(value, ValueState.SELECTED)
+        _selected_values_histogram.observe(len(selected_values))
             
         return selected_values, change_value, change_transaction, main_transaction
     
@@ -144,7 +150,7 @@ class AccountPickValues:
     
     def cleanup_confirmed_values(self) -> int:
         """清除已确认的Value"""
-        count = len(self.account_collection._state_index[ValueState.CONFIRMED])
+        count = self.account_collection.count_by_state(ValueState.CONFIRMED)
         self.account_collection.clear_spent_values()
         return count
     
@@ -152,18 +158,18 @@ class AccountPickValues:
         """验证账户完整性"""
         return self.account_collection.validate_no_overlap()
     
-    def _find_node_by_value(self, target_value: Value) -> Optional[str]:
+    def _find_node_by_value(self, target_value: Value) -> Optional[int]:
         """根据Value找到对应的node_id"""
-        for node_id, node in self.account_collection._index_map.items():
-            if node.value.is_same_value(target_value):
-                return node_id
-        return None
+        return self.account_collection.find_node_id(target_value)
     
     def _update_value_state(self, value: Value, new_state: ValueState) -> bool:
         """更新Value状态"""
         node_id = self._find_node_by_value(value)
-        if node_id:
-            return self.account_collection.update_value_state(node_id, new_state)
+        if node_id is not None:
+            updated = self.account_collection.update_value_state(node_id, new_state)
+            # 列式集合返回的是Value副本，同步更新调用方持有的对象（需在集合更新之后，以免跳过状态索引更新）
+            value.set_state(new_state)
+            return updated
         return False
     
     # 暂时不需要使用合并功能（EZchain系统暂不提供此功能）
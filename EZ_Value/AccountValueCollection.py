@@ -1,14 +1,20 @@
 from typing import List, Tuple, Optional, Set, Dict
 from collections import defaultdict
-import uuid
+import itertools
 
 from EZ_Value.Value import Value, ValueState
+from EZ_Tool_Box.Slots import SlottedPickleMixin
 
-class ValueNode:
+_node_ids = itertools.count(1)  # 进程内递增的节点id，比uuid字符串省内存且哈希更快
+
+
+class ValueNode(SlottedPickleMixin):
     """链表节点，用于管理Value及其索引"""
-    def __init__(self, value: Value, node_id: str = None):
+    __slots__ = ('value', 'node_id', 'next', 'prev')
+
+    def __init__(self, value: Value, node_id: int = None):
         self.value = value
-        self.node_id = node_id or str(uuid.uuid4())
+        self.node_id = node_id if node_id is not None else next(_node_ids)
         self.next = None
         self.prev = None
         
@@ -54,7 +60,7 @@ class AccountValueCollection:
         
         return True
     
-    def remove_value(self, node_id: str) -> bool:
+    def remove_value(self, node_id: int) -> bool:
         """根据node_id移除Value"""
         if node_id not in self._index_map:
             return False
@@ -86,6 +92,22 @@ class AccountValueCollection:
         
         return True
     
+    def get_value(self, node_id: int) -> Optional[Value]:
+        """根据node_id获取Value"""
+        node = self._index_map.get(node_id)
+        return node.value if node else None
+
+    def find_node_id(self, target: Value) -> Optional[int]:
+        """查找与target完全相同（区间相同）的Value的node_id"""
+        for node_id, node in self._index_map.items():
+            if node.value.is_same_value(target):
+                return node_id
+        return None
+
+    def count_by_state(self, state: ValueState) -> int:
+        """统计指定状态的Value数量"""
+        return len(self._state_index.get(state, ()))
+
     def find_by_state(self, state: ValueState) -> List[Value]:
         """根据状态查找所有Value"""
         node_ids = self._state_index.get(state, set())
@@ -120,7 +142,7 @@ class AccountValueCollection:
             
         return result
     
-    def split_value(self, node_id: str, change: int) -> Tuple[Optional[Value], Optional[Value]]:
+    def split_value(self, node_id: int, change: int) -> Tuple[Optional[Value], Optional[Value]]:
         """分裂指定Value"""
         if node_id not in self._index_map:
             return None, None
@@ -158,7 +180,7 @@ class AccountValueCollection:
         return v1, v2
     
     # 暂时不需要使用合并功能（EZchain系统暂不提供此功能）
-    def merge_adjacent_values(self, node_id1: str, node_id2: str) -> Optional[Value]:
+    def merge_adjacent_values(self, node_id1: int, node_id2: int) -> Optional[Value]:
         """合并两个相邻的Value"""
         if node_id1 not in self._index_map or node_id2 not in self._index_map:
             return None
@@ -183,7 +205,7 @@ class AccountValueCollection:
         
         return merged_value
     
-    def update_value_state(self, node_id: str, new_state: ValueState) -> bool:
+    def update_value_state(self, node_id: int, new_state: ValueState) -> bool:
         """更新Value状态"""
         if node_id not in self._index_map:
             return False
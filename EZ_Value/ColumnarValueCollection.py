@@ -0,0 +1,290 @@
+from typing import List, Tuple, Optional
+from array import array
+import sys
+import os
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EZ_Value.Value import Value, ValueState
+
+_FREE = 0  # 空闲槽位的状态码
+_STATE_CODES = {state: code for code, state in enumerate(ValueState, start=1)}
+_CODE_STATES = {code: state for state, code in _STATE_CODES.items()}
+_NIL = -1  # 链表结束标记
+_NARROW_LIMIT = 1 << 62  # 所有index都小于此值时使用int64列，否则扩展为Python整数(object)列
+_LOW_MASK = (1 << 32) - 1
+
+
+def _make_value(begin: int, end: int, state: ValueState) -> Value:
+    """由列中的十进制区间直接构造Value（区间已校验过，跳过构造函数中的正则检查）"""
+    value = Value.__new__(Value)
+    value.begin_index = hex(begin)
+    value.value_num = end - begin + 1
+    value.state = state
+    value.end_index = hex(end)
+    return value
+
+
+class ColumnarValueCollection:
+    """
+    账户Value集合的列式实现，接口与AccountValueCollection相同。
+
+    每个Value占用并行数组中的一个槽位：begin/end（十进制区间）、state（状态码，0为空闲）、
+    next/prev（槽位组成的双向链表，保持与AccountValueCollection相同的顺序）。删除的槽位进入
+    空闲列表供后续复用，node_id即槽位号，因此已删除Value的node_id可能被新Value重用。
+    余额与重叠检查在整列上向量化计算；Value对象只在查询返回时按需构造，修改返回的Value
+    不会影响集合，状态变更需通过update_value_state。
+    """
+
+    def __init__(self, account_address: str, capacity: int = 1024):
+        self.account_address = account_address
+        capacity = max(1, capacity)
+        self._begin = np.zeros(capacity, dtype=np.int64)
+        self._end = np.zeros(capacity, dtype=np.int64)
+        self._state = np.zeros(capacity, dtype=np.uint8)
+        self._next = np.full(capacity, _NIL, dtype=np.int64)
+        self._prev = np.full(capacity, _NIL, dtype=np.int64)
+        self._free = array('q')  # 空闲槽位栈
+        self._used = 0  # 曾经使用过的最高槽位数
+        self.head = _NIL  # 链表头槽位
+        self.tail = _NIL  # 链表尾槽位
+        self.size = 0
+
+    # ---- 槽位管理
+
+    def _grow(self) -> None:
+        capacity = len(self._state) * 2
+        for name, fill in (('_begin', 0), ('_end', 0), ('_state', _FREE), ('_next', _NIL), ('_prev', _NIL)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _widen(self) -> None:
+        """出现超过int64范围的index时，将区间列转换为Python整数列"""
+        self._begin = self._begin.astype(object)
+        self._end = self._end.astype(object)
+
+    def _allocate(self, begin: int, end: int, state: ValueState) -> int:
+        if end >= _NARROW_LIMIT and self._begin.dtype != object:
+            self._widen()
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._used == len(self._state):
+                self._grow()
+            slot = self._used
+            self._used += 1
+        self._begin[slot] = begin
+        self._end[slot] = end
+        self._state[slot] = _STATE_CODES[state]
+        self.size += 1
+        return slot
+
+    def _is_live(self, node_id) -> bool:
+        return isinstance(node_id, (int, np.integer)) and 0 <= node_id < self._used and \
+            self._state[node_id] != _FREE
+
+    def _link_after(self, slot: int, after: int) -> None:
+        following = int(self._next[after])
+        self._prev[slot] = after
+        self._next[slot] = following
+        if following == _NIL:
+            self.tail = slot
+        else:
+            self._prev[following] = slot
+        self._next[after] = slot
+
+    def _unlink(self, slot: int) -> None:
+        prev_slot, next_slot = int(self._prev[slot]), int(self._next[slot])
+        if prev_slot == _NIL:
+            self.head = next_slot
+        else:
+            self._next[prev_slot] = next_slot
+        if next_slot == _NIL:
+            self.tail = prev_slot
+        else:
+            self._prev[next_slot] = prev_slot
+        self._next[slot] = _NIL
+        self._prev[slot] = _NIL
+
+    def _value_at(self, slot: int) -> Value:
+        return _make_value(int(self._begin[slot]), int(self._end[slot]), _CODE_STATES[int(self._state[slot])])
+
+    def _live_slots(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """满足mask的已占用槽位（按槽位号升序）"""
+        states = self._state[:self._used]
+        live = states != _FREE if mask is None else mask & (states != _FREE)
+        return np.flatnonzero(live)
+
+    def _ordered_slots(self) -> List[int]:
+        slots = []
+        slot = self.head
+        next_column = self._next
+        while slot != _NIL:
+            slots.append(slot)
+            slot = int(next_column[slot])
+        return slots
+
+    def _sum_nums(self, slots: np.ndarray) -> int:
+        nums = self._end[slots] - self._begin[slots] + 1
+        if nums.dtype == object:
+            return int(nums.sum()) if len(nums) else 0
+        # 高低32位分别求和，避免int64溢出
+        return (int((nums >> 32).sum()) << 32) + int((nums & _LOW_MASK).sum())
+
+    # ---- 与AccountValueCollection相同的接口
+
+    def add_value(self, value: Value, position: str = "end") -> bool:
+        """添加Value到集合中"""
+        if position not in ("end", "beginning"):
+            raise ValueError("position must be 'end' or 'beginning'")
+        slot = self._allocate(value.get_decimal_begin_index(), value.get_decimal_end_index(), value.state)
+
+        if self.tail == _NIL:
+            self.head = self.tail = slot
+            self._next[slot] = self._prev[slot] = _NIL
+        elif position == "end":
+            self._link_after(slot, self.tail)
+        else:
+            self._prev[slot] = _NIL
+            self._next[slot] = self.head
+            self._prev[self.head] = slot
+            self.head = slot
+
+        return True
+
+    def remove_value(self, node_id: int) -> bool:
+        """根据node_id移除Value"""
+        if not self._is_live(node_id):
+            return False
+        node_id = int(node_id)
+        self._unlink(node_id)
+        self._state[node_id] = _FREE
+        self._free.append(node_id)
+        self.size -= 1
+        return True
+
+    def get_value(self, node_id: int) -> Optional[Value]:
+        """根据node_id获取Value"""
+        return self._value_at(int(node_id)) if self._is_live(node_id) else None
+
+    def find_node_id(self, target: Value) -> Optional[int]:
+        """查找与target完全相同（区间相同）的Value的node_id"""
+        used = self._used
+        matches = np.flatnonzero((self._begin[:used] == target.get_decimal_begin_index()) &
+                                 (self._end[:used] == target.get_decimal_end_index()) &
+                                 (self._state[:used] != _FREE))
+        return int(matches[0]) if len(matches) else None
+
+    def count_by_state(self, state: ValueState) -> int:
+        """统计指定状态的Value数量"""
+        return int(np.count_nonzero(self._state[:self._used] == _STATE_CODES[state]))
+
+    def find_by_state(self, state: ValueState) -> List[Value]:
+        """根据状态查找所有Value（按槽位顺序）"""
+        slots = self._live_slots(self._state[:self._used] == _STATE_CODES[state])
+        return [self._value_at(slot) for slot in slots.tolist()]
+
+    def find_by_range(self, start_decimal: int, end_decimal: int) -> List[Value]:
+        """根据十进制范围查找Value"""
+        used = self._used
+        mask = (self._end[:used] >= start_decimal) & (self._begin[:used] <= end_decimal)
+        return self._values_in_order(set(self._live_slots(mask).tolist()))
+
+    def find_intersecting_values(self, target: Value) -> List[Value]:
+        """查找与target有交集的所有Value"""
+        return self.find_by_range(target.get_decimal_begin_index(), target.get_decimal_end_index())
+
+    def _values_in_order(self, slots: set) -> List[Value]:
+        if not slots:
+            return []
+        return [self._value_at(slot) for slot in self._ordered_slots() if slot in slots]
+
+    def split_value(self, node_id: int, change: int) -> Tuple[Optional[Value], Optional[Value]]:
+        """分裂指定Value，找零V2放在原Value之后"""
+        if not self._is_live(node_id):
+            return None, None
+        node_id = int(node_id)
+        begin, end = int(self._begin[node_id]), int(self._end[node_id])
+        value_num = end - begin + 1
+
+        if change <= 0 or change >= value_num:
+            return None, None
+
+        state = _CODE_STATES[int(self._state[node_id])]
+        split_end = end - change  # V1为[begin, split_end]
+        self._end[node_id] = split_end
+        new_slot = self._allocate(split_end + 1, end, state)
+        self._link_after(new_slot, node_id)
+
+        return _make_value(begin, split_end, state), _make_value(split_end + 1, end, state)
+
+    # 暂时不需要使用合并功能（EZchain系统暂不提供此功能）
+    def merge_adjacent_values(self, node_id1: int, node_id2: int) -> Optional[Value]:
+        """合并两个相邻的Value"""
+        if not self._is_live(node_id1) or not self._is_live(node_id2):
+            return None
+        node_id1, node_id2 = int(node_id1), int(node_id2)
+        if int(self._next[node_id1]) != node_id2 or self._state[node_id1] != self._state[node_id2]:
+            return None
+
+        begin = int(self._begin[node_id1])
+        new_num = (int(self._end[node_id1]) - begin + 1) + (int(self._end[node_id2]) - int(self._begin[node_id2]) + 1)
+        self._end[node_id1] = begin + new_num - 1
+        self.remove_value(node_id2)
+        return self._value_at(node_id1)
+
+    def update_value_state(self, node_id: int, new_state: ValueState) -> bool:
+        """更新Value状态"""
+        if not self._is_live(node_id):
+            return False
+        self._state[int(node_id)] = _STATE_CODES[new_state]
+        return True
+
+    def get_all_values(self) -> List[Value]:
+        """获取所有Value（链表顺序）"""
+        return [self._value_at(slot) for slot in self._ordered_slots()]
+
+    def get_values_sorted_by_begin_index(self) -> List[Value]:
+        """按起始索引排序获取所有Value"""
+        slots = self._live_slots()
+        order = slots[np.argsort(self._begin[slots], kind='stable')]
+        return [self._value_at(slot) for slot in order.tolist()]
+
+    def get_balance_by_state(self, state: ValueState = ValueState.UNSPENT) -> int:
+        """计算指定状态的总余额"""
+        return self._sum_nums(self._live_slots(self._state[:self._used] == _STATE_CODES[state]))
+
+    def get_total_balance(self) -> int:
+        """计算总余额"""
+        return self._sum_nums(self._live_slots())
+
+    def clear_spent_values(self):
+        """清除已确认的Value"""
+        for slot in self._live_slots(self._state[:self._used] == _STATE_CODES[ValueState.CONFIRMED]).tolist():
+            self.remove_value(slot)
+
+    def validate_no_overlap(self) -> bool:
+        """验证所有Value之间没有重叠"""
+        slots = self._live_slots()
+        if len(slots) < 2:
+            return True
+        begins = self._begin[slots]
+        order = np.argsort(begins, kind='stable')
+        sorted_begins = begins[order]
+        sorted_ends = self._end[slots][order]
+        return not bool(np.any(sorted_ends[:-1] >= sorted_begins[1:]))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for slot in self._ordered_slots():
+            yield self._value_at(slot)
+
+    def __contains__(self, value: Value) -> bool:
+        return self.find_node_id(value) is not None
@@ -1,13 +1,18 @@
 import re
 from enum import Enum
 
+from EZ_Tool_Box.Metrics import timed
+from EZ_Tool_Box.Slots import SlottedPickleMixin
+
 class ValueState(Enum):
     UNSPENT = "unspent"  # 未花销
     SELECTED = "selected"  # 已选中，准备注入交易
     LOCAL_COMMITTED = "local_committed"  # 本地提交待确认
     CONFIRMED = "confirmed"  # 链上已确认（=已花费）
 
-class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16^65（总量暂未定）
+class Value(SlottedPickleMixin):  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16^65（总量暂未定）
+    __slots__ = ('begin_index', 'value_num', 'state', 'end_index')  # 不使用实例__dict__，节省内存
+
     def __init__(self, beginIndex, valueNum, state=ValueState.UNSPENT):  # beginIndex是16进制str，valueNum是10进制int，state是ValueState枚举
         # 输入参数验证
         if not isinstance(beginIndex, str):
@@ -41,6 +46,7 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
     def get_decimal_end_index(self):
         return int(self.end_index, 16)
 
+    @timed("value.split")
     def split_value(self, change):  # 对此值进行分割
         # 边缘值检测
         if change <= 0 or change >= self.value_num: